@@ -1,10 +1,23 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from account.models import UserProfile
-
-
-class BaseRelatedUserSerializer(serializers.ModelSerializer):
+from common.serializers import (
+    CompiledCharField,
+    CompiledDateTimeField,
+    CompiledDecimalField,
+    CompiledField,
+    CompiledHyperlinkField,
+    CompiledListSerializer,
+    CompiledMethodField,
+)
+from common.timing import TimedSerializerMixin
+
+
+class BaseRelatedUserSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
     # Serializers used are all hyperlinked to follow REST API guidelines.
     user = serializers.HyperlinkedRelatedField(
         many=False,
@@ -71,3 +84,49 @@ class UserProfileDetailSerializer(serializers.ModelSerializer):
             "public_id",
             "auth_user"
         )
+
+
+def compile_position(context: dict):
+    """
+    Get a function telling the position of the user in an auction, from
+    whether one of their bids is its winning bid.
+    """
+    return lambda is_winning: "winning" if is_winning else "outbid"
+
+
+def compile_default_currency(context: dict):
+    return lambda: settings.DEFAULT_CURRENCY
+
+
+class CompiledMyBidListSerializer(CompiledListSerializer):
+    """
+    Represent the bids of a user grouped by auction, from the values of its
+    lot and the aggregates of their bids: how many there are, the highest
+    price they offer (converted into the default currency), when the last
+    was placed and whether one of them is winning.
+    """
+    fields = (
+        ("lot", CompiledCharField("auction__lot__public_id")),
+        ("detail_url", CompiledHyperlinkField(
+            "auction__lot__public_id",
+            view_name="api:auction:v1:lots:retrieve_update_destroy",
+            lookup_url_kwarg="lot_public_id",
+        )),
+        ("name", CompiledCharField("auction__lot__name")),
+        ("expires_at", CompiledDateTimeField("auction__expires_at")),
+        ("position", CompiledMethodField(compile_position, "is_winning")),
+        ("bid_count", CompiledField("bid_count")),
+        ("highest_bid_price", CompiledDecimalField(
+            "highest_price", max_digits=19, decimal_places=2
+        )),
+        ("highest_bid_price_currency", CompiledMethodField(
+            compile_default_currency
+        )),
+        ("winning_bid_price", CompiledDecimalField(
+            "auction__highest_bid_price", max_digits=19, decimal_places=2
+        )),
+        ("winning_bid_price_currency", CompiledField(
+            "auction__highest_bid_price_currency"
+        )),
+        ("last_bid_at", CompiledDateTimeField("last_bid_at")),
+    )
@@ -0,0 +1,137 @@
+# Python standard
+from datetime import timedelta
+
+# Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Third-party
+from rest_framework import status
+
+# Local
+from auction.api.v1.tests.factories import BidFactory, LotFactory
+from auction.models import Auction
+from common.tests.mixins import (
+    APITestMethodsGenerator,
+    BaseAPIEndpointTestCase,
+)
+
+
+class TestMyBidListAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:account:v1:my_bid_list"
+    supported_methods = {"get"}
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.auth_user.user_profile
+        self.winning_lot = LotFactory(auction__base_price="1.00")
+        self.outbid_lot = LotFactory(auction__base_price="1.00")
+
+    def create_listed_objects(self, amount: int):
+        for _ in range(amount):
+            lot = LotFactory(auction__base_price="1.00")
+            BidFactory(auction=lot.auction, user=self.user, price="5.00")
+
+    def bid(self, lot, price: str, user=None):
+        return BidFactory(
+            auction=lot.auction, user=user or self.user, price=price
+        )
+
+    def test_get_request_returns_bids_grouped_by_auction(self):
+        self.bid(self.winning_lot, "10.00")
+        self.bid(self.outbid_lot, "12.00")
+        self.bid(self.outbid_lot, "20.00", user=BidFactory().user)
+        last_bid = self.bid(self.winning_lot, "15.00")
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body["count"], 2)
+        winning, outbid = body["results"]
+        self.assertEqual(winning["lot"], str(self.winning_lot.public_id))
+        self.assertEqual(winning["name"], self.winning_lot.name)
+        self.assertEqual(winning["position"], "winning")
+        self.assertEqual(winning["bid_count"], 2)
+        self.assertEqual(winning["highest_bid_price"], "15.00")
+        self.assertEqual(winning["highest_bid_price_currency"], "GBP")
+        self.assertEqual(winning["winning_bid_price"], "15.00")
+        self.assertEqual(
+            winning["last_bid_at"],
+            last_bid.created_at.isoformat().replace("+00:00", "Z"),
+        )
+        self.assertTrue(winning["detail_url"].endswith(
+            f"/api/auction/v1/lots/{self.winning_lot.public_id}"
+        ))
+        self.assertEqual(outbid["lot"], str(self.outbid_lot.public_id))
+        self.assertEqual(outbid["position"], "outbid")
+        self.assertEqual(outbid["bid_count"], 1)
+        self.assertEqual(outbid["highest_bid_price"], "12.00")
+        self.assertEqual(outbid["winning_bid_price"], "20.00")
+
+    def test_get_request_filters_by_position(self):
+        self.bid(self.winning_lot, "10.00")
+        self.bid(self.outbid_lot, "12.00")
+        self.bid(self.outbid_lot, "20.00", user=BidFactory().user)
+        http_auth = self.get_http_authorization(self.auth_user)
+        for position, lot in (
+            ("winning", self.winning_lot),
+            ("outbid", self.outbid_lot),
+        ):
+            response = self.make_request(
+                "get",
+                HTTP_AUTHORIZATION=http_auth,
+                query_params={"position": position},
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                [result["lot"] for result in response.json()["results"]],
+                [str(lot.public_id)],
+            )
+
+    def test_get_request_with_unknown_position_returns_400(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            query_params={"position": "leading"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_request_only_returns_open_auctions_bid_for_by_user(self):
+        self.bid(self.winning_lot, "10.00")
+        self.bid(self.outbid_lot, "10.00")
+        Auction.objects.filter(pk=self.outbid_lot.auction_id).update(
+            status=Auction.CLOSED
+        )
+        expired_lot = LotFactory(auction__base_price="1.00")
+        self.bid(expired_lot, "10.00")
+        Auction.objects.filter(pk=expired_lot.auction_id).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.bid(LotFactory(auction__base_price="1.00"), "10.00", user=(
+            BidFactory().user
+        ))
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        self.assertEqual(
+            [result["lot"] for result in response.json()["results"]],
+            [str(self.winning_lot.public_id)],
+        )
+
+    def test_bids_are_read_from_the_user_index(self):
+        self.bid(self.winning_lot, "10.00")
+        http_auth = self.get_http_authorization(self.auth_user)
+        with CaptureQueriesContext(connection) as queries:
+            self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        sql = [
+            query["sql"] for query in queries.captured_queries
+            if "GROUP BY" in query["sql"] and "LIMIT" in query["sql"]
+        ][-1]
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("auction_bid_user_id_ee3ae2_idx (user_id=?)", plan)
+
+
+APITestMethodsGenerator.generate_test_methods(TestMyBidListAPIEndpoint)
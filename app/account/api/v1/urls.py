@@ -13,6 +13,11 @@ urlpatterns = [
         views.MyUserProfileRetrieveAPIView.as_view(),
         name="user_list"
     ),
+    path(
+        'users/me/bids/',
+        views.MyBidListAPIView.as_view(),
+        name="my_bid_list"
+    ),
     path(
         'users/',
         views.UserProfileListAPIView.as_view(),
@@ -1,18 +1,26 @@
+from django.db.models import Case, Count, F, IntegerField, Max, Value, When
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import (
     ListAPIView,
     RetrieveAPIView,
 )
 
 from account.api.v1.serializers import (
+    CompiledMyBidListSerializer,
     UserProfileListSerializer,
     UserProfileDetailSerializer,
 )
 from account.models import UserProfile
+from auction.models import Auction, Bid
+from common.conditional import ConditionalRetrieveMixin, LastModifiedListMixin
+from common.metrics import RequestDurationMixin
 
 
-class UserProfileListAPIView(ListAPIView):
+class UserProfileListAPIView(LastModifiedListMixin, ListAPIView):
     serializer_class = UserProfileListSerializer
-    queryset = UserProfile.objects.all()
+    # Join the auth user nested by `UserProfileListSerializer`
+    queryset = UserProfile.objects.select_related("auth_user")
 
 
 class MyUserProfileRetrieveAPIView(RetrieveAPIView):
@@ -22,7 +30,78 @@ class MyUserProfileRetrieveAPIView(RetrieveAPIView):
         return self.request.user.user_profile
 
 
-class UserProfileRetrieveAPIView(RetrieveAPIView):
+class MyBidListAPIView(RequestDurationMixin, ListAPIView):
+    """
+    GET requests to this endpoint will return the auctions the requesting
+    user has bid for, which are still open, most recently bid for first:
+    each with their lot, how many bids the user placed, the highest price
+    they offered and whether they are `winning` or `outbid`. Results can be
+    filtered by position, e.g. `?position=outbid`.
+
+    The bids of the user are read from the `(user, created_at)` index and
+    grouped by auction in a single query, so it never reads the bids of
+    other users, however many bids either placed. The user is winning an
+    auction if one of their bids is its winning bid.
+    """
+    positions = ("winning", "outbid")
+
+    def get_queryset(self):
+        # Open auctions are matched as a set, rather than joined on their
+        # status, so the query is driven by the bids of the user instead of
+        # reading every bid of every open auction.
+        open_auctions = Auction.objects.filter(
+            status=Auction.OPEN, expires_at__gt=timezone.now()
+        )
+        bids = Bid.objects.filter(
+            user=self.request.user.user_profile, auction__in=open_auctions
+        )
+        return bids.values(
+            "auction_id",
+            "auction__lot__public_id",
+            "auction__lot__name",
+            "auction__expires_at",
+            "auction__highest_bid_price",
+            "auction__highest_bid_price_currency",
+        ).annotate(
+            bid_count=Count("id"),
+            highest_price=Max("normalized_price"),
+            last_bid_at=Max("created_at"),
+            is_winning=Max(Case(
+                When(auction__winning_bid_id=F("id"), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )),
+        ).order_by("-last_bid_at", "-auction_id")
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        position = self.request.query_params.get("position")
+        if position is None:
+            return queryset
+        if position not in self.positions:
+            raise ValidationError({"position": [
+                f"Select one of: {', '.join(self.positions)}."
+            ]})
+        return queryset.filter(is_winning=int(position == "winning"))
+
+    def get_serializer(self, *args, **kwargs):
+        return CompiledMyBidListSerializer(
+            *args, context=self.get_serializer_context()
+        )
+
+
+class UserProfileRetrieveAPIView(ConditionalRetrieveMixin, RetrieveAPIView):
     serializer_class = UserProfileDetailSerializer
-    queryset = UserProfile.objects.all()
+    queryset = UserProfile.objects.select_related("auth_user")
     lookup_field = 'public_id'
+    etag_fields = (
+        "modified_at",
+        "auth_user__username",
+        "auth_user__first_name",
+        "auth_user__last_name",
+        "auth_user__email",
+        "auth_user__is_staff",
+        "auth_user__is_active",
+        "auth_user__last_login",
+        "auth_user__date_joined",
+    )
@@ -0,0 +1,74 @@
+# Python standard
+from datetime import timedelta
+
+# Django
+from django.conf import settings
+from django.utils import timezone
+
+# Third-party
+from django_filters import rest_framework as filters
+
+# Local
+from auction.models import Lot
+
+
+class LotFilterSet(filters.FilterSet):
+    """
+    Filter lots by the fields of their auction, and by whether it is active.
+
+    The `status` filter compiles to a range predicate on the indexed
+    `expires_at` column of auctions, rather than evaluating `is_active` for
+    every lot:
+
+    - `active`: auctions expiring after now.
+    - `ending_soon`: active auctions expiring within `LOT_ENDING_SOON_WINDOW`
+      seconds.
+    - `closed`: auctions which have expired.
+
+    The `min_price` and `max_price` filters compare base prices converted
+    into `DEFAULT_CURRENCY`, with a range predicate on their indexed column,
+    so lots priced in any currency are compared correctly.
+    """
+    ACTIVE = "active"
+    ENDING_SOON = "ending_soon"
+    CLOSED = "closed"
+    STATUS_CHOICES = (
+        (ACTIVE, "Active"),
+        (ENDING_SOON, "Ending soon"),
+        (CLOSED, "Closed"),
+    )
+
+    status = filters.ChoiceFilter(
+        choices=STATUS_CHOICES,
+        method="filter_status",
+    )
+    min_price = filters.NumberFilter(
+        field_name="auction__normalized_base_price",
+        lookup_expr="gte",
+        label="Minimum base price, in the default currency",
+    )
+    max_price = filters.NumberFilter(
+        field_name="auction__normalized_base_price",
+        lookup_expr="lte",
+        label="Maximum base price, in the default currency",
+    )
+
+    class Meta:
+        model = Lot
+        # Owner, price and expiry are fields of the lot's auction
+        fields = (
+            "auction__user__public_id",
+            "name",
+            "auction__expires_at",
+            "auction__base_price_currency",
+        )
+
+    def filter_status(self, queryset, name, value):
+        now = timezone.now()
+        if value == self.CLOSED:
+            return queryset.filter(auction__expires_at__lte=now)
+        queryset = queryset.filter(auction__expires_at__gt=now)
+        if value == self.ENDING_SOON:
+            window = timedelta(seconds=settings.LOT_ENDING_SOON_WINDOW)
+            queryset = queryset.filter(auction__expires_at__lte=now + window)
+        return queryset
@@ -3,13 +3,20 @@ from rest_framework import serializers
 
 # Local
 from account.api.v1.serializers import BaseRelatedUserSerializer
+from auction.bidding import BidRejected, submit_bid
 from auction.models import Bid, Lot
+from common.serializers import (
+    CompiledDecimalField,
+    CompiledField,
+    CompiledHyperlinkField,
+    CompiledListSerializer,
+)
 
 
 class BaseBidSerializer(BaseRelatedUserSerializer):
     lot = serializers.SlugRelatedField(
         slug_field="public_id",
-        queryset=Lot.objects.all(),
+        queryset=Lot.objects.select_related("auction"),
         write_only=True,
     )
 
@@ -21,6 +28,19 @@ class BaseBidSerializer(BaseRelatedUserSerializer):
             "lot",
         )
 
+    def create(self, validated_data):
+        """
+        Place the bid for the lot's auction, which checks it against the
+        current highest bid.
+        """
+        lot = validated_data.pop("lot")
+        try:
+            return submit_bid(
+                lot.auction, validated_data["user"], validated_data["price"]
+            )
+        except BidRejected as error:
+            raise serializers.ValidationError({"price": [str(error)]})
+
 
 class BidListCreateSerializer(BaseBidSerializer):
     detail_url = serializers.HyperlinkedIdentityField(
@@ -37,6 +57,30 @@ class BidListCreateSerializer(BaseBidSerializer):
         fields = read_only_fields + BaseBidSerializer.Meta.fields
 
 
+class CompiledBidListSerializer(CompiledListSerializer):
+    """
+    Represent bids listed exactly as `BidListCreateSerializer` does, from
+    their values and those of their user.
+    """
+    serializer_class = BidListCreateSerializer
+    fields = (
+        ("user", CompiledHyperlinkField(
+            "user__public_id",
+            view_name="api:account:v1:user_detail",
+            lookup_url_kwarg="public_id",
+        )),
+        ("username", CompiledField("user__auth_user__username")),
+        ("detail_url", CompiledHyperlinkField(
+            "public_id",
+            view_name="api:auction:v1:bids:retrieve",
+            lookup_url_kwarg="bid_public_id",
+        )),
+        ("price", CompiledDecimalField(
+            "price", max_digits=19, decimal_places=2
+        )),
+    )
+
+
 class BidDetailSerializer(BaseBidSerializer):
 
     class Meta:
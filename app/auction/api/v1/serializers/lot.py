@@ -1,17 +1,53 @@
 # Third-party
 from typing import Optional
 
+from django.db import transaction
 from django.urls import reverse
+from django.utils import timezone
 from djmoney.contrib.django_rest_framework import MoneyField
+from djmoney.settings import CURRENCY_CHOICES
 from rest_framework import serializers
 
 # Local
 from account.api.v1.serializers import BaseRelatedUserSerializer
-from auction.models import Bid, Lot
+from auction.currency import ExchangeRateMissing, get_exchange_rates
+from auction.models import Auction, Lot
+from common.serializers import (
+    CompiledCharField,
+    CompiledDateTimeField,
+    CompiledDecimalField,
+    CompiledField,
+    CompiledHyperlinkField,
+    CompiledListSerializer,
+    CompiledMethodField,
+)
 
 
 class BaseLotSerializer(BaseRelatedUserSerializer):
+    # Ownership, pricing and expiry are stored in the lot's auction.
+    user = serializers.HyperlinkedRelatedField(
+        source="auction.user",
+        read_only=True,
+        view_name="api:account:v1:user_detail",
+        lookup_field="public_id",
+    )
+    base_price = MoneyField(
+        source="auction.base_price",
+        max_digits=19,
+        decimal_places=2,
+        required=False,
+    )
+    base_price_currency = serializers.ChoiceField(
+        source="auction.base_price_currency",
+        choices=CURRENCY_CHOICES,
+        required=False,
+    )
+    expires_at = serializers.DateTimeField(
+        source="auction.expires_at",
+        required=False,
+    )
     is_active = serializers.SerializerMethodField()
+    status = serializers.CharField(source="auction.status", read_only=True)
 
     class Meta:
         model = Lot
@@ -20,6 +56,7 @@ class BaseLotSerializer(BaseRelatedUserSerializer):
             "created_at",
             "user",
             "is_active",
+            "status",
         )
         fields = (
             "name",
@@ -32,6 +69,80 @@ class BaseLotSerializer(BaseRelatedUserSerializer):
     def get_is_active(self, object) -> bool:
         return object.is_active
 
+    def get_username(self, object) -> Optional[str]:
+        user = object.auction.user
+        return user.auth_user.username if user else None
+
+    def validate(self, attrs):
+        """
+        Check prices are in a currency which can be converted into the
+        default currency, to be compared with others.
+        """
+        auction_data = attrs.get("auction", {})
+        currency = auction_data.get("base_price_currency")
+        if currency is None and "base_price" in auction_data:
+            currency = getattr(
+                auction_data["base_price"], "currency", currency
+            )
+        currency = getattr(currency, "code", currency)
+        if currency and not get_exchange_rates().has_rate(currency):
+            raise serializers.ValidationError({
+                "base_price_currency": [
+                    f"No exchange rate is known for {currency}."
+                ]
+            })
+        return attrs
+
+    def create(self, validated_data):
+        """
+        Create the lot together with the auction it is placed for. Lots are
+        created inactive unless an expiry time is explicitly provided.
+        """
+        auction_data = validated_data.pop("auction", {})
+        auction_data.setdefault("expires_at", timezone.now())
+        with transaction.atomic():
+            auction = Auction.objects.create(
+                user=validated_data.pop("user", None),
+                **auction_data
+            )
+            return Lot.objects.create(auction=auction, **validated_data)
+
+    def update(self, instance, validated_data):
+        """
+        Update the lot and any of its auction fields provided.
+
+        Auction fields are written with a queryset update so the bidding
+        state recorded concurrently on the same row is never overwritten,
+        along with the base price converted into the default currency. A
+        base price only given an amount keeps the currency of the auction,
+        which may have no exchange rate.
+        """
+        auction_data = validated_data.pop("auction", {})
+        with transaction.atomic():
+            if auction_data:
+                if "modified_at" in validated_data:
+                    auction_data["modified_at"] = validated_data["modified_at"]
+                for attr, value in auction_data.items():
+                    setattr(instance.auction, attr, value)
+                if {"base_price", "base_price_currency"} & set(auction_data):
+                    try:
+                        auction_data["normalized_base_price"] = (
+                            get_exchange_rates().normalize(
+                                instance.auction.base_price
+                            )
+                        )
+                    except ExchangeRateMissing as error:
+                        raise serializers.ValidationError(
+                            {"base_price_currency": [str(error)]}
+                        )
+                    instance.auction.normalized_base_price = (
+                        auction_data["normalized_base_price"]
+                    )
+                Auction.objects.filter(pk=instance.auction_id).update(
+                    **auction_data
+                )
+            return super().update(instance, validated_data)
+
 
 class LotListSerializer(BaseLotSerializer):
     detail_url = serializers.HyperlinkedIdentityField(
@@ -48,13 +159,65 @@ class LotListSerializer(BaseLotSerializer):
         fields = read_only_fields + BaseLotSerializer.Meta.fields
 
 
+def compile_is_active(context: dict):
+    """
+    Get a function telling whether auctions are active, as `Auction` does,
+    at the time the response is represented.
+    """
+    now = timezone.now()
+    return lambda status, expires_at: (
+        status == Auction.OPEN and now < expires_at
+    )
+
+
+class CompiledLotListSerializer(CompiledListSerializer):
+    """
+    Represent lots listed exactly as `LotListSerializer` does, from their
+    values and those of their auction and user.
+    """
+    serializer_class = LotListSerializer
+    fields = (
+        ("user", CompiledHyperlinkField(
+            "auction__user__public_id",
+            view_name="api:account:v1:user_detail",
+            lookup_url_kwarg="public_id",
+        )),
+        ("username", CompiledField("auction__user__auth_user__username")),
+        ("public_id", CompiledCharField("public_id")),
+        ("created_at", CompiledDateTimeField("created_at")),
+        ("is_active", CompiledMethodField(
+            compile_is_active, "auction__status", "auction__expires_at"
+        )),
+        ("status", CompiledCharField("auction__status")),
+        ("detail_url", CompiledHyperlinkField(
+            "public_id",
+            view_name="api:auction:v1:lots:retrieve_update_destroy",
+            lookup_url_kwarg="lot_public_id",
+        )),
+        ("name", CompiledCharField("name")),
+        ("base_price", CompiledDecimalField(
+            "auction__base_price", max_digits=19, decimal_places=2
+        )),
+        ("base_price_currency", CompiledField("auction__base_price_currency")),
+        ("condition", CompiledField("condition")),
+        ("expires_at", CompiledDateTimeField("auction__expires_at")),
+    )
+
+
 class LotDetailSerializer(BaseLotSerializer):
     bids = serializers.SerializerMethodField()
     highest_bid = serializers.SerializerMethodField()
+    # Read from the columns denormalised on the auction, so no bids are
+    # queried to represent a lot.
     highest_bid_price = MoneyField(
-        source="highest_bid.price",
-        max_digits=10,
-        decimal_places=2
+        source="auction.highest_bid_price",
+        max_digits=19,
+        decimal_places=2,
+        read_only=True,
+    )
+    bid_count = serializers.IntegerField(
+        source="auction.bid_count",
+        read_only=True,
     )
 
     class Meta:
@@ -63,17 +226,17 @@ class LotDetailSerializer(BaseLotSerializer):
             "bids",
             "highest_bid",
             "highest_bid_price",
+            "bid_count",
             "modified_at",
         )
         fields = read_only_fields + BaseLotSerializer.Meta.fields + (
             "description",
         )
 
-    def _get_highest_bid(self, object) -> Optional[Bid]:
-        return object.highest_bid
-
-    def get_highest_bid(self, object) -> str:
-        highest_bid = self._get_highest_bid(object)
+    def get_highest_bid(self, object) -> Optional[str]:
+        highest_bid = object.highest_bid
+        if highest_bid is None:
+            return None
         view_name = "api:auction:v1:bids:retrieve"
         path = reverse(
             view_name, kwargs={"bid_public_id": highest_bid.public_id}
@@ -82,7 +245,7 @@ class LotDetailSerializer(BaseLotSerializer):
         return url
 
     def get_bids(self, object) -> str:
-        view_name = "api:auction:v1:lot:bid_history"
+        view_name = "api:auction:v1:lots:bid_history"
         path = reverse(view_name, kwargs={"lot_public_id": object.public_id})
         url = self.context["request"].build_absolute_uri(path)
         return url
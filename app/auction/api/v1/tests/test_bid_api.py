@@ -1,6 +1,763 @@
-from common.tests.mixins import BaseAPIEndpointTestCase
+# Python standard
+import json
+import threading
+from concurrent.futures import Future
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+# Django
+from django.core.cache import caches
+from django.conf import settings
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+# Third-party
+from djmoney.money import Money
+from freezegun import freeze_time
+from oauth2_provider.models import AccessToken
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+# Local
+from account.tests.factories import AuthUserFactory
+from auction.api.v1.serializers import BidListCreateSerializer
+from auction.api.v1.tests.factories import BidFactory, LotFactory
+from auction.bidding import BidWriter, get_bid_writer
+from auction.currency import get_exchange_rates
+from auction.metrics import bids
+from auction.models import Bid, ExchangeRate
+from common.tests.mixins import (
+    APITestMethodsGenerator,
+    BaseAPIEndpointTestCase,
+)
+from common.throttling import get_token_buckets
 
 
 class TestBidListAPIEndpoint(BaseAPIEndpointTestCase):
     url = "api:auction:v1:lots:bid_history"
-    supported_methods = {"get", "post"}
+    supported_methods = {"get"}
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory(auction__base_price="1.00")
+        self.url_args = [self.lot.public_id]
+
+    def create_listed_objects(self, amount: int):
+        BidFactory.create_batch(amount, auction=self.lot.auction)
+
+    def test_authenticated_get_request_returns_lot_bids(self):
+        bid = BidFactory(auction=self.lot.auction, price="12.00")
+        # Bids for other lots are not listed
+        BidFactory()
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {
+                    "detail_url": (
+                        f"http://testserver/api/auction/v1/bids/"
+                        f"{bid.public_id}"
+                    ),
+                    "user": (
+                        f"http://testserver/api/account/v1/users/"
+                        f"{bid.user.public_id}"
+                    ),
+                    "username": bid.user.auth_user.username,
+                    "price": "12.00",
+                }
+            ]
+        )
+
+    def test_authenticated_get_request_lists_bids_as_serialized(self):
+        BidFactory.create_batch(3, auction=self.lot.auction)
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        serializer = BidListCreateSerializer(
+            Bid.objects.filter(auction=self.lot.auction).order_by(
+                "created_at", "id"
+            ),
+            many=True,
+            context={"request": response.wsgi_request},
+        )
+        self.assertEqual(
+            JSONRenderer().render(response.data["results"]),
+            JSONRenderer().render(serializer.data),
+        )
+
+    def test_authenticated_get_request_paginates_by_position(self):
+        # Bids placed at the same time are ordered by their primary key
+        with freeze_time("2020-04-18 04:35:01"):
+            bids = BidFactory.create_batch(3, auction=self.lot.auction)
+        with freeze_time("2020-04-18 04:35:02"):
+            bids += BidFactory.create_batch(2, auction=self.lot.auction)
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            query_params={"limit": 2}
+        )
+        pages = [response.json()]
+        while pages[-1]["next"]:
+            pages.append(
+                self.client.get(
+                    pages[-1]["next"], HTTP_AUTHORIZATION=http_auth
+                ).json()
+            )
+        self.assertEqual(
+            [
+                [bid["detail_url"].rsplit("/", 1)[-1] for bid in page["results"]]
+                for page in pages
+            ],
+            [
+                [str(bid.public_id) for bid in bids[:2]],
+                [str(bid.public_id) for bid in bids[2:4]],
+                [str(bid.public_id) for bid in bids[4:]],
+            ]
+        )
+        self.assertIsNone(pages[0]["previous"])
+        self.assertIsNone(pages[0]["count"])
+
+        # Walking back from the last page returns the same pages
+        previous_page = self.client.get(
+            pages[-1]["previous"], HTTP_AUTHORIZATION=http_auth
+        ).json()
+        self.assertEqual(previous_page["results"], pages[1]["results"])
+        self.assertEqual(previous_page["next"], pages[1]["next"])
+
+    def test_authenticated_get_request_can_order_newest_first(self):
+        with freeze_time("2020-04-18 04:35:01"):
+            bids = BidFactory.create_batch(3, auction=self.lot.auction)
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            query_params={"ordering": "-created_at", "limit": 2}
+        )
+        next_page = self.client.get(
+            response.json()["next"], HTTP_AUTHORIZATION=http_auth
+        ).json()
+        self.assertEqual(
+            [
+                bid["detail_url"].rsplit("/", 1)[-1]
+                for bid in response.json()["results"] + next_page["results"]
+            ],
+            [str(bid.public_id) for bid in reversed(bids)]
+        )
+        self.assertIsNone(next_page["next"])
+
+    def test_authenticated_get_request_orders_bids_by_price_in_any_currency(
+        self
+    ):
+        get_exchange_rates().invalidate()
+        self.addCleanup(get_exchange_rates().invalidate)
+        ExchangeRate.objects.create(currency="EUR", rate=Decimal("0.87"))
+        euro_bid = BidFactory(
+            auction=self.lot.auction, price=Money("20.00", "EUR")
+        )
+        pound_bid = BidFactory(auction=self.lot.auction, price="18.00")
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            query_params={"ordering": "-price"}
+        )
+        self.assertEqual(
+            [
+                bid["detail_url"].rsplit("/", 1)[-1]
+                for bid in response.json()["results"]
+            ],
+            [str(pound_bid.public_id), str(euro_bid.public_id)]
+        )
+
+    def test_authenticated_get_request_counts_bids_on_request(self):
+        BidFactory.create_batch(3, auction=self.lot.auction)
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            query_params={"count": "true", "limit": 2}
+        )
+        self.assertEqual(response.json()["count"], 3)
+
+    def test_authenticated_get_request_with_invalid_cursor_returns_404(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            query_params={"cursor": "invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+
+    def test_get_request_is_not_modified_since_the_newest_bid(self):
+        with freeze_time("2020-04-18 04:35:01"):
+            BidFactory(auction=self.lot.auction, price="12.00")
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        last_modified = response["Last-Modified"]
+        self.assertEqual(last_modified, "Sat, 18 Apr 2020 04:35:01 GMT")
+
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        with freeze_time("2020-04-18 04:35:02"):
+            BidFactory(auction=self.lot.auction, price="13.00")
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["results"]), 2)
+
+
+class TestBidCreateAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:bid_create"
+    supported_methods = {"post"}
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory(auction__base_price="10.00")
+        self.url_args = [self.lot.public_id]
+        caches["idempotency"].clear()
+
+    def test_user_can_bid_higher_than_highest_bid(self):
+        BidFactory(auction=self.lot.auction, price="12.00")
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "post",
+            HTTP_AUTHORIZATION=http_auth,
+            data={"price": "12.50"},
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        bid = Bid.objects.get(price="12.50")
+        self.assertEqual(bid.user, self.auth_user.user_profile)
+        self.lot.auction.refresh_from_db()
+        self.assertEqual(self.lot.auction.highest_bid, bid)
+
+    def test_user_cannot_bid_lower_than_highest_bid(self):
+        BidFactory(auction=self.lot.auction, price="12.00")
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "post",
+            HTTP_AUTHORIZATION=http_auth,
+            data={"price": "11.00"},
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(),
+            {
+                "price": [
+                    "Bid of 11.00 must be higher than the current highest "
+                    "bid of 12.00."
+                ]
+            }
+        )
+        self.assertEqual(Bid.objects.count(), 1)
+
+    def test_bids_are_counted_by_outcome(self):
+        counts = bids.collect()
+        http_auth = self.get_http_authorization(self.auth_user)
+        for price in ("12.00", "11.00", "13.00"):
+            self.make_request(
+                "post",
+                HTTP_AUTHORIZATION=http_auth,
+                data={"price": price},
+                content_type="application/json"
+            )
+        self.assertEqual(bids.collect(), {
+            ("accepted",): counts.get(("accepted",), 0) + 2,
+            ("rejected",): counts.get(("rejected",), 0) + 1,
+        })
+
+    @override_settings(TOKEN_BUCKET_RATES={"bid_user_lot": (0.5, 2)})
+    def test_users_bidding_too_often_are_throttled(self):
+        get_token_buckets().clear()
+        http_auth = self.get_http_authorization(self.auth_user)
+        responses = [
+            self.make_request(
+                "post",
+                HTTP_AUTHORIZATION=http_auth,
+                data={"price": price},
+                content_type="application/json"
+            )
+            for price in ("12.00", "13.00", "14.00")
+        ]
+        self.assertEqual(
+            [response.status_code for response in responses[:2]],
+            [status.HTTP_201_CREATED, status.HTTP_201_CREATED],
+        )
+        self.assertEqual(
+            responses[2].status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        # A token is refilled every 2 seconds
+        self.assertEqual(responses[2]["Retry-After"], "2")
+        self.assertFalse(Bid.objects.filter(price="14.00").exists())
+
+        # Bids on other lots are not throttled
+        self.url_args = [LotFactory(auction__base_price="10.00").public_id]
+        response = self.make_request(
+            "post",
+            HTTP_AUTHORIZATION=http_auth,
+            data={"price": "12.00"},
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(TOKEN_BUCKET_RATES={
+        "bid_user": (0.001, 3),
+        "bid_user_lot": (0.001, 1),
+    })
+    def test_bids_throttled_on_a_lot_do_not_count_towards_other_lots(self):
+        get_token_buckets().clear()
+        http_auth = self.get_http_authorization(self.auth_user)
+        responses = [
+            self.make_request(
+                "post",
+                HTTP_AUTHORIZATION=http_auth,
+                data={"price": price},
+                content_type="application/json"
+            )
+            for price in ("12.00", "13.00", "14.00")
+        ]
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [
+                status.HTTP_201_CREATED,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ],
+        )
+        # Only the bid placed took a token from the user's bucket
+        for _ in range(2):
+            self.url_args = [
+                LotFactory(auction__base_price="10.00").public_id
+            ]
+            response = self.make_request(
+                "post",
+                HTTP_AUTHORIZATION=http_auth,
+                data={"price": "12.00"},
+                content_type="application/json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_retried_bids_with_the_same_idempotency_key_are_placed_once(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        responses = [
+            self.make_request(
+                "post",
+                HTTP_AUTHORIZATION=http_auth,
+                HTTP_IDEMPOTENCY_KEY="bid-1",
+                data={"price": "12.00"},
+                content_type="application/json"
+            )
+            for _ in range(2)
+        ]
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_201_CREATED, status.HTTP_201_CREATED],
+        )
+        self.assertEqual(responses[0].content, responses[1].content)
+        self.assertNotIn("Idempotent-Replayed", responses[0])
+        self.assertEqual(responses[1]["Idempotent-Replayed"], "true")
+        self.assertEqual(Bid.objects.count(), 1)
+
+        # Another key places another bid
+        response = self.make_request(
+            "post",
+            HTTP_AUTHORIZATION=http_auth,
+            HTTP_IDEMPOTENCY_KEY="bid-2",
+            data={"price": "13.00"},
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Bid.objects.count(), 2)
+
+    def test_idempotency_keys_cannot_be_reused_for_other_bids(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        for price in ("12.00", "13.00"):
+            response = self.make_request(
+                "post",
+                HTTP_AUTHORIZATION=http_auth,
+                HTTP_IDEMPOTENCY_KEY="bid-1",
+                data={"price": price},
+                content_type="application/json"
+            )
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        self.assertFalse(Bid.objects.filter(price="13.00").exists())
+
+    def test_rejected_bids_can_be_retried_with_the_same_idempotency_key(self):
+        BidFactory(auction=self.lot.auction, price="12.00")
+        http_auth = self.get_http_authorization(self.auth_user)
+        statuses = []
+        for price in ("11.00", "11.00"):
+            response = self.make_request(
+                "post",
+                HTTP_AUTHORIZATION=http_auth,
+                HTTP_IDEMPOTENCY_KEY="bid-1",
+                data={"price": price},
+                content_type="application/json"
+            )
+            statuses.append(response.status_code)
+            self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(
+            statuses,
+            [status.HTTP_400_BAD_REQUEST, status.HTTP_400_BAD_REQUEST],
+        )
+
+    def test_lot_owner_cannot_bid(self):
+        http_auth = self.get_http_authorization(self.lot.auction.user.auth_user)
+        response = self.make_request(
+            "post",
+            HTTP_AUTHORIZATION=http_auth,
+            data={"price": "20.00"},
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), {"price": ["Cannot bid on your own lot."]}
+        )
+        self.assertFalse(Bid.objects.exists())
+
+
+@override_settings(BID_GROUP_COMMIT=True)
+class TestBidCreateGroupCommitAPIEndpoint(TransactionTestCase):
+    """
+    Bids placed through the bid writer, whose own connection only sees
+    committed data, so they are not tested within a transaction.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory(auction__base_price="10.00")
+        self.url = reverse(
+            "api:auction:v1:lots:bid_create", args=[self.lot.public_id]
+        )
+        access_token = AccessToken.objects.create(
+            user=AuthUserFactory(),
+            scope="read write",
+            expires=timezone.now() + timedelta(seconds=300),
+            token=f"group-commit-access-token-{self.lot.public_id}",
+        )
+        self.http_auth = (
+            f"{settings.OAUTH2_AUTHORIZATION_SCHEME} {access_token}"
+        )
+        caches["idempotency"].clear()
+        get_token_buckets().clear()
+
+    def tearDown(self):
+        get_bid_writer().stop()
+        get_bid_writer.cache_clear()
+        super().tearDown()
+
+    def post_bid(self, price: str, **extra):
+        return self.client.post(
+            self.url,
+            HTTP_AUTHORIZATION=self.http_auth,
+            data={"price": price},
+            content_type="application/json",
+            **extra
+        )
+
+    def test_bids_are_placed_by_the_bid_writer(self):
+        response = self.post_bid("12.00")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        bid = Bid.objects.get()
+        self.assertEqual(response.json()["price"], "12.00")
+        self.lot.auction.refresh_from_db()
+        self.assertEqual(self.lot.auction.highest_bid, bid)
+
+        response = self.post_bid("11.00")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(),
+            {
+                "price": [
+                    "Bid of 11.00 must be higher than the current highest "
+                    "bid of 12.00."
+                ]
+            }
+        )
+
+    def test_bids_not_committed_in_time_are_unavailable(self):
+        with mock.patch.object(
+            BidWriter, "enqueue", return_value=Future()
+        ), self.assertLogs("auction.bidding", "WARNING") as logs, \
+                self.settings(BID_GROUP_COMMIT_TIMEOUT=0.01):
+            response = self.post_bid("12.00")
+        self.assertEqual(
+            logs.records[0].getMessage(),
+            f"Bid for auction {self.lot.auction_id} not committed within "
+            f"0.01 seconds",
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(response["Retry-After"], "5")
+        self.assertEqual(
+            response.json(),
+            {
+                "detail": (
+                    "The bid could not be confirmed in time and may still "
+                    "be placed; check the bids of the lot before bidding "
+                    "again."
+                )
+            }
+        )
+
+    def test_retries_of_bids_not_committed_in_time_are_not_placed_again(self):
+        committing = threading.Event()
+        write = BidWriter.write
+
+        def write_once_committing(writer, batch):
+            committing.wait()
+            write(writer, batch)
+
+        with mock.patch.object(BidWriter, "write", write_once_committing), \
+                self.assertLogs("auction.bidding", "WARNING"), \
+                self.settings(BID_GROUP_COMMIT_TIMEOUT=0.01):
+            response = self.post_bid("12.00", HTTP_IDEMPOTENCY_KEY="bid-1")
+            self.assertEqual(
+                response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            committing.set()
+            # Waits for the bid still pending, rather than placing it again
+            retry = self.post_bid("12.00", HTTP_IDEMPOTENCY_KEY="bid-1")
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.json()["price"], "12.00")
+        self.assertEqual(Bid.objects.count(), 1)
+
+    def test_retries_of_bids_rejected_after_timing_out_are_placed(self):
+        committing = threading.Event()
+        write = BidWriter.write
+
+        def write_once_committing(writer, batch):
+            committing.wait()
+            write(writer, batch)
+
+        BidFactory(auction=self.lot.auction, price="12.00")
+        with mock.patch.object(BidWriter, "write", write_once_committing), \
+                self.assertLogs("auction.bidding", "WARNING"), \
+                self.settings(BID_GROUP_COMMIT_TIMEOUT=0.01):
+            response = self.post_bid("11.00", HTTP_IDEMPOTENCY_KEY="bid-1")
+            self.assertEqual(
+                response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            committing.set()
+            get_bid_writer().stop()
+        # The key was released, so the retry is placed (and rejected) again
+        retry = self.post_bid("11.00", HTTP_IDEMPOTENCY_KEY="bid-1")
+        self.assertEqual(retry.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn("Idempotent-Replayed", retry)
+
+
+class TestBidHistoryExportAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:bid_history_export"
+    supported_methods = {"get"}
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory(auction__base_price="1.00")
+        self.url_args = [self.lot.public_id]
+        with freeze_time("2020-04-18 04:35:01"):
+            self.bid = BidFactory(auction=self.lot.auction, price="12.00")
+        # Bids for other lots are not exported
+        BidFactory()
+
+    @cached_property
+    def http_auth(self) -> str:
+        return self.get_http_authorization(self.auth_user)
+
+    def export(self, **query_params) -> bytes:
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=self.http_auth,
+            query_params=query_params,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_get_request_streams_bids_as_ndjson(self):
+        content = self.export()
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            [
+                {
+                    "public_id": str(self.bid.public_id),
+                    "created_at": "2020-04-18T04:35:01Z",
+                    "price": "12.00",
+                    "price_currency": self.bid.price.currency.code,
+                    "user": str(self.bid.user.public_id),
+                    "username": self.bid.user.auth_user.username,
+                }
+            ]
+        )
+
+    def test_get_request_can_stream_bids_as_csv(self):
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=self.http_auth,
+            query_params={"format": "csv"},
+        )
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(
+            response["Content-Disposition"],
+            'attachment; filename="bids.csv"',
+        )
+        self.assertEqual(
+            b"".join(response.streaming_content).decode("utf-8"),
+            "public_id,created_at,price,price_currency,user,username\r\n"
+            f"{self.bid.public_id},2020-04-18T04:35:01Z,12.00,"
+            f"{self.bid.price.currency.code},{self.bid.user.public_id},"
+            f"{self.bid.user.auth_user.username}\r\n"
+        )
+
+    def test_get_request_streams_bids_in_the_order_placed(self):
+        with freeze_time("2020-04-18 04:35:00"):
+            first_bid = BidFactory(auction=self.lot.auction)
+        with freeze_time("2020-04-18 04:35:01"):
+            tied_bid = BidFactory(auction=self.lot.auction)
+        content = self.export()
+        self.assertEqual(
+            [json.loads(line)["public_id"] for line in content.splitlines()],
+            [
+                str(first_bid.public_id),
+                str(self.bid.public_id),
+                str(tied_bid.public_id),
+            ]
+        )
+
+    def test_get_request_queries_do_not_grow_with_bids(self):
+        # Cache the access token first
+        self.export()
+        query_counts = []
+        for amount in (1, 50):
+            BidFactory.create_batch(amount, auction=self.lot.auction)
+            with CaptureQueriesContext(connection) as queries:
+                self.export()
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_get_request_for_unknown_lot_returns_404(self):
+        self.url_args = ["6f3ef4a9-b4fb-4b5b-9d2b-9ba4f0a6b4a1"]
+        response = self.make_request("get", HTTP_AUTHORIZATION=self.http_auth)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestLotLeaderboardAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:leaderboard"
+    supported_methods = {"get"}
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory(auction__base_price="1.00")
+        self.url_args = [self.lot.public_id]
+
+    def create_listed_objects(self, amount: int):
+        BidFactory.create_batch(amount, auction=self.lot.auction)
+
+    def test_get_request_returns_highest_bids_first(self):
+        with freeze_time("2020-04-18 04:35:01"):
+            bids = [
+                BidFactory(auction=self.lot.auction, price=price)
+                for price in ("15.00", "30.00", "20.00")
+            ]
+        http_auth = self.get_http_authorization(self.auth_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body["lot"], str(self.lot.public_id))
+        self.assertEqual(
+            [bid["public_id"] for bid in body["bids"]],
+            [str(bids[1].public_id), str(bids[2].public_id),
+             str(bids[0].public_id)]
+        )
+        self.assertEqual(body["bids"][0], {
+            "public_id": str(bids[1].public_id),
+            "created_at": "2020-04-18T04:35:01Z",
+            "user": str(bids[1].user.public_id),
+            "username": bids[1].user.auth_user.username,
+            "price": "30.00",
+            "price_currency": "GBP",
+            "normalized_price": "30.0000",
+        })
+        # Bids are never queried, nor sorted
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if "auction_bid" in query["sql"]
+        ])
+
+    def test_get_request_for_lot_without_bids_returns_no_bids(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["bids"], [])
+
+    def test_get_request_for_unknown_lot_returns_404(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        self.url_args = ["00000000-0000-4000-8000-000000000000"]
+        response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestBidRetrieveAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:bids:retrieve"
+    supported_methods = {"get"}
+
+    def setUp(self):
+        super().setUp()
+        self.bid = BidFactory(price="12.00")
+        self.url_args = [self.bid.public_id]
+
+    def test_get_request_with_matching_etag_is_not_modified(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        # A single query for the bid's ETag, without retrieving the bid to
+        # serialise it (the access token is cached by the first request)
+        with self.assertNumQueries(1):
+            response = self.make_request(
+                "get", HTTP_AUTHORIZATION=http_auth, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_get_request_with_other_etag_returns_bid(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get", HTTP_AUTHORIZATION=http_auth, HTTP_IF_NONE_MATCH='"other"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["price"], "12.00")
+
+
+APITestMethodsGenerator.generate_test_methods(TestBidListAPIEndpoint)
+APITestMethodsGenerator.generate_test_methods(TestBidCreateAPIEndpoint)
+APITestMethodsGenerator.generate_test_methods(
+    TestBidHistoryExportAPIEndpoint
+)
+APITestMethodsGenerator.generate_test_methods(TestLotLeaderboardAPIEndpoint)
+APITestMethodsGenerator.generate_test_methods(TestBidRetrieveAPIEndpoint)
@@ -1,10 +1,34 @@
+# Python standard
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+# Django
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, connections
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+
 # Local
+from djmoney.money import Money
 from freezegun import freeze_time
+from oauth2_provider.models import AccessToken
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 
+from auction.api.v1.filters import LotFilterSet
+from auction.api.v1.serializers import LotListSerializer
+from auction.cache import get_lot_cache
+from auction.currency import get_exchange_rates
 from auction.api.v1.tests.factories import BidFactory, LotFactory
-from auction.models import Lot
-from account.tests.factories import UserProfileFactory
+from auction.models import Auction, ExchangeRate, Lot
+from auction.search import get_search_engine
+from account.tests.factories import AuthUserFactory, UserProfileFactory
+from auction.bidding import place_bid
+from common.replication import SQLiteReplicator
 from common.tests.mixins import (
     APITestMethodsGenerator,
     BaseAPIEndpointTestCase,
@@ -42,56 +66,60 @@ class TestLotListAPIEndpoint(BaseAPIEndpointTestCase):
                     self,
                     f"lot_{n}",
                     LotFactory(
-                        user=getattr(self, f"user_profile_{n}"),
+                        auction__user=getattr(self, f"user_profile_{n}"),
                         name=f"Name {n}",
-                        base_price=str(53.51 + n),
+                        auction__base_price=str(53.51 + n),
                         description=f"Description {n}",
+                        condition=Lot.USED,
                         # Create active and inactive lots
-                        is_active=bool(n % 2),
+                        auction__expires_at=(
+                            "2100-01-01T00:00:00Z" if n % 2
+                            else f"2019-12-19T0{n}:40:01Z"
+                        ),
                         public_id=uuid_list[n - 1]
                     )
                 )
 
-    def get_expected_lots(self) -> tuple:
-        lot_1 = {
-            "public_id": "835d0415-4a38-4f53-bb15-1339b4d825ba",
-            "created_at": "2019-12-19T01:35:01Z",
-            "user": 2,
-            "name": "Name 1",
-            "description": "Description 1",
-            "base_price": "54.51",
-            "base_price_currency": "GBP",
-            "is_active": True
-        }
-        lot_2 = {
-            "public_id": "16727ef1-d110-4c3b-8b2e-24b3395fedd4",
-            "created_at": "2019-12-19T02:35:01Z",
-            "user": 3,
-            "name": "Name 2",
-            "description": "Description 2",
-            "base_price": "55.51",
-            "base_price_currency": "GBP",
-            "is_active": False
-        }
-        lot_3 = {
-            "public_id": "e8f757a3-2fb1-4275-8473-729edc8ced4a",
-            "created_at": "2019-12-19T03:35:01Z",
-            "user": 4,
-            "name": "Name 3",
-            "description": "Description 3",
-            "base_price": "56.51",
+    def get_expected_lot(self, n: int, is_active: bool) -> dict:
+        user_profile = getattr(self, f"user_profile_{n}")
+        public_id = str(getattr(self, f"lot_{n}").public_id)
+        return {
+            "user": (
+                f"http://testserver/api/account/v1/users/"
+                f"{user_profile.public_id}"
+            ),
+            "username": user_profile.auth_user.username,
+            "public_id": public_id,
+            "created_at": f"2019-12-19T0{n}:35:01Z",
+            "is_active": is_active,
+            "status": Auction.OPEN,
+            "detail_url": (
+                f"http://testserver/api/auction/v1/lots/{public_id}"
+            ),
+            "name": f"Name {n}",
+            "base_price": f"{53.51 + n:.2f}",
             "base_price_currency": "GBP",
-            "is_active": True
+            "condition": Lot.USED,
+            "expires_at": (
+                "2100-01-01T00:00:00Z" if is_active
+                else f"2019-12-19T0{n}:40:01Z"
+            ),
         }
-        return lot_1, lot_2, lot_3
+
+    def get_expected_lots(self) -> tuple:
+        return (
+            self.get_expected_lot(1, is_active=True),
+            self.get_expected_lot(2, is_active=False),
+            self.get_expected_lot(3, is_active=True),
+        )
 
     def test_authenticated_get_request_when_no_auctions_returns_empty(self):
-        Lot.objects.delete()
+        Lot.objects.all().delete()
         http_auth = self.get_http_authorization(self.auth_user)
         response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
         self.assertEquals(response.status_code, status.HTTP_200_OK)
         expected_response = {
-            "count": 0,
+            "count": None,
             "next": None,
             "previous": None,
             "results": []
@@ -104,8 +132,8 @@ class TestLotListAPIEndpoint(BaseAPIEndpointTestCase):
         self.assertEquals(response.status_code, status.HTTP_200_OK)
         lot_1, lot_2, lot_3 = self.get_expected_lots()
         expected_response = {
-            # Confirm results are paginated
-            "count": 3,
+            # Confirm results are paginated, and only counted on request
+            "count": None,
             "next": None,
             "previous": None,
             "results": [lot_1, lot_2, lot_3]
@@ -117,12 +145,12 @@ class TestLotListAPIEndpoint(BaseAPIEndpointTestCase):
         response = self.make_request(
             "get",
             HTTP_AUTHORIZATION=http_auth,
-            query_params={"is_active": True}
+            query_params={"status": "active"}
         )
         self.assertEquals(response.status_code, status.HTTP_200_OK)
         lot_1, _, lot_3 = self.get_expected_lots()
         expected_response = {
-            "count": 2,
+            "count": None,
             "next": None,
             "previous": None,
             "results": [lot_1, lot_3]
@@ -134,12 +162,12 @@ class TestLotListAPIEndpoint(BaseAPIEndpointTestCase):
         response = self.make_request(
             "get",
             HTTP_AUTHORIZATION=http_auth,
-            query_params={"is_active": False}
+            query_params={"status": "closed"}
         )
         self.assertEquals(response.status_code, status.HTTP_200_OK)
         _, lot_2, _ = self.get_expected_lots()
         expected_response = {
-            "count": 1,
+            "count": None,
             "next": None,
             "previous": None,
             "results": [lot_2]
@@ -156,7 +184,7 @@ class TestLotListAPIEndpoint(BaseAPIEndpointTestCase):
         self.assertEquals(response.status_code, status.HTTP_200_OK)
         lot_1, lot_2, lot_3 = self.get_expected_lots()
         expected_response = {
-            "count": 3,
+            "count": None,
             "next": None,
             "previous": None,
             "results": [lot_3, lot_2, lot_1]
@@ -168,26 +196,52 @@ class TestLotListAPIEndpoint(BaseAPIEndpointTestCase):
         response = self.make_request(
             "get",
             HTTP_AUTHORIZATION=http_auth,
-            query_params={"search": "Name 3"}
+            query_params={"q": "Name 3"}
         )
         self.assertEquals(response.status_code, status.HTTP_200_OK)
         _, _, lot_3 = self.get_expected_lots()
-        expected_response = {
-            "count": 1,
-            "next": None,
-            "previous": None,
-            "results": [lot_3]
-        }
-        self.assertEquals(response.json(), expected_response)
+        self.assertEquals(response.json()["results"], [lot_3])
+
+
+class TestLotListQueryCountAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:list_create"
+    supported_methods = {"get", "post"}
+
+    def create_listed_objects(self, amount: int):
+        LotFactory.create_batch(amount)
 
 
 class TestLotCreateAPIEndpoint(BaseAPIEndpointTestCase):
     url = "api:auction:v1:lots:list_create"
     supported_methods = {"get", "post"}
 
+    def setUp(self):
+        super().setUp()
+        get_exchange_rates().invalidate()
+        self.addCleanup(get_exchange_rates().invalidate)
+        ExchangeRate.objects.create(currency="EUR", rate=Decimal("0.87"))
+
+    def get_expected_lot(self, lot: Lot) -> dict:
+        user_profile = self.auth_user.user_profile
+        return {
+            "user": (
+                f"http://testserver/api/account/v1/users/"
+                f"{user_profile.public_id}"
+            ),
+            "username": self.auth_user.username,
+            "public_id": str(lot.public_id),
+            "created_at": "2020-04-18T04:35:01Z",
+            "status": Auction.OPEN,
+            "detail_url": (
+                f"http://testserver/api/auction/v1/lots/{lot.public_id}"
+            ),
+            "name": "Old Portrait",
+            "condition": Lot.USED,
+        }
+
     def test_user_can_create_lot_with_minimal_information(self):
         self.assertEquals(Lot.objects.count(), 0)
-        create_data = {"name": "Old Portrait"}
+        create_data = {"name": "Old Portrait", "condition": Lot.USED}
         http_auth = self.get_http_authorization(self.auth_user)
         with freeze_time("2020-04-18 04:35:01"):
             response = self.make_request(
@@ -198,26 +252,24 @@ class TestLotCreateAPIEndpoint(BaseAPIEndpointTestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEquals(Lot.objects.count(), 1)
         lot = Lot.objects.get()
-        expected_result = {
-            "public_id": str(lot.public_id),
-            "created_at": "2020-04-18T04:35:01Z",
-            "user": self.auth_user.user_profile.id,
-            "name": "Old Portrait",
-            "description": None,
-            "base_price": "0.00",
-            "base_price_currency": "GBP",
-            "is_active": False
-        }
+        expected_result = dict(
+            self.get_expected_lot(lot),
+            base_price="0.00",
+            base_price_currency="GBP",
+            # Lots are created inactive, expiring as they are created
+            expires_at="2020-04-18T04:35:01Z",
+            is_active=False,
+        )
         self.assertEqual(response.json(), expected_result)
 
     def test_user_can_create_lot_with_maximum_information(self):
         self.assertEquals(Lot.objects.count(), 0)
         create_data = {
             "name": "Old Portrait",
-            "description": "An old, dusty family portrait.",
+            "condition": Lot.USED,
             "base_price": "15.43",
             "base_price_currency": "EUR",
-            "is_active": True
+            "expires_at": "2020-04-25T04:35:01Z",
         }
         http_auth = self.get_http_authorization(self.auth_user)
         with freeze_time("2020-04-18 04:35:01"):
@@ -229,23 +281,54 @@ class TestLotCreateAPIEndpoint(BaseAPIEndpointTestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEquals(Lot.objects.count(), 1)
         lot = Lot.objects.get()
-        expected_result = {
-            "public_id": str(lot.public_id),
-            "created_at": "2020-04-18T04:35:01Z",
-            "user": self.auth_user.user_profile.id,
-            "name": "Old Portrait",
-            "description": "An old, dusty family portrait.",
-            "base_price": "15.43",
-            "base_price_currency": "EUR",
-            "is_active": True
-        }
+        expected_result = dict(
+            self.get_expected_lot(lot),
+            base_price="15.43",
+            base_price_currency="EUR",
+            expires_at="2020-04-25T04:35:01Z",
+            is_active=True,
+        )
         self.assertEqual(response.json(), expected_result)
 
     def test_user_cannot_create_lot_missing_required_information(self):
         http_auth = self.get_http_authorization(self.auth_user)
         response = self.make_request("post", HTTP_AUTHORIZATION=http_auth)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(response.json(), {"name": ["This field is required."]})
+        self.assertEqual(response.json(), {
+            "name": ["This field is required."],
+            "condition": ["This field is required."],
+        })
+
+    def test_retried_creation_with_the_same_idempotency_key_creates_once(self):
+        caches["idempotency"].clear()
+        http_auth = self.get_http_authorization(self.auth_user)
+        responses = [
+            self.make_request(
+                "post",
+                HTTP_AUTHORIZATION=http_auth,
+                HTTP_IDEMPOTENCY_KEY="lot-1",
+                data={"name": "Old Portrait", "condition": Lot.USED}
+            )
+            for _ in range(2)
+        ]
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_201_CREATED, status.HTTP_201_CREATED],
+        )
+        self.assertEqual(responses[0].json(), responses[1].json())
+        self.assertEqual(responses[1]["Idempotent-Replayed"], "true")
+        self.assertEquals(Lot.objects.count(), 1)
+
+    def test_user_cannot_send_an_empty_idempotency_key(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "post",
+            HTTP_AUTHORIZATION=http_auth,
+            HTTP_IDEMPOTENCY_KEY="",
+            data={"name": "Old Portrait"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Lot.objects.exists())
 
 
 class TestLotRetrieveAPIEndpoint(BaseAPIEndpointTestCase):
@@ -256,17 +339,18 @@ class TestLotRetrieveAPIEndpoint(BaseAPIEndpointTestCase):
         super().setUp()
         with freeze_time("2019-12-19 04:35:01"):
             self.lot = LotFactory(
-                user=self.auth_user.user_profile,
-                base_price="46.00",
+                auction__user=self.auth_user.user_profile,
+                auction__base_price="46.00",
+                auction__expires_at="2100-01-01T00:00:00Z",
                 name="Grandma's Music Box",
                 description="Beautiful antique that belonged to my granny.",
-                is_active=True
+                condition=Lot.USED,
             )
-        for n in range(1, 4):
+        for n, price in enumerate(("50.00", "60.00", "55.00"), start=1):
             setattr(
                 self,
                 f"bid_{n}",
-                BidFactory(lot=self.lot)
+                BidFactory(auction=self.lot.auction, price=price)
             )
         self.url_args = [self.lot.public_id]
 
@@ -274,24 +358,31 @@ class TestLotRetrieveAPIEndpoint(BaseAPIEndpointTestCase):
         http_auth = self.get_http_authorization(self.auth_user)
         response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
         self.assertEquals(response.status_code, status.HTTP_200_OK)
+        lot_url = f"http://testserver/api/auction/v1/lots/{self.lot.public_id}"
         expected_response = {
             "base_price": "46.00",
             "base_price_currency": "GBP",
-            # TODO: change this; add endpoint to retrieve bids
-            "bids": [
-                self.bid_3.id,
-                self.bid_2.id,
-                self.bid_1.id,
-            ],
+            "bid_count": 3,
+            "bids": f"{lot_url}/history",
+            "condition": Lot.USED,
             "created_at": "2019-12-19T04:35:01Z",
             "description": "Beautiful antique that belonged to my granny.",
-            "highest_bid": None,
+            "expires_at": "2100-01-01T00:00:00Z",
+            "highest_bid": (
+                f"http://testserver/api/auction/v1/bids/"
+                f"{self.bid_2.public_id}"
+            ),
+            "highest_bid_price": "60.00",
             "is_active": True,
             "modified_at": None,
             "name": "Grandma's Music Box",
             "public_id": str(self.lot.public_id),
-            "sale_record": None,
-            "user": self.auth_user.user_profile.id
+            "status": Auction.OPEN,
+            "user": (
+                f"http://testserver/api/account/v1/users/"
+                f"{self.auth_user.user_profile.public_id}"
+            ),
+            "username": self.auth_user.username,
         }
         self.assertEquals(response.json(), expected_response)
 
@@ -315,36 +406,101 @@ class TestLotRetrieveAPIEndpoint(BaseAPIEndpointTestCase):
         self.assertEquals(response.json(), {'detail': 'Not found.'})
 
 
+class TestLotRetrieveHighestBidAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:retrieve_update_destroy"
+    supported_methods = {"get", "put", "patch", "delete"}
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory(auction__base_price="10.00")
+        self.url_args = [self.lot.public_id]
+
+    def test_get_request_returns_highest_bid_of_the_auction(self):
+        BidFactory(auction=self.lot.auction, price="12.00")
+        bid = BidFactory(auction=self.lot.auction, price="30.00")
+        BidFactory(auction=self.lot.auction, price="20.00")
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(
+            response.json()["highest_bid"],
+            f"http://testserver/api/auction/v1/bids/{bid.public_id}"
+        )
+        self.assertEquals(response.json()["highest_bid_price"], "30.00")
+        self.assertEquals(response.json()["bid_count"], 3)
+
+    def test_get_request_query_count_does_not_grow_with_bids(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        # One query to authenticate and a single query for the lot
+        with self.assertNumQueries(2):
+            self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+        for price in ("11.00", "12.00", "13.00", "14.00"):
+            BidFactory(auction=self.lot.auction, price=price)
+        # Only the lot is queried again, as the access token is cached
+        with self.assertNumQueries(1):
+            self.make_request("get", HTTP_AUTHORIZATION=http_auth)
+
+
 class TestLotUpdateAPIEndpoint(BaseAPIEndpointTestCase):
     url = "api:auction:v1:lots:retrieve_update_destroy"
     supported_methods = {"get", "put", "patch", "delete"}
 
     def setUp(self):
         super().setUp()
+        get_exchange_rates().invalidate()
+        self.addCleanup(get_exchange_rates().invalidate)
+        ExchangeRate.objects.create(currency="EUR", rate=Decimal("0.87"))
         with freeze_time("2019-12-19 04:35:01"):
             self.lot = LotFactory(
-                user=self.auth_user.user_profile,
-                base_price="46.00",
+                auction__user=self.auth_user.user_profile,
+                auction__base_price="46.00",
+                auction__expires_at="2100-01-01T00:00:00Z",
                 name="Grandma's Music Box",
                 description="Beautiful antique that belonged to my granny.",
-                is_active=True
+                condition=Lot.USED,
             )
         self.url_args = [self.lot.public_id]
 
     @property
     def partial_update_data(self):
-        return {"is_active": False}
+        return {"name": "Updated name"}
 
     @property
     def complete_update_data(self):
         return {
-            "is_active": False,
             "base_price": "18.98",
             "base_price_currency": "EUR",
+            "condition": Lot.DEFECTIVE,
             "description": "Updated description.",
+            "expires_at": "2100-06-01T00:00:00Z",
             "name": "Updated name",
         }
 
+    def get_expected_lot(self, **changes) -> dict:
+        lot_url = f"http://testserver/api/auction/v1/lots/{self.lot.public_id}"
+        return dict({
+            "base_price": "46.00",
+            "base_price_currency": "GBP",
+            "bid_count": 0,
+            "bids": f"{lot_url}/history",
+            "condition": Lot.USED,
+            "created_at": "2019-12-19T04:35:01Z",
+            "description": "Beautiful antique that belonged to my granny.",
+            "expires_at": "2100-01-01T00:00:00Z",
+            "highest_bid": None,
+            "highest_bid_price": None,
+            "is_active": True,
+            "modified_at": None,
+            "name": "Grandma's Music Box",
+            "public_id": str(self.lot.public_id),
+            "status": Auction.OPEN,
+            "user": (
+                f"http://testserver/api/account/v1/users/"
+                f"{self.auth_user.user_profile.public_id}"
+            ),
+            "username": self.auth_user.username,
+        }, **changes)
+
     def test_write_parameters_to_existing_auction_partial_update(self):
         http_auth = self.get_http_authorization(self.auth_user)
         with freeze_time("2020-04-10 09:11:34"):
@@ -355,27 +511,17 @@ class TestLotUpdateAPIEndpoint(BaseAPIEndpointTestCase):
                 content_type="application/json"
             )
         self.assertEquals(response.status_code, status.HTTP_200_OK)
-        expected_response = {
-            "base_price": "46.00",
-            "base_price_currency": "GBP",
-            "bids": [],
-            "created_at": "2019-12-19T04:35:01Z",
-            "description": "Beautiful antique that belonged to my granny.",
-            "highest_bid": None,
-            "is_active": False,
-            "modified_at": "2020-04-10T09:11:34Z",
-            "name": "Grandma's Music Box",
-            "public_id": str(self.lot.public_id),
-            "sale_record": None,
-            "user": self.auth_user.user_profile.id
-        }
+        expected_response = self.get_expected_lot(
+            modified_at="2020-04-10T09:11:34Z",
+            name="Updated name",
+        )
         self.assertEquals(response.json(), expected_response)
 
         # Confirm that the table has added a modified_at record
         self.lot.refresh_from_db()
         self.assertEqual(
-            self.lot.modified_at.strftime("%Y-%m-%d %H:%M:%s"),
-            "2020-04-10 09:11:1586509894"
+            self.lot.modified_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "2020-04-10 09:11:34"
         )
 
     def test_write_parameters_to_existing_auction_complete_update(self):
@@ -388,27 +534,22 @@ class TestLotUpdateAPIEndpoint(BaseAPIEndpointTestCase):
                 content_type="application/json"
             )
         self.assertEquals(response.status_code, status.HTTP_200_OK)
-        expected_response = {
-            "base_price": "18.98",
-            "base_price_currency": "EUR",
-            "bids": [],
-            "created_at": "2019-12-19T04:35:01Z",
-            "description": "Updated description.",
-            "highest_bid": None,
-            "is_active": False,
-            "modified_at": "2020-04-10T09:11:34Z",
-            "name": "Updated name",
-            "public_id": str(self.lot.public_id),
-            "sale_record": None,
-            "user": self.auth_user.user_profile.id
-        }
+        expected_response = self.get_expected_lot(
+            base_price="18.98",
+            base_price_currency="EUR",
+            condition=Lot.DEFECTIVE,
+            description="Updated description.",
+            expires_at="2100-06-01T00:00:00Z",
+            modified_at="2020-04-10T09:11:34Z",
+            name="Updated name",
+        )
         self.assertEquals(response.json(), expected_response)
 
         # Confirm that the table has added a modified_at record
         self.lot.refresh_from_db()
         self.assertEqual(
-            self.lot.modified_at.strftime("%Y-%m-%d %H:%M:%s"),
-            "2020-04-10 09:11:1586509894"
+            self.lot.modified_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "2020-04-10 09:11:34"
         )
 
     def test_read_only_parameters_to_auction_does_not_do_partial_update(self):
@@ -427,21 +568,7 @@ class TestLotUpdateAPIEndpoint(BaseAPIEndpointTestCase):
                 content_type="application/json"
             )
         self.assertEquals(response.status_code, status.HTTP_200_OK)
-        expected_response = {
-            "base_price": "46.00",
-            "base_price_currency": "GBP",
-            "bids": [],
-            "created_at": "2019-12-19T04:35:01Z",
-            "description": "Beautiful antique that belonged to my granny.",
-            "highest_bid": None,
-            "is_active": True,
-            "modified_at": None,
-            "name": "Grandma's Music Box",
-            "public_id": str(self.lot.public_id),
-            "sale_record": None,
-            "user": self.auth_user.user_profile.id
-        }
-        self.assertEquals(response.json(), expected_response)
+        self.assertEquals(response.json(), self.get_expected_lot())
 
         # Confirm that the table has added a modified_at record
         self.lot.refresh_from_db()
@@ -463,7 +590,10 @@ class TestLotUpdateAPIEndpoint(BaseAPIEndpointTestCase):
                 content_type="application/json"
             )
         self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
-        expected_response = {"name": ["This field is required."]}
+        expected_response = {
+            "name": ["This field is required."],
+            "condition": ["This field is required."],
+        }
         self.assertEquals(response.json(), expected_response)
 
         # Confirm that the table has added a modified_at record
@@ -543,6 +673,27 @@ class TestLotUpdateAPIEndpoint(BaseAPIEndpointTestCase):
         self.lot.refresh_from_db()
         self.assertIsNone(self.lot.modified_at)
 
+    def test_base_price_cannot_be_updated_in_currency_without_exchange_rate(
+        self
+    ):
+        Auction.objects.filter(pk=self.lot.auction_id).update(
+            base_price_currency="JPY"
+        )
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "patch",
+            HTTP_AUTHORIZATION=http_auth,
+            data={"base_price": "20.00"},
+            content_type="application/json"
+        )
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEquals(
+            response.json(),
+            {"base_price_currency": ["No exchange rate is known for JPY."]}
+        )
+        self.lot.auction.refresh_from_db()
+        self.assertEquals(self.lot.auction.base_price, Money("46.00", "JPY"))
+
 
 class TestLotDeleteAPIEndpoint(BaseAPIEndpointTestCase):
     url = "api:auction:v1:lots:retrieve_update_destroy"
@@ -550,25 +701,28 @@ class TestLotDeleteAPIEndpoint(BaseAPIEndpointTestCase):
 
     def setUp(self):
         super().setUp()
-        self.lot = LotFactory(user=self.auth_user.user_profile)
+        self.lot = LotFactory(
+            auction__user=self.auth_user.user_profile,
+            auction__expires_at="2100-01-01T00:00:00Z",
+        )
         self.url_args = [self.lot.public_id]
 
-    def test_active_lot_cannot_be_deleted_with_endpoint(self):
-        # Set the lot active
-        self.lot.is_active = True
-        self.lot.save()
+    def test_inactive_lot_cannot_be_deleted_with_endpoint(self):
+        # Set the lot inactive, by expiring its auction
+        Auction.objects.filter(pk=self.lot.auction_id).update(
+            expires_at=timezone.now()
+        )
 
         # Make request and confirm expected response and status code
         http_auth = self.get_http_authorization(self.auth_user)
-        with freeze_time(f"2020-02-10 10:00:00"):
-            response = self.make_request("delete", HTTP_AUTHORIZATION=http_auth)
+        response = self.make_request("delete", HTTP_AUTHORIZATION=http_auth)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(
             response.json(),
             {
                 'detail': (
-                    'Cannot delete a lot which is currently active. '
-                    'Please set it inactive first.'
+                    'Cannot update neither delete a lot which is no '
+                    'longer active.'
                 )
             }
         )
@@ -581,11 +735,7 @@ class TestLotDeleteAPIEndpoint(BaseAPIEndpointTestCase):
         self.lot.refresh_from_db()
         self.assertIsNone(self.lot.deleted_at)
 
-    def test_inactive_lot_is_successfully_soft_deleted(self):
-        # Set the lot inactive
-        self.lot.is_active = False
-        self.lot.save()
-
+    def test_active_lot_is_successfully_soft_deleted(self):
         # Make request and confirm expected response and status code
         http_auth = self.get_http_authorization(self.auth_user)
         with freeze_time(f"2020-02-10 10:00:00"):
@@ -597,13 +747,582 @@ class TestLotDeleteAPIEndpoint(BaseAPIEndpointTestCase):
         self.assertQuerysetEqual(Lot.objects.all(), [])
         self.lot.refresh_from_db()
         self.assertEqual(
-            self.lot.deleted_at.strftime("%Y-%m-%d %H:%M:%s"),
-            "2020-02-10 10:00:1581328800"
+            self.lot.deleted_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "2020-02-10 10:00:00"
         )
 
 
 APITestMethodsGenerator.generate_test_methods(TestLotListAPIEndpoint)
+APITestMethodsGenerator.generate_test_methods(
+    TestLotListQueryCountAPIEndpoint
+)
 APITestMethodsGenerator.generate_test_methods(TestLotCreateAPIEndpoint)
 APITestMethodsGenerator.generate_test_methods(TestLotRetrieveAPIEndpoint)
+APITestMethodsGenerator.generate_test_methods(
+    TestLotRetrieveHighestBidAPIEndpoint
+)
 APITestMethodsGenerator.generate_test_methods(TestLotUpdateAPIEndpoint)
 APITestMethodsGenerator.generate_test_methods(TestLotDeleteAPIEndpoint)
+
+
+@freeze_time("2020-04-18 04:35:01")
+class TestLotListStatusFilterAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:list_create"
+    supported_methods = {"get", "post"}
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.closed_lot = LotFactory(auction__expires_at=now)
+        self.ending_soon_lot = LotFactory(
+            auction__expires_at=now + timedelta(minutes=10)
+        )
+        self.active_lot = LotFactory(
+            auction__expires_at=now + timedelta(days=2)
+        )
+
+    def get_listed_lots(self, status_filter: str) -> list:
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            query_params={"status": status_filter}
+        )
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        return [lot["public_id"] for lot in response.json()["results"]]
+
+    def test_get_request_can_filter_active_lots(self):
+        self.assertEquals(
+            self.get_listed_lots("active"),
+            [
+                str(self.ending_soon_lot.public_id),
+                str(self.active_lot.public_id),
+            ]
+        )
+
+    def test_get_request_can_filter_lots_ending_soon(self):
+        self.assertEquals(
+            self.get_listed_lots("ending_soon"),
+            [str(self.ending_soon_lot.public_id)]
+        )
+
+    def test_get_request_can_filter_closed_lots(self):
+        self.assertEquals(
+            self.get_listed_lots("closed"),
+            [str(self.closed_lot.public_id)]
+        )
+
+    def test_get_request_with_unknown_status_returns_400(self):
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=http_auth,
+            query_params={"status": "sold"}
+        )
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_status_filter_is_a_range_scan_on_the_expiry_index(self):
+        queryset = LotFilterSet(
+            {"status": "active"}, queryset=Lot.objects.all()
+        ).qs
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("auction_auc_expires_63a943_idx (expires_at>?)", plan)
+
+
+class TestLotListPriceAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:list_create"
+    supported_methods = {"get", "post"}
+
+    def setUp(self):
+        super().setUp()
+        get_exchange_rates().invalidate()
+        self.addCleanup(get_exchange_rates().invalidate)
+        ExchangeRate.objects.create(currency="EUR", rate=Decimal("0.87"))
+        ExchangeRate.objects.create(currency="USD", rate=Decimal("0.75"))
+        # Worth 17.40, 15.00 and 16.00 GBP
+        self.euro_lot = LotFactory(
+            auction__base_price=Money("20.00", "EUR")
+        )
+        self.dollar_lot = LotFactory(
+            auction__base_price=Money("20.00", "USD")
+        )
+        self.pound_lot = LotFactory(
+            auction__base_price=Money("16.00", "GBP")
+        )
+        self.http_auth = self.get_http_authorization(self.auth_user)
+
+    def get_listed_lots(self, **query_params) -> list:
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=self.http_auth,
+            query_params=query_params
+        )
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        return [lot["public_id"] for lot in response.json()["results"]]
+
+    def test_get_request_orders_lots_by_price_in_any_currency(self):
+        self.assertEquals(
+            self.get_listed_lots(ordering="auction__base_price"),
+            [
+                str(self.dollar_lot.public_id),
+                str(self.pound_lot.public_id),
+                str(self.euro_lot.public_id),
+            ]
+        )
+        self.assertEquals(
+            self.get_listed_lots(ordering="-auction__base_price"),
+            [
+                str(self.euro_lot.public_id),
+                str(self.pound_lot.public_id),
+                str(self.dollar_lot.public_id),
+            ]
+        )
+
+    def test_get_request_can_filter_lots_by_price_in_any_currency(self):
+        self.assertEquals(
+            self.get_listed_lots(
+                min_price="15.50",
+                max_price="17.00",
+                ordering="auction__base_price",
+            ),
+            [str(self.pound_lot.public_id)]
+        )
+        self.assertEquals(
+            self.get_listed_lots(
+                min_price="16.00", ordering="auction__base_price"
+            ),
+            [str(self.pound_lot.public_id), str(self.euro_lot.public_id)]
+        )
+
+    def test_price_filter_is_a_range_scan_on_the_price_index(self):
+        queryset = LotFilterSet(
+            {"min_price": "15.50"}, queryset=Lot.objects.all()
+        ).qs
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn(
+            "auction_auc_normali_f077f5_idx (normalized_base_price>?)", plan
+        )
+
+    def test_user_cannot_create_lot_in_currency_without_exchange_rate(self):
+        response = self.make_request(
+            "post",
+            HTTP_AUTHORIZATION=self.http_auth,
+            data={
+                "name": "Old Portrait",
+                "condition": Lot.USED,
+                "base_price": "2000",
+                "base_price_currency": "JPY",
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(),
+            {"base_price_currency": ["No exchange rate is known for JPY."]}
+        )
+
+
+class TestLotListSearchAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:list_create"
+    supported_methods = {"get", "post"}
+
+    def setUp(self):
+        super().setUp()
+        self.described_lot = LotFactory(
+            name="Antique radio",
+            description="Comes with a walnut gramophone cabinet.",
+        )
+        self.named_lot = LotFactory(
+            name="Walnut gramophone",
+            description="Plays records at 78 revolutions per minute.",
+        )
+        self.other_lot = LotFactory(
+            name="Oak bookcase",
+            description="Five shelves.",
+        )
+        self.http_auth = self.get_http_authorization(self.auth_user)
+
+    def search_lots(self, query: str, **query_params) -> list:
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=self.http_auth,
+            query_params={"q": query, **query_params}
+        )
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        return [lot["public_id"] for lot in response.json()["results"]]
+
+    def test_get_request_lists_lots_matching_names_first(self):
+        self.assertEquals(
+            self.search_lots("gramophone"),
+            [
+                str(self.named_lot.public_id),
+                str(self.described_lot.public_id),
+            ]
+        )
+
+    def test_get_request_matches_stemmed_words_and_prefixes(self):
+        self.assertEquals(
+            self.search_lots("record"), [str(self.named_lot.public_id)]
+        )
+        self.assertEquals(
+            self.search_lots("book"), [str(self.other_lot.public_id)]
+        )
+
+    def test_get_request_ignores_search_syntax(self):
+        self.assertEquals(
+            self.search_lots('oak" (*'),
+            [str(self.other_lot.public_id)]
+        )
+        self.assertEquals(self.search_lots("*"), [])
+
+    def test_get_request_can_order_search_results(self):
+        self.assertEquals(
+            self.search_lots("walnut", ordering="created_at"),
+            [
+                str(self.described_lot.public_id),
+                str(self.named_lot.public_id),
+            ]
+        )
+
+    def test_updated_lots_are_searched_by_their_new_name(self):
+        self.other_lot.name = "Pine bookcase"
+        self.other_lot.save()
+        self.assertEquals(
+            self.search_lots("pine"), [str(self.other_lot.public_id)]
+        )
+        self.assertEquals(self.search_lots("oak"), [])
+
+    def test_deleted_lots_are_not_searched(self):
+        self.named_lot.delete()
+        self.assertEquals(
+            self.search_lots("gramophone"),
+            [str(self.described_lot.public_id)]
+        )
+
+    def test_search_results_are_paginated_by_offset(self):
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=self.http_auth,
+            query_params={"q": "walnut", "limit": 1}
+        )
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEquals(data["count"], 2)
+        self.assertIn("offset=1", data["next"])
+
+class TestLotRetrieveCacheAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:retrieve_update_destroy"
+    supported_methods = {"get", "put", "patch", "delete"}
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory(auction__base_price="10.00")
+        self.url_args = [self.lot.public_id]
+        self.http_auth = self.get_http_authorization(self.auth_user)
+
+    def get_lot(self):
+        response = self.make_request("get", HTTP_AUTHORIZATION=self.http_auth)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_repeated_get_requests_are_served_from_the_cache(self):
+        stats = get_lot_cache().get_stats()
+        self.assertEquals(self.get_lot()["X-Cache"], "MISS")
+        # Neither the lot nor the access token, cached by the first request,
+        # are queried
+        with self.assertNumQueries(0):
+            response = self.get_lot()
+        self.assertEquals(response["X-Cache"], "HIT")
+        self.assertEquals(
+            response.json()["public_id"], str(self.lot.public_id)
+        )
+        self.assertEquals(get_lot_cache().get_stats(), {
+            "hits": stats["hits"] + 1,
+            "misses": stats["misses"] + 1,
+        })
+
+    def test_lots_are_cached_for_each_media_type(self):
+        json_response = self.get_lot()
+        self.assertEquals(json_response["X-Cache"], "MISS")
+        for cache in ("MISS", "HIT"):
+            # Never served the representation cached as JSON
+            response = self.make_request(
+                "get",
+                HTTP_AUTHORIZATION=self.http_auth,
+                HTTP_ACCEPT="text/html",
+            )
+            self.assertEquals(response.status_code, status.HTTP_200_OK)
+            self.assertEquals(response["X-Cache"], cache)
+            self.assertTrue(response["Content-Type"].startswith("text/html"))
+            self.assertNotEquals(response["ETag"], json_response["ETag"])
+        response = self.get_lot()
+        self.assertEquals(response["X-Cache"], "HIT")
+        self.assertEquals(response["ETag"], json_response["ETag"])
+
+    def test_indented_lots_are_cached_indented(self):
+        json_response = self.get_lot()
+        for cache in ("MISS", "HIT"):
+            response = self.make_request(
+                "get",
+                HTTP_AUTHORIZATION=self.http_auth,
+                HTTP_ACCEPT="application/json; indent=4",
+            )
+            self.assertEquals(response["X-Cache"], cache)
+            self.assertEquals(
+                response.content,
+                json.dumps(response.json(), indent=4).encode(),
+            )
+            self.assertNotEquals(response["ETag"], json_response["ETag"])
+
+    def test_placing_a_bid_invalidates_the_cached_lot(self):
+        self.get_lot()
+        BidFactory(auction=self.lot.auction, price="30.00")
+        response = self.get_lot()
+        self.assertEquals(response["X-Cache"], "MISS")
+        self.assertEquals(response.json()["highest_bid_price"], "30.00")
+        self.assertEquals(response.json()["bid_count"], 1)
+
+    def test_updating_the_lot_invalidates_the_cached_lot(self):
+        self.get_lot()
+        response = self.make_request(
+            "patch",
+            HTTP_AUTHORIZATION=self.http_auth,
+            data={"name": "Renamed lot"},
+            content_type="application/json"
+        )
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        response = self.get_lot()
+        self.assertEquals(response["X-Cache"], "MISS")
+        self.assertEquals(response.json()["name"], "Renamed lot")
+
+    def test_deleting_the_lot_invalidates_the_cached_lot(self):
+        self.get_lot()
+        response = self.make_request(
+            "delete", HTTP_AUTHORIZATION=self.http_auth
+        )
+        self.assertEquals(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.make_request("get", HTTP_AUTHORIZATION=self.http_auth)
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deleting_the_lot_from_the_database_invalidates_the_cached_lot(
+        self
+    ):
+        self.get_lot()
+        self.lot.hard_delete()
+        response = self.make_request("get", HTTP_AUTHORIZATION=self.http_auth)
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deleting_the_auction_invalidates_the_cached_lot(self):
+        self.get_lot()
+        self.lot.auction.hard_delete()
+        response = self.make_request("get", HTTP_AUTHORIZATION=self.http_auth)
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_request_with_matching_etag_is_not_modified(self):
+        etag = self.get_lot()["ETag"]
+        # A single query for the lot's ETag, with the access token cached
+        with self.assertNumQueries(1):
+            response = self.make_request(
+                "get",
+                HTTP_AUTHORIZATION=self.http_auth,
+                HTTP_IF_NONE_MATCH=etag,
+            )
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEquals(response.content, b"")
+
+    def test_placing_a_bid_changes_the_etag(self):
+        etag = self.get_lot()["ETag"]
+        BidFactory(auction=self.lot.auction, price="30.00")
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=self.http_auth,
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertNotEquals(response["ETag"], etag)
+
+    def test_lots_are_not_cached_beyond_their_expiry(self):
+        expires_at = timezone.now() + timedelta(seconds=60)
+        Auction.objects.filter(pk=self.lot.auction_id).update(
+            expires_at=expires_at
+        )
+        self.get_lot()
+        with freeze_time(expires_at + timedelta(seconds=1)):
+            response = self.make_request(
+                "get", HTTP_AUTHORIZATION=self.http_auth
+            )
+        self.assertEquals(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica"],
+    # Routers are only set up again when their setting changes
+    DATABASE_ROUTERS=settings.DATABASE_ROUTERS,
+)
+class TestLotRetrieveCacheReplicaAPIEndpoint(TransactionTestCase):
+    """
+    Lots read while the replica lags behind the primary, which is only
+    brought up to date by copying the primary over it, once committed.
+    """
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory(auction__base_price="10.00")
+        self.url = reverse(
+            "api:auction:v1:lots:retrieve_update_destroy",
+            args=[self.lot.public_id],
+        )
+        self.replicator = SQLiteReplicator(
+            connections["default"].settings_dict["NAME"],
+            [connections["replica"].settings_dict["NAME"]],
+        )
+        access_token = AccessToken.objects.create(
+            user=AuthUserFactory(),
+            scope="read write",
+            expires=timezone.now() + timedelta(seconds=300),
+            token=f"replica-access-token-{self.lot.public_id}",
+        )
+        self.http_auth = (
+            f"{settings.OAUTH2_AUTHORIZATION_SCHEME} {access_token}"
+        )
+
+    def get_lot(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.http_auth)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_lots_are_cached_from_the_primary(self):
+        self.replicator.replicate()
+        place_bid(self.lot.auction, UserProfileFactory(), Decimal("30.00"))
+        # Lots are read from the replica, which has not got the bid yet
+        self.assertFalse(
+            Lot.objects.filter(
+                auction__bid_count=1
+            ).using("replica").exists()
+        )
+        self.assertEquals(self.get_lot()["bid_count"], 1)
+        self.assertEquals(self.get_lot()["bid_count"], 1)
+        self.assertEquals(self.get_lot()["highest_bid_price"], "30.00")
+
+
+class TestLotExportAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:export"
+    supported_methods = {"get"}
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.closed_lot = LotFactory(auction__expires_at=now)
+        self.active_lot = LotFactory(
+            auction__expires_at=now + timedelta(days=2),
+            auction__base_price="10.00",
+        )
+        BidFactory(auction=self.active_lot.auction, price="12.00")
+
+    @cached_property
+    def http_auth(self) -> str:
+        return self.get_http_authorization(self.auth_user)
+
+    def export(self, **query_params) -> list:
+        response = self.make_request(
+            "get",
+            HTTP_AUTHORIZATION=self.http_auth,
+            query_params=query_params,
+        )
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(
+            response["Content-Type"], "application/x-ndjson; charset=utf-8"
+        )
+        content = b"".join(response.streaming_content)
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_get_request_streams_lot_catalogue(self):
+        lot = self.active_lot
+        auction = lot.auction
+        self.assertEquals(
+            self.export()[1],
+            {
+                "public_id": str(lot.public_id),
+                "created_at": lot.created_at.isoformat()[:-6] + "Z",
+                "name": lot.name,
+                "condition": lot.condition,
+                "user": str(auction.user.public_id),
+                "base_price": "10.00",
+                "base_price_currency": auction.base_price.currency.code,
+                "expires_at": auction.expires_at.isoformat()[:-6] + "Z",
+                "status": Auction.OPEN,
+                "highest_bid_price": "12.00",
+                "bid_count": 1,
+            }
+        )
+
+    def test_get_request_can_filter_exported_lots_by_status(self):
+        self.assertEquals(
+            [lot["public_id"] for lot in self.export(status="closed")],
+            [str(self.closed_lot.public_id)]
+        )
+
+    def test_get_request_does_not_export_deleted_lots(self):
+        self.closed_lot.delete()
+        self.assertEquals(
+            [lot["public_id"] for lot in self.export()],
+            [str(self.active_lot.public_id)]
+        )
+
+
+APITestMethodsGenerator.generate_test_methods(TestLotExportAPIEndpoint)
+
+
+class TestLotListCompiledAPIEndpoint(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:list_create"
+    supported_methods = {"get", "post"}
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        LotFactory(auction__expires_at=now, auction__base_price="0.50")
+        LotFactory(auction__user=None, auction__status=Auction.CLOSED)
+        lot = LotFactory(auction__expires_at=now + timedelta(days=2))
+        BidFactory(auction=lot.auction, price="1000.00")
+
+    def assert_listed_as_serialized(self, **query_params):
+        http_auth = self.get_http_authorization(self.auth_user)
+        response = self.make_request(
+            "get", HTTP_AUTHORIZATION=http_auth, query_params=query_params
+        )
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        lots = Lot.objects.select_related("auction__user__auth_user")
+        listed = [
+            lots.get(public_id=lot["public_id"])
+            for lot in response.data["results"]
+        ]
+        serializer = LotListSerializer(
+            listed,
+            many=True,
+            context={"request": response.wsgi_request},
+        )
+        self.assertEquals(
+            JSONRenderer().render(response.data["results"]),
+            JSONRenderer().render(serializer.data),
+        )
+        return response.data["results"]
+
+    def test_get_request_lists_lots_as_serialized(self):
+        results = self.assert_listed_as_serialized()
+        self.assertEquals(len(results), 3)
+        self.assertIsNone(results[1]["user"])
+
+    def test_get_request_lists_search_results_as_serialized(self):
+        Lot.objects.update(name="Walnut gramophone")
+        get_search_engine().rebuild()
+        results = self.assert_listed_as_serialized(q="gramophone")
+        self.assertEquals(len(results), 3)
+
+    def test_get_request_lists_lots_ordered_by_price_as_serialized(self):
+        self.assert_listed_as_serialized(ordering="-auction__base_price")
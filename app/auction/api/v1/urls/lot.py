@@ -12,6 +12,10 @@ urlpatterns = [
         '^$', views.LotListAPIView.as_view(),
         name='list_create'
     ),
+    re_path(
+        '^export$', views.LotExportAPIView.as_view(),
+        name='export'
+    ),
     re_path(
         f'^(?P<lot_public_id>{settings.UUID_REGEX_FORMAT})$',
         views.LotRetrieveUpdateDestroyAPIView.as_view(),
@@ -23,6 +27,16 @@ urlpatterns = [
         views.BidListAPIView.as_view(),
         name='bid_history'
     ),
+    re_path(
+        f'^(?P<lot_public_id>{settings.UUID_REGEX_FORMAT})/history/export$',
+        views.BidHistoryExportAPIView.as_view(),
+        name='bid_history_export'
+    ),
+    re_path(
+        f'^(?P<lot_public_id>{settings.UUID_REGEX_FORMAT})/leaderboard$',
+        views.LotLeaderboardAPIView.as_view(),
+        name='leaderboard'
+    ),
     re_path(
         f'^(?P<lot_public_id>{settings.UUID_REGEX_FORMAT})/bid$',
         views.BidCreateAPIView.as_view(),
@@ -3,38 +3,66 @@ from django.shortcuts import get_object_or_404
 
 # Third-party
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_condition import C
 from rest_framework.exceptions import ValidationError
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import SearchFilter
 from rest_framework.generics import (
     CreateAPIView,
+    GenericAPIView,
     ListAPIView,
     RetrieveAPIView,
 )
+from rest_framework.response import Response
 
 # Local
 from auction.api.v1.serializers import (
     BidDetailSerializer,
     BidListCreateSerializer,
+    CompiledBidListSerializer,
 )
+from auction.metrics import bids
 from auction.models import Bid, Lot
-from auction.permissions import IsLotObjectOwner
+from auction.throttling import UserBidThrottle, UserLotBidThrottle
+from common.conditional import ConditionalRetrieveMixin, LastModifiedListMixin
+from common.export import StreamingExportAPIView
+from common.filters import AliasedOrderingFilter
+from common.idempotency import IdempotentCreateMixin
+from common.metrics import RequestDurationMixin
+from common.renderers import JSONFragment
+from common.serializers import CompiledListMixin
+from common.pagination import KeysetPagination
+from common.throttling import TokenBucketThrottlingMixin
 
 
-class BidListAPIView(ListAPIView):
+class BidListAPIView(
+    RequestDurationMixin,
+    CompiledListMixin,
+    LastModifiedListMixin,
+    ListAPIView,
+):
     """
     GET requests to this endpoint will return a list of all existing bids
     for a lot. Results can be ordered and queried by relevant fields, such as
-    price offered, time submitted or user.
+    price offered, time submitted or user. Bids are ordered by price
+    converted into the default currency, whatever currency they were placed in.
 
-    POST requests to this endpoint will submit a bid for this lot, which must
-    provide a higher price than the current highest bid.
+    Bids for this lot are submitted with POST requests to `BidCreateAPIView`.
+    Bids are never modified, so the list can be requested conditionally with
+    `If-Modified-Since`.
     """
     serializer_class = BidListCreateSerializer
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    # Bids listed are read with `.values()`, represented the same way
+    compiled_serializer_class = CompiledBidListSerializer
+    is_append_only = True
+    pagination_class = KeysetPagination
+    filter_backends = [
+        DjangoFilterBackend,
+        AliasedOrderingFilter,
+        SearchFilter,
+    ]
     filterset_fields = ["user__public_id", "created_at"]
-    search_fields = ["user__username"]
+    search_fields = ["user__auth_user__username"]
     ordering_fields = ["user__public_id", "price", "created_at"]
+    ordering_aliases = {"price": "normalized_price"}
 
     def get_queryset(self):
         """
@@ -44,17 +72,93 @@ class BidListAPIView(ListAPIView):
         """
         lot_public_id = self.kwargs["lot_public_id"]
         lot = get_object_or_404(Lot, public_id=lot_public_id)
-        if not lot.is_active:
-            raise ValidationError(
-                "Cannot bid on an item whose auction has expired."
-            )
         self.check_object_permissions(self.request, lot)
-        return Bid.objects.filter(lot=lot)
+        # Join the relations read by `BidListCreateSerializer` for every bid
+        return Bid.objects.filter(
+            auction_id=lot.auction_id
+        ).select_related("user__auth_user")
+
+
+class BidHistoryExportAPIView(RequestDurationMixin, StreamingExportAPIView):
+    """
+    GET requests to this endpoint will stream every bid for a lot, oldest
+    first, as newline delimited JSON (`?format=ndjson`, the default) or CSV
+    (`?format=csv`), so bidding histories are exported in a single request.
+    Bids can be filtered by the same fields as `BidListAPIView`.
+    """
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = BidListAPIView.filterset_fields
+    export_fields = (
+        ("public_id", "public_id"),
+        ("created_at", "created_at"),
+        ("price", "price"),
+        ("price_currency", "price_currency"),
+        ("user", "user__public_id"),
+        ("username", "user__auth_user__username"),
+    )
+    export_filename = "bids"
+
+    def get_queryset(self):
+        lot_public_id = self.kwargs["lot_public_id"]
+        lot = get_object_or_404(Lot, public_id=lot_public_id)
+        self.check_object_permissions(self.request, lot)
+        return Bid.objects.filter(
+            auction_id=lot.auction_id
+        ).order_by("created_at", "id")
+
+
+class LotLeaderboardAPIView(RequestDurationMixin, GenericAPIView):
+    """
+    GET requests to this endpoint will return the highest bids placed for a
+    lot, highest first, up to `LEADERBOARD_SIZE` of them. Bids are ranked by
+    their price converted into the default currency.
+
+    The ranking is kept up to date as bids are placed (see
+    `auction.leaderboard`), so it is read from the lot's auction in a single
+    query and served as it is stored, without sorting or encoding any bid.
+    """
+    queryset = Lot.objects.select_related("auction").only(
+        "public_id", "auction", "auction__top_bids"
+    )
+    lookup_field = "public_id"
+    lookup_url_kwarg = "lot_public_id"
+
+    def get(self, request, *args, **kwargs):
+        lot = self.get_object()
+        return Response({
+            "lot": lot.public_id,
+            "bids": JSONFragment(lot.auction.top_bids),
+        })
 
 
-class BidCreateAPIView(CreateAPIView):
-    permission_classes = ~C(IsLotObjectOwner)
+class BidCreateAPIView(
+    RequestDurationMixin,
+    IdempotentCreateMixin,
+    TokenBucketThrottlingMixin,
+    CreateAPIView,
+):
+    """
+    POST requests to this endpoint will submit a bid for a lot, which must
+    provide a higher price than its current highest bid. Lot owners cannot
+    bid on their own lots. Users bidding too often are throttled, before
+    their bid is validated. Retries sent with the same `Idempotency-Key`
+    header get the response to the first bid, which is placed only once.
+    """
     serializer_class = BidListCreateSerializer
+    throttle_classes = [UserBidThrottle, UserLotBidThrottle]
+
+    def create(self, request, *args, **kwargs):
+        """
+        Count every bid submitted by whether it was accepted, or rejected
+        for any reason it is invalid, such as being too low.
+        """
+        try:
+            response = super().create(request, *args, **kwargs)
+        except ValidationError:
+            bids.inc(outcome="rejected")
+            raise
+        bids.inc(outcome="accepted")
+        return response
 
     def perform_create(self, serializer):
         """
@@ -73,8 +177,18 @@ class BidCreateAPIView(CreateAPIView):
         return super().get_serializer(*args, **kwargs)
 
 
-class BidRetrieveAPIView(RetrieveAPIView):
+class BidRetrieveAPIView(
+    RequestDurationMixin,
+    ConditionalRetrieveMixin,
+    RetrieveAPIView,
+):
     serializer_class = BidDetailSerializer
-    queryset = Bid.objects.all()
+    queryset = Bid.objects.select_related("user__auth_user")
     lookup_field = "public_id"
     lookup_url_kwarg = "bid_public_id"
+    # Bids are never modified, besides their user's username
+    etag_fields = (
+        "created_at",
+        "user__public_id",
+        "user__auth_user__username",
+    )
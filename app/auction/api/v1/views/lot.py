@@ -4,65 +4,193 @@ from django.utils import timezone
 # Third-party
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.exceptions import ValidationError
-from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.generics import (
     ListCreateAPIView,
     RetrieveUpdateDestroyAPIView,
 )
+from rest_framework.response import Response
 
 # Local
+from auction.api.v1.filters import LotFilterSet
 from auction.api.v1.serializers import (
+    CompiledLotListSerializer,
     LotDetailSerializer,
     LotListSerializer,
 )
-from auction.models import Lot
+from auction.cache import get_lot_cache
+from auction.models import Auction, Lot
+from auction.search import FullTextSearchFilter
+from common.conditional import ConditionalRetrieveMixin, LastModifiedListMixin
+from common.export import StreamingExportAPIView
+from common.filters import AliasedOrderingFilter
+from common.idempotency import IdempotentCreateMixin
+from common.metrics import RequestDurationMixin
+from common.renderers import FastJSONRenderer, JSONFragment
+from common.routers import read_from_replicas
+from common.serializers import CompiledListMixin
+from common.pagination import KeysetPagination
 
 
-class LotListAPIView(ListCreateAPIView):
+class LotListAPIView(
+    RequestDurationMixin,
+    IdempotentCreateMixin,
+    CompiledListMixin,
+    LastModifiedListMixin,
+    ListCreateAPIView,
+):
     """
     GET requests to this endpoint will return a list of all existing lots.
-    Results can be queried by fields such as active or inactive lots,
-    which can also be ordered.
+    Results can be queried by fields such as active or inactive lots
+    (`?status=active|ending_soon|closed`) or a range of base prices
+    (`?min_price=&max_price=`), which can also be ordered, or searched by
+    words in their name and description (`?q=`), listing the most relevant
+    first. Prices are compared and ordered converted into the default
+    currency, whatever currency each lot is priced in.
 
     POST requests to this endpoint will create a single lot (auction item) in
     the system, which are by default inactive - not for auction - unless
-    explicitly requested otherwise.
+    explicitly requested otherwise. Retries sent with the same
+    `Idempotency-Key` header get the response to the first request, which
+    creates the lot only once.
     """
-    queryset = Lot.objects.all()
+    # Join the relations read by `LotListSerializer` for every lot
+    queryset = Lot.objects.select_related("auction__user__auth_user")
     # TODO: permission_classes = (IsAuthenticatedOrReadOnly, )
     serializer_class = LotListSerializer
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
-    filterset_fields = (
-        'user__public_id',
-        'name',
-        'expires_at',
-        'base_price_currency'
-    )
-    search_fields = ('name', 'description', 'base_price')
+    # Lots listed are read with `.values()`, represented the same way
+    compiled_serializer_class = CompiledLotListSerializer
+    pagination_class = KeysetPagination
+    filter_backends = [
+        DjangoFilterBackend,
+        FullTextSearchFilter,
+        AliasedOrderingFilter,
+    ]
+    filterset_class = LotFilterSet
     ordering_fields = (
         'name',
         'created_at',
         'modified_at',
-        'base_price',
-        'expires_at'
+        'auction__base_price',
+        'auction__expires_at'
     )
+    # Prices in any currency are sorted converted into the default currency
+    ordering_aliases = {
+        'auction__base_price': 'auction__normalized_base_price',
+    }
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user.user_profile)
 
 
-class LotRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+class LotExportAPIView(RequestDurationMixin, StreamingExportAPIView):
+    """
+    GET requests to this endpoint will stream the catalogue of all existing
+    lots, oldest first, as newline delimited JSON (`?format=ndjson`, the
+    default) or CSV (`?format=csv`). Lots can be filtered by the same fields
+    as `LotListAPIView`, such as their status.
+    """
+    queryset = Lot.objects.order_by("created_at", "id")
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = LotFilterSet
+    export_fields = (
+        ("public_id", "public_id"),
+        ("created_at", "created_at"),
+        ("name", "name"),
+        ("condition", "condition"),
+        ("user", "auction__user__public_id"),
+        ("base_price", "auction__base_price"),
+        ("base_price_currency", "auction__base_price_currency"),
+        ("expires_at", "auction__expires_at"),
+        ("status", "auction__status"),
+        ("highest_bid_price", "auction__highest_bid_price"),
+        ("bid_count", "auction__bid_count"),
+    )
+    export_filename = "lots"
+
+
+class LotRetrieveUpdateDestroyAPIView(
+    RequestDurationMixin,
+    ConditionalRetrieveMixin,
+    RetrieveUpdateDestroyAPIView,
+):
     """
     GET requests to this endpoint will retrieve a lot, if the URL matches the
-    public_id of an existing one in the system.
+    public_id of an existing one in the system. Representations are cached
+    until a bid is placed for the lot, or it is modified, and can be
+    requested conditionally with their ETag.
 
     DELETE requests to this endpoint will attempt to delete the lot from the
     system.
     """
-    queryset = Lot.objects.all()
+    # Join everything the detail representation reads, including the
+    # auction's denormalised highest bid, so a lot is fetched in one query.
+    queryset = Lot.objects.select_related(
+        "auction__user__auth_user",
+        "auction__winning_bid",
+    )
     lookup_field = "public_id"
     lookup_url_kwarg = "lot_public_id"
     serializer_class = LotDetailSerializer
+    # Columns the detail representation depends on; bids change the count.
+    etag_fields = (
+        "modified_at",
+        "auction__modified_at",
+        "auction__expires_at",
+        "auction__status",
+        "auction__bid_count",
+        "auction__winning_bid_id",
+        "auction__user__auth_user__username",
+    )
+
+    def get_etag_values(self):
+        values = super().get_etag_values()
+        if values is None:
+            return None
+        expires_at, auction_status = values[2], values[3]
+        # Inactive lots are not represented, so they are never Not Modified
+        if auction_status != Auction.OPEN or expires_at <= timezone.now():
+            return None
+        return values
+
+    def retrieve(self, request, *args, **kwargs):
+        lot_cache = get_lot_cache()
+        public_id = kwargs[self.lookup_url_kwarg]
+        base_url = request.build_absolute_uri("/")
+        media_type = request.accepted_media_type
+        entry = lot_cache.get(public_id, base_url, media_type)
+        if entry is not None:
+            self.etag = entry["etag"]
+            return Response(
+                JSONFragment(entry["body"]), headers={"X-Cache": "HIT"}
+            )
+
+        # Representations are cached from the primary: one read from a
+        # lagging replica would be cached at the current version, and served
+        # stale until the lot changes again.
+        with read_from_replicas(False):
+            instance = self.get_object()
+            # Read the version before the lot is serialised, so any change
+            # made meanwhile makes this representation stale.
+            version = lot_cache.get_version(instance.auction_id)
+            data = self.get_serializer(instance).data
+        # Lots become inactive as soon as their auction expires.
+        expires_in = instance.auction.expires_at - timezone.now()
+        lot_cache.set(
+            public_id,
+            base_url,
+            media_type,
+            instance.auction_id,
+            version,
+            # Cached encoded as negotiated, so it is never encoded again
+            {
+                "body": FastJSONRenderer().render(
+                    data, media_type, self.get_renderer_context()
+                ),
+                "etag": self.etag,
+            },
+            timeout=expires_in.total_seconds(),
+        )
+        return Response(data, headers={"X-Cache": "MISS"})
 
     def perform_update(self, serializer):
         """
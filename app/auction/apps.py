@@ -5,3 +5,7 @@ from django.apps import AppConfig
 class AuctionConfig(AppConfig):
     name = 'auction'
     label = 'auction'
+
+    def ready(self):
+        # Load Django signals connection.
+        from . import signals
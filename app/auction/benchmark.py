@@ -0,0 +1,371 @@
+# Python standard
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from typing import Callable, List
+
+# Django
+from django.db import connection, transaction
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import timezone
+
+# Third-party
+from oauth2_provider.models import AccessToken
+
+# Local
+from account.models import UserProfile
+from account.tests.factories import UserProfileFactory
+from auction.api.v1.tests.factories import (
+    AuctionFactory,
+    BidFactory,
+    LotFactory,
+)
+from auction.bidding import BidRejected
+from auction.currency import get_exchange_rates
+from auction.leaderboard import get_leaderboard
+from auction.models import Auction, Bid, Lot
+from auction.search import get_search_engine
+from common.benchmark import Scenario
+from common.throttling import SharedTokenBuckets
+
+
+def get_next_id(model) -> int:
+    last_id = model.raw_objects.aggregate(last_id=Max("id"))["last_id"]
+    return (last_id or 0) + 1
+
+
+def seed_data(
+    lots: int,
+    bids_per_lot: int,
+    users: int = 100,
+    active_ratio: float = 0.8,
+    chunk_size: int = 1000,
+    log: Callable[[str], None] = None,
+):
+    """
+    Seed auctions for `lots` lots, with `bids_per_lot` bids each, placed by
+    a pool of `users` users.
+
+    Rows are built with the test factories but inserted with `bulk_create`,
+    one transaction per chunk of lots. Their primary keys are assigned up
+    front, so auctions can be inserted with the bidding state they would
+    have recorded (highest price, winning bid, count and highest bids)
+    without signals, and prices converted into the default currency as they
+    would be saved.
+    """
+    profiles = list(
+        UserProfile.objects.select_related("auth_user")[:users]
+    )
+    if len(profiles) < users:
+        profiles += UserProfileFactory.create_batch(users - len(profiles))
+    now = timezone.now()
+    search_engine = get_search_engine()
+    normalize = get_exchange_rates().normalize
+    leaderboard = get_leaderboard()
+
+    for start in range(0, lots, chunk_size):
+        size = min(chunk_size, lots - start)
+        auction_id = get_next_id(Auction)
+        lot_id = get_next_id(Lot)
+        bid_id = get_next_id(Bid)
+        auctions, lot_rows, bids = [], [], []
+        for offset in range(size):
+            created_at = now - timedelta(
+                days=365 * (lots - start - offset) / lots
+            )
+            if random.random() < active_ratio:
+                expires_at = now + timedelta(hours=random.randint(1, 240))
+            else:
+                expires_at = created_at + timedelta(days=7)
+            owner = random.choice(profiles)
+            auction = AuctionFactory.build(
+                id=auction_id + offset,
+                user=owner,
+                created_at=created_at,
+                expires_at=expires_at,
+                bid_count=bids_per_lot,
+            )
+            auction.normalized_base_price = normalize(auction.base_price)
+            lot_rows.append(LotFactory.build(
+                id=lot_id + offset,
+                auction=auction,
+                created_at=created_at,
+            ))
+
+            price = auction.base_price.amount
+            for number in range(bids_per_lot):
+                price += Decimal("1.00")
+                bidder = random.choice(profiles)
+                if bidder == owner:
+                    bidder = profiles[profiles.index(owner) - 1]
+                bids.append(BidFactory.build(
+                    id=bid_id,
+                    auction=auction,
+                    user=bidder,
+                    price=price,
+                    normalized_price=normalize(
+                        price, auction.base_price.currency.code
+                    ),
+                    created_at=created_at + timedelta(seconds=number + 1),
+                ))
+                bid_id += 1
+            if bids_per_lot:
+                auction.highest_bid_price = price
+                auction.normalized_highest_bid_price = (
+                    bids[-1].normalized_price
+                )
+                auction.winning_bid_id = bid_id - 1
+                # Every bid is higher than the last, so the last are highest
+                top_bids = bids[-min(bids_per_lot, leaderboard.size):]
+                auction.top_bids = leaderboard.encode([
+                    leaderboard.get_entry(
+                        bid, bid.user.public_id, bid.user.auth_user.username
+                    )
+                    for bid in reversed(top_bids)
+                ])
+            auctions.append(auction)
+
+        # Foreign keys are only checked on commit, so the winning bids can
+        # be inserted after the auctions referencing them.
+        with transaction.atomic():
+            Auction.objects.bulk_create(auctions)
+            Lot.objects.bulk_create(lot_rows)
+            Bid.objects.bulk_create(bids)
+            # Lots are only indexed for search as they are saved one by one
+            search_engine.index(lot_rows)
+        if log:
+            log(f"Seeded {start + size} of {lots} lots.")
+
+
+def get_access_token(user: UserProfile) -> str:
+    access_token = AccessToken.objects.create(
+        user=user.auth_user,
+        scope="read write",
+        expires=timezone.now() + timedelta(days=1),
+        token=f"benchmark-{random.getrandbits(128):032x}",
+    )
+    return access_token.token
+
+
+def benchmark_concurrent_bids(
+    place: Callable,
+    bidders: int,
+    bids_per_bidder: int,
+    auctions: int = 10,
+) -> dict:
+    """
+    Place bids for a few active auctions from `bidders` threads at once, each
+    on its own database connection, with `place(auction, user, price)`.
+
+    Reports how many bids were decided (accepted or rejected) per second,
+    and any bid which failed instead, such as with "database is locked".
+    """
+    active = list(
+        Auction.objects.filter(
+            status=Auction.OPEN,
+            expires_at__gt=timezone.now() + timedelta(hours=1),
+        ).order_by("id")[:auctions]
+    )
+    profiles = list(UserProfile.objects.all()[:bidders])
+    if not active or len(profiles) < 2:
+        raise ValueError("Seed active auctions and users before bidding.")
+    counts = {"accepted": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+    start = threading.Barrier(bidders + 1)
+
+    def bid(user: UserProfile):
+        start.wait()
+        try:
+            for _ in range(bids_per_bidder):
+                auction = random.choice(active)
+                price = (
+                    auction.base_price.amount
+                    + Decimal(random.randint(1, 1000000)) / 100
+                )
+                try:
+                    place(auction, user, price)
+                    outcome = "accepted"
+                except BidRejected:
+                    outcome = "rejected"
+                except Exception:
+                    outcome = "errors"
+                with lock:
+                    counts[outcome] += 1
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=bid, args=(profiles[number % len(profiles)],))
+        for number in range(bidders)
+    ]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+    decided = counts["accepted"] + counts["rejected"]
+    return dict(
+        counts,
+        elapsed_s=round(elapsed, 3),
+        bids_per_second=round(decided / elapsed, 1),
+    )
+
+
+def benchmark_bid_throttles(
+    iterations: int,
+    users: int = 1000,
+    lots: int = 10000,
+    slots: int = 65536,
+) -> dict:
+    """
+    Time the checks throttling every bid request, one per bucket of the bid
+    throttles, on buckets mapped from a file as the web server's are, for
+    bids of random users on random lots.
+
+    Buckets are refilled quicker than they are used, so the time measured
+    is the limiter's overhead per request, whatever its outcome.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        buckets = SharedTokenBuckets(
+            slots, os.path.join(directory, "token-buckets")
+        )
+        requests = [
+            (random.randrange(users), random.randrange(lots))
+            for _ in range(iterations)
+        ]
+        started_at = time.perf_counter()
+        for user, lot in requests:
+            buckets.acquire_all([
+                (f"bid_user:{user}", 1e9, 1e9),
+                (f"bid_user_lot:{user}:{lot}", 1e9, 1e9),
+            ])
+        elapsed = time.perf_counter() - started_at
+    return {
+        "us_per_request": round(elapsed / iterations * 1e6, 2),
+        "requests_per_second": round(iterations / elapsed),
+    }
+
+
+def get_scenarios(authorization: str, user: UserProfile) -> List[Scenario]:
+    """
+    Get a scenario for every endpoint of the auction and account APIs, run as
+    the given user.
+
+    Reads are spread over random active lots and bids seeded. Bids and
+    updates are made for active lots owned by other users, while lots are
+    deleted after being created by the benchmark itself.
+    """
+    headers = {"HTTP_AUTHORIZATION": authorization}
+    json_headers = dict(headers, content_type="application/json")
+    lot_ids = list(
+        Lot.objects.filter(
+            auction__expires_at__gt=timezone.now() + timedelta(hours=1),
+        ).exclude(
+            auction__user=user
+        ).values_list("public_id", flat=True)[:1000]
+    )
+    bid_ids = list(
+        Bid.objects.filter(
+            auction__lot__public_id__in=lot_ids[:100]
+        ).values_list("public_id", flat=True)[:1000]
+    )
+    profile_ids = list(
+        UserProfile.objects.values_list("public_id", flat=True)[:1000]
+    )
+    if not lot_ids or not bid_ids:
+        raise ValueError("Seed active lots with bids before benchmarking.")
+    lot_list_url = reverse("api:auction:v1:lots:list_create")
+
+    def get_lot_url(name: str, public_id) -> str:
+        return reverse(
+            f"api:auction:v1:lots:{name}",
+            kwargs={"lot_public_id": public_id},
+        )
+
+    def get(path: str, query_string: str = ""):
+        return lambda iteration: (
+            "get", path, dict(headers, QUERY_STRING=query_string)
+        )
+
+    def get_random_lot(name: str):
+        return lambda iteration: (
+            "get", get_lot_url(name, random.choice(lot_ids)), headers
+        )
+
+    def get_random_bid(iteration: int):
+        path = reverse(
+            "api:auction:v1:bids:retrieve",
+            kwargs={"bid_public_id": random.choice(bid_ids)},
+        )
+        return "get", path, headers
+
+    def get_random_user(iteration: int):
+        path = reverse(
+            "api:account:v1:user_detail",
+            kwargs={"public_id": random.choice(profile_ids)},
+        )
+        return "get", path, headers
+
+    def create_lot(iteration: int):
+        data = {
+            "name": f"Benchmark lot {iteration}",
+            "condition": Lot.USED,
+            "base_price": "10.00",
+            "expires_at": (timezone.now() + timedelta(days=1)).isoformat(),
+        }
+        return "post", lot_list_url, dict(json_headers, data=data)
+
+    def update_lot(iteration: int):
+        path = get_lot_url("retrieve_update_destroy", random.choice(lot_ids))
+        data = {"name": f"Benchmark update {iteration}"}
+        return "patch", path, dict(json_headers, data=data)
+
+    def delete_lot(iteration: int):
+        lot = Lot.objects.filter(name__startswith="Benchmark lot").last()
+        return "delete", get_lot_url(
+            "retrieve_update_destroy", lot.public_id
+        ), headers
+
+    def create_bid(iteration: int):
+        public_id = random.choice(lot_ids)
+        auction = Auction.objects.get(lot__public_id=public_id)
+        price = (auction.highest_bid_price or auction.base_price).amount + 1
+        path = get_lot_url("bid_create", public_id)
+        return "post", path, dict(json_headers, data={"price": str(price)})
+
+    return [
+        Scenario("lot_list", get(lot_list_url)),
+        Scenario("lot_list_active", get(lot_list_url, "status=active")),
+        Scenario(
+            "lot_list_by_price",
+            get(lot_list_url, "ordering=-auction__base_price"),
+        ),
+        Scenario("lot_search", get(lot_list_url, "q=lot")),
+        Scenario("lot_detail", get_random_lot("retrieve_update_destroy")),
+        Scenario("bid_history", get_random_lot("bid_history")),
+        Scenario("lot_leaderboard", get_random_lot("leaderboard")),
+        Scenario(
+            "bid_history_export", get_random_lot("bid_history_export")
+        ),
+        Scenario(
+            "lot_export",
+            get(reverse("api:auction:v1:lots:export"), "status=active"),
+        ),
+        Scenario("bid_detail", get_random_bid),
+        Scenario("user_list", get(reverse("api:account:v1:user_list"))),
+        Scenario("user_detail", get_random_user),
+        # Shares its URL name with the user list, so it is not reversed
+        Scenario("user_me", get("/api/account/v1/users/me/")),
+        Scenario("user_my_bids", get(reverse("api:account:v1:my_bid_list"))),
+        Scenario("lot_create", create_lot),
+        Scenario("lot_update", update_lot),
+        Scenario("bid_create", create_bid),
+        Scenario("lot_delete", delete_lot),
+    ]
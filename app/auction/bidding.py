@@ -0,0 +1,306 @@
+# Python standard
+import logging
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import Future, TimeoutError
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Union
+
+# Django
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+# Third-party
+from djmoney.money import Money
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# Local
+from account.models import UserProfile
+from auction.currency import ExchangeRateMissing, get_exchange_rates
+from auction.models import Auction, Bid
+
+
+logger = logging.getLogger(__name__)
+
+
+class BidRejected(Exception):
+    """
+    Raised when a bid cannot be placed for an auction.
+    """
+
+
+class BidOutcomeUnknown(APIException):
+    """
+    Raised when the bid writer did not commit a bid in time: it is still
+    pending, so it may yet be placed or rejected.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = (
+        "The bid could not be confirmed in time and may still be placed; "
+        "check the bids of the lot before bidding again."
+    )
+    default_code = "bid_outcome_unknown"
+    # Seconds clients are told to wait before retrying (`Retry-After`)
+    wait = 5
+
+    def __init__(self, pending: Future = None):
+        super().__init__()
+        # The eventual result of the bid, once committed or rejected
+        self.pending = pending
+
+
+def place_bid(
+    auction: Auction,
+    user: UserProfile,
+    price: Union[Money, Decimal],
+) -> Bid:
+    """
+    Place a bid for an auction, which must offer a higher price than its
+    current highest bid (or at least its base price, for the first bid).
+
+    Bids for the same auction are serialised by a compare-and-swap on the
+    auction row: a conditional UPDATE checks the offered price against the
+    denormalised `highest_bid_price` and takes the row's write lock, which is
+    held until the bid is committed. A concurrent bidder either waits for
+    the lock and re-checks against the new price, or is rejected; no two bids
+    can win at the same price. Unlike `select_for_update`, this also
+    serialises bids on SQLite, which ignores `FOR UPDATE`.
+
+    Prices are compared converted into the default currency, so bids can
+    be placed in any currency with an exchange rate.
+    """
+    if not isinstance(price, Money):
+        price = Money(price, auction.base_price.currency)
+    if auction.user_id is not None and auction.user_id == user.pk:
+        raise BidRejected("Cannot bid on your own lot.")
+    user = _load_bidder(user)
+    try:
+        normalized_price = get_exchange_rates().normalize(price)
+    except ExchangeRateMissing as error:
+        raise BidRejected(str(error))
+
+    with transaction.atomic():
+        claimed = Auction.objects.filter(
+            Q(
+                normalized_highest_bid_price__isnull=True,
+                normalized_base_price__lte=normalized_price,
+            )
+            | Q(normalized_highest_bid_price__lt=normalized_price),
+            pk=auction.pk,
+            status=Auction.OPEN,
+            expires_at__gt=timezone.now(),
+        ).update(bid_count=F("bid_count"))
+        if claimed:
+            return Bid.objects.create(auction=auction, user=user, price=price)
+
+    raise BidRejected(_get_rejection_reason(auction.pk, price))
+
+
+def _load_bidder(user: UserProfile) -> UserProfile:
+    """
+    Get a profile with its auth user loaded, so the username recorded in
+    the leaderboard as a bid is saved is never queried with the auction row
+    locked. Profiles of authenticated requests already have it.
+    """
+    if UserProfile.auth_user.is_cached(user):
+        return user
+    return UserProfile.objects.select_related("auth_user").get(pk=user.pk)
+
+
+def _get_rejection_reason(auction_id: int, price: Money) -> str:
+    auction = Auction.objects.get(pk=auction_id)
+    if not auction.is_active:
+        return "Cannot bid on an item whose auction has expired."
+    # Prices only stay unconverted while their currency has no rate
+    if auction.normalized_base_price is None:
+        return (
+            f"Cannot bid on this lot until an exchange rate is known for "
+            f"{auction.base_price.currency.code}."
+        )
+    if auction.highest_bid_price is None:
+        return (
+            f"Bid of {price.amount} must be at least the base price of "
+            f"{auction.base_price.amount}."
+        )
+    if auction.normalized_highest_bid_price is None:
+        return (
+            f"Cannot bid on this lot until an exchange rate is known for "
+            f"{auction.highest_bid_price.currency.code}."
+        )
+    return (
+        f"Bid of {price.amount} must be higher than the current highest bid "
+        f"of {auction.highest_bid_price.amount}."
+    )
+
+
+# A bid waiting to be placed by the `BidWriter`, and its eventual result
+PendingBid = namedtuple("PendingBid", ["auction", "user", "price", "result"])
+
+
+class BidWriter:
+    """
+    Place bids from a single thread, committing every bid pending at once
+    in the same transaction (group commit).
+
+    SQLite only lets one connection write at a time, so concurrent requests
+    placing bids each wait for the lock, and pay for a commit of their own.
+    Instead, requests hand bids over to this writer and wait for their
+    result: while a transaction is committed, the next bids queue up, and
+    up to `max_batch_size` of them are placed in the following one. Every
+    bid is placed in a savepoint of its own by `place_bid`, so a rejected
+    bid never affects the others, and results are only returned once the
+    transaction is committed.
+
+    Usage:
+
+        >>> writer = BidWriter()
+        >>> bid = writer.submit(auction, user, Decimal("10.00"))
+
+    """
+
+    def __init__(self, max_batch_size: int = 200):
+        self.max_batch_size = max_batch_size
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(
+        self,
+        auction: Auction,
+        user: UserProfile,
+        price: Union[Money, Decimal],
+        timeout: float = None,
+    ) -> Bid:
+        """
+        Place a bid through the writer, waiting until it is committed.
+
+        Raises `BidRejected`, as `place_bid` does, if the bid is rejected.
+        """
+        return self.enqueue(auction, user, price).result(timeout)
+
+    def enqueue(
+        self,
+        auction: Auction,
+        user: UserProfile,
+        price: Union[Money, Decimal],
+    ) -> Future:
+        """
+        Hand a bid over to the writer, getting the future of its result.
+        """
+        self.start()
+        # Loaded by the request, rather than within the writer's transaction
+        user = _load_bidder(user)
+        pending = PendingBid(auction, user, price, Future())
+        self.queue.put(pending)
+        return pending.result
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="bid-writer", daemon=True
+                )
+                self.thread.start()
+
+    def stop(self):
+        """
+        Stop the writer once the bids already submitted are placed.
+        """
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join()
+
+    def run(self):
+        try:
+            while True:
+                batch = self.get_batch()
+                stop = None in batch
+                batch = [pending for pending in batch if pending is not None]
+                if batch:
+                    self.write(batch)
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def get_batch(self) -> list:
+        """
+        Wait for a bid to be submitted, and take any other already pending.
+        """
+        batch = [self.queue.get()]
+        while batch[-1] is not None and len(batch) < self.max_batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def write(self, batch: List[PendingBid]):
+        results = []
+        try:
+            with transaction.atomic():
+                for pending in batch:
+                    try:
+                        bid = place_bid(
+                            pending.auction, pending.user, pending.price
+                        )
+                    except Exception as error:
+                        results.append((pending, None, error))
+                    else:
+                        results.append((pending, bid, None))
+        except Exception as error:
+            # Nothing was committed, so every bid fails the same way.
+            logger.exception("Could not commit %d bids.", len(batch))
+            connection.close()
+            for pending in batch:
+                pending.result.set_exception(error)
+            return
+
+        for pending, bid, error in results:
+            if error is not None:
+                pending.result.set_exception(error)
+            else:
+                pending.result.set_result(bid)
+
+
+@lru_cache(maxsize=None)
+def get_bid_writer() -> BidWriter:
+    """
+    Get the bid writer of this process, configured by the
+    `BID_GROUP_COMMIT_*` settings.
+    """
+    return BidWriter(max_batch_size=settings.BID_GROUP_COMMIT_MAX_BATCH_SIZE)
+
+
+def submit_bid(
+    auction: Auction,
+    user: UserProfile,
+    price: Union[Money, Decimal],
+) -> Bid:
+    """
+    Place a bid through the bid writer of this process, if bids are group
+    committed (see the `BID_GROUP_COMMIT` setting), or else straight away.
+
+    Raises `BidOutcomeUnknown`, with the pending result of the bid, if the
+    writer does not commit the bid within `BID_GROUP_COMMIT_TIMEOUT`
+    seconds.
+    """
+    if not settings.BID_GROUP_COMMIT:
+        return place_bid(auction, user, price)
+    pending = get_bid_writer().enqueue(auction, user, price)
+    try:
+        return pending.result(timeout=settings.BID_GROUP_COMMIT_TIMEOUT)
+    except TimeoutError:
+        logger.warning(
+            "Bid for auction %s not committed within %s seconds",
+            auction.pk, settings.BID_GROUP_COMMIT_TIMEOUT,
+        )
+        raise BidOutcomeUnknown(pending)
@@ -0,0 +1,152 @@
+# Python standard
+import hashlib
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+# Django
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Local
+from auction.metrics import lot_cache_lookups
+
+
+class LotDetailCache:
+    """
+    Cache the detail representation of lots, so reads of popular lots skip
+    querying and serialising them again between bids.
+
+    Entries are keyed by the lot's `public_id`, the base URL and the media
+    type it is represented with, and store the version of its auction they
+    were built at. The version is bumped every time a bid is
+    placed for the auction, or the lot or auction change, which makes every
+    entry built earlier stale without having to find and delete it.
+
+    Entries are stored in the `LOT_CACHE_ALIAS` cache of `CACHES`: a
+    local-memory LRU cache by default, which any Django cache backend (e.g.
+    Redis, to share entries and versions between workers) can replace.
+
+    Usage:
+
+        >>> lot_cache = get_lot_cache()
+        >>> data = lot_cache.get(public_id, base_url, media_type)
+        >>> if data is None:
+        >>>     version = lot_cache.get_version(auction_id)
+        >>>     data = build_representation()
+        >>>     lot_cache.set(
+        >>>         public_id, base_url, media_type, auction_id, version, data
+        >>>     )
+
+    """
+
+    def __init__(self, alias: str, timeout: int):
+        self.cache = caches[alias]
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_key(public_id, base_url: str, media_type: str) -> str:
+        # Representations link to other resources with absolute URLs, which
+        # differ for every host the API is requested through, and are
+        # rendered as negotiated (e.g. indented, or in the browsable API).
+        variant = hashlib.md5(
+            f"{base_url} {media_type}".encode("utf-8")
+        ).hexdigest()
+        return f"lot:{public_id}:{variant}"
+
+    @staticmethod
+    def get_version_key(auction_id: int) -> str:
+        return f"auction:{auction_id}:version"
+
+    def get_version(self, auction_id: int) -> int:
+        """
+        Get the current version of an auction, which must be read before
+        building a representation to cache at that version.
+        """
+        key = self.get_version_key(auction_id)
+        version = self.cache.get(key)
+        if version is None:
+            # Start from the current time rather than zero, so an evicted
+            # version never repeats one of the entries still cached.
+            self.cache.add(key, time.time_ns(), timeout=None)
+            version = self.cache.get(key)
+        return version
+
+    def bump_version(self, auction_id: int):
+        key = self.get_version_key(auction_id)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, time.time_ns(), timeout=None)
+
+    def invalidate(self, auction_id: int):
+        """
+        Invalidate the representation of an auction's lot once the current
+        transaction is committed.
+
+        The version is bumped straight away too, for the representations
+        cached until then; the bump after committing discards any built by
+        concurrent reads in between, from the previous state of the lot.
+        """
+        self.bump_version(auction_id)
+        transaction.on_commit(lambda: self.bump_version(auction_id))
+
+    def get(
+        self, public_id, base_url: str, media_type: str
+    ) -> Optional[dict]:
+        entry = self.cache.get(self.get_key(public_id, base_url, media_type))
+        if entry is not None:
+            auction_id, version, data = entry
+            if self.cache.get(self.get_version_key(auction_id)) == version:
+                self.record(hit=True)
+                return data
+        self.record(hit=False)
+        return None
+
+    def set(
+        self,
+        public_id,
+        base_url: str,
+        media_type: str,
+        auction_id: int,
+        version: int,
+        data: dict,
+        timeout: Optional[float] = None,
+    ):
+        if timeout is None or timeout > self.timeout:
+            timeout = self.timeout
+        if timeout <= 0:
+            return
+        self.cache.set(
+            self.get_key(public_id, base_url, media_type),
+            (auction_id, version, data),
+            timeout=timeout,
+        )
+
+    def record(self, hit: bool):
+        lot_cache_lookups.inc(result="hit" if hit else "miss")
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_stats(self) -> dict:
+        """
+        Get how many lookups were served from the cache by this process.
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+@lru_cache(maxsize=None)
+def get_lot_cache() -> LotDetailCache:
+    """
+    Get the lot cache configured by the `LOT_CACHE_*` settings.
+    """
+    return LotDetailCache(settings.LOT_CACHE_ALIAS, settings.LOT_CACHE_TIMEOUT)
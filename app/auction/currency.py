@@ -0,0 +1,202 @@
+# Python standard
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, Optional, Union
+
+# Django
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+from django.db.models import OuterRef, Subquery
+
+# Third-party
+from djmoney.money import Money
+
+# Local
+from auction.leaderboard import get_leaderboard
+from auction.models import Auction, Bid, ExchangeRate
+
+
+class ExchangeRateMissing(Exception):
+    """
+    Raised when an amount is in a currency without an exchange rate.
+    """
+
+
+class ExchangeRates:
+    """
+    Convert amounts into `currency` (`DEFAULT_CURRENCY`) at the rates of the
+    `ExchangeRate` table, so prices in any currency can be compared.
+
+    Rates are cached in the cache `alias` for `timeout` seconds, so converting
+    an amount never queries the database. Rates updated by another process
+    are read once its entry expires, unless the cache is shared (e.g. Redis).
+
+    Usage:
+
+        >>> exchange_rates = get_exchange_rates()
+        >>> exchange_rates.normalize(Money("10.00", "EUR"))
+        Decimal('8.7000')
+
+    """
+    cache_key = "exchange_rates"
+    places = Decimal("0.0001")
+
+    def __init__(self, alias: str, timeout: int, currency: str):
+        self.cache = caches[alias]
+        self.timeout = timeout
+        self.currency = currency
+
+    def get_rates(self) -> Dict[str, Decimal]:
+        rates = self.cache.get(self.cache_key)
+        if rates is None:
+            rates = dict(
+                ExchangeRate.objects.values_list("currency", "rate")
+            )
+            self.cache.set(self.cache_key, rates, self.timeout)
+        return rates
+
+    def get_rate(self, currency: str) -> Decimal:
+        if currency == self.currency:
+            return Decimal(1)
+        try:
+            return self.get_rates()[currency]
+        except KeyError:
+            raise ExchangeRateMissing(
+                f"No exchange rate is known for {currency}."
+            )
+
+    def has_rate(self, currency: str) -> bool:
+        return currency == self.currency or currency in self.get_rates()
+
+    def normalize(
+        self,
+        amount: Union[Money, Decimal],
+        currency: Optional[str] = None,
+    ) -> Decimal:
+        """
+        Convert an amount, of `currency` unless given as money, into the
+        default currency.
+        """
+        if isinstance(amount, Money):
+            amount, currency = amount.amount, amount.currency.code
+        return convert(amount, self.get_rate(currency))
+
+    def invalidate(self):
+        self.cache.delete(self.cache_key)
+
+
+@lru_cache(maxsize=None)
+def get_exchange_rates() -> ExchangeRates:
+    """
+    Get the exchange rates configured by the `EXCHANGE_RATES_*` settings.
+    """
+    return ExchangeRates(
+        settings.EXCHANGE_RATES_CACHE_ALIAS,
+        settings.EXCHANGE_RATES_CACHE_TIMEOUT,
+        settings.DEFAULT_CURRENCY,
+    )
+
+
+def convert(amount: Union[Decimal, str], rate: Decimal) -> Decimal:
+    """
+    Convert an amount at `rate`, rounded to the places of normalized prices.
+    """
+    return (Decimal(amount) * rate).quantize(ExchangeRates.places)
+
+
+def convert_prices(
+    queryset: models.QuerySet,
+    field: str,
+    rate: Decimal,
+    batch_size: int = 1000,
+):
+    """
+    Store the amounts of `field` converted at `rate` in the `normalized_`
+    field of every row of a queryset.
+
+    Amounts are converted in Python, as by `ExchangeRates.normalize`, rather
+    than by the database: SQLite multiplies and rounds decimals as floats,
+    which can leave them a unit of the last place apart.
+    """
+    model = queryset.model
+    normalized_field = f"normalized_{field}"
+    rows = queryset.filter(**{f"{field}__isnull": False}).order_by("pk")
+    batch = []
+    for pk, amount in rows.values_list("pk", field).iterator(batch_size):
+        batch.append(model(pk=pk, **{normalized_field: convert(amount, rate)}))
+        if len(batch) == batch_size:
+            model.objects.bulk_update(batch, [normalized_field])
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, [normalized_field])
+
+
+def update_exchange_rates(rates: Dict[str, Decimal]):
+    """
+    Store the exchange rates of some currencies, and convert every price in
+    those currencies again at their new rate.
+    """
+    with transaction.atomic():
+        for currency, rate in rates.items():
+            ExchangeRate.objects.update_or_create(
+                currency=currency, defaults={"rate": rate}
+            )
+        recompute_normalized_prices(rates)
+        transaction.on_commit(get_exchange_rates().invalidate)
+
+
+def recompute_normalized_prices(rates: Dict[str, Decimal]):
+    """
+    Convert the prices of auctions and bids in the currencies of `rates`,
+    updated in batches (see `convert_prices`).
+
+    A rate changing can change which bid offers the highest price, if an
+    auction has bids in several currencies, so the highest bids of open
+    auctions with any bid in those currencies are then found and ranked
+    again. Closed auctions keep the bid that won them.
+    """
+    currencies = list(rates)
+    for currency, rate in rates.items():
+        convert_prices(
+            Auction.objects.filter(base_price_currency=currency),
+            "base_price",
+            rate,
+        )
+        convert_prices(
+            Auction.objects.filter(highest_bid_price_currency=currency),
+            "highest_bid_price",
+            rate,
+        )
+        convert_prices(
+            Bid.objects.filter(price_currency=currency), "price", rate
+        )
+    auctions = Auction.objects.filter(
+        status=Auction.OPEN,
+        pk__in=Bid.objects.filter(
+            price_currency__in=currencies
+        ).values("auction_id"),
+    )
+    update_highest_bids(auctions)
+    get_leaderboard().rebuild(auctions)
+
+
+def update_highest_bids(auctions: models.QuerySet):
+    """
+    Record the bid offering the highest price, converted into the default
+    currency, as the highest bid of every auction in a queryset. Ties are
+    won by the earliest bid, as they are when bids are placed.
+    """
+    highest_bids = Bid.objects.filter(
+        auction=OuterRef("pk"), normalized_price__isnull=False
+    ).order_by("-normalized_price", "created_at", "id")
+    auctions.update(
+        winning_bid=Subquery(highest_bids.values("pk")[:1]),
+        highest_bid_price=Subquery(highest_bids.values("price")[:1]),
+        highest_bid_price_currency=Subquery(
+            highest_bids.values("price_currency")[:1]
+        ),
+        normalized_highest_bid_price=Subquery(
+            highest_bids.values("normalized_price")[:1]
+        ),
+    )
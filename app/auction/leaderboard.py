@@ -0,0 +1,121 @@
+# Python standard
+import json
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Optional
+from uuid import UUID
+
+# Django
+from django.conf import settings
+from django.db import models
+
+# Local
+from auction.models import Auction, Bid
+from common.renderers import encode_datetime
+
+
+class Leaderboard:
+    """
+    Keep the `size` highest bids of every auction, highest first, in the
+    `top_bids` column of the auction, so they are served as they are stored
+    instead of sorting the bids of an auction on every read.
+
+    Bids are recorded inside the transaction placing them, once the row of
+    their auction is locked by the update of its bid count, so concurrent
+    bids never overwrite each other's entry. Recording a bid only reads and
+    writes the `size` entries stored, whatever the number of bids placed.
+
+    Entries hold what is needed to represent the bid, including the username
+    of its user as it was when the bid was placed, which is given rather
+    than loaded while the auction row is locked. Bids are ranked by their
+    price converted into the default currency; ties are ranked by which was
+    placed first, as they are for winning an auction.
+
+    Usage:
+
+        >>> leaderboard = get_leaderboard()
+        >>> leaderboard.record(bid, user.public_id, user.auth_user.username)
+
+    """
+    # Prices are stored with as many decimal places as bid prices have
+    places = Decimal(1).scaleb(-Bid._meta.get_field("price").decimal_places)
+
+    def __init__(self, size: int):
+        self.size = size
+
+    @classmethod
+    def get_entry(cls, bid: Bid, user_public_id: UUID, username: str) -> dict:
+        return {
+            "public_id": str(bid.public_id),
+            "created_at": encode_datetime(bid.created_at),
+            "user": str(user_public_id),
+            "username": username,
+            "price": str(bid.price.amount.quantize(cls.places)),
+            "price_currency": bid.price.currency.code,
+            "normalized_price": str(bid.normalized_price),
+        }
+
+    def insert(self, entries: List[dict], entry: dict) -> Optional[list]:
+        """
+        Insert an entry in its position, if it is among the highest, and get
+        the entries kept; or None if they are unchanged.
+        """
+        price = Decimal(entry["normalized_price"])
+        position = len(entries)
+        for index, other in enumerate(entries):
+            if Decimal(other["normalized_price"]) < price:
+                position = index
+                break
+        if position >= self.size:
+            return None
+        entries.insert(position, entry)
+        return entries[:self.size]
+
+    def record(self, bid: Bid, user_public_id: UUID, username: str):
+        """
+        Record a bid just placed, by the user of `user_public_id` and
+        `username`, in the leaderboard of its auction, unless its price
+        cannot be converted to be ranked.
+        """
+        if bid.normalized_price is None:
+            return
+        auctions = Auction.objects.filter(pk=bid.auction_id)
+        top_bids = auctions.values_list("top_bids", flat=True).get()
+        entry = self.get_entry(bid, user_public_id, username)
+        entries = self.insert(json.loads(top_bids), entry)
+        if entries is not None:
+            auctions.update(top_bids=self.encode(entries))
+
+    def rebuild(self, auctions: models.QuerySet):
+        """
+        Rank the bids of every auction in a queryset again, e.g. after their
+        prices are converted at new exchange rates, with a query per auction
+        reading its highest bids from the `(auction, normalized_price)`
+        index.
+        """
+        for auction_id in auctions.values_list("pk", flat=True).iterator():
+            bids = Bid.objects.filter(
+                auction_id=auction_id, normalized_price__isnull=False
+            ).select_related("user__auth_user").order_by(
+                "-normalized_price", "created_at", "id"
+            )[:self.size]
+            Auction.objects.filter(pk=auction_id).update(
+                top_bids=self.encode([
+                    self.get_entry(
+                        bid, bid.user.public_id, bid.user.auth_user.username
+                    )
+                    for bid in bids
+                ])
+            )
+
+    @staticmethod
+    def encode(entries: List[dict]) -> str:
+        return json.dumps(entries, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def get_leaderboard() -> Leaderboard:
+    """
+    Get the leaderboard configured by the `LEADERBOARD_SIZE` setting.
+    """
+    return Leaderboard(settings.LEADERBOARD_SIZE)
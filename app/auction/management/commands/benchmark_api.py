@@ -0,0 +1,245 @@
+# Django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+# Third-party
+from rest_framework.renderers import JSONRenderer
+
+# Local
+from account.tests.factories import UserProfileFactory
+from auction.benchmark import (
+    benchmark_bid_throttles,
+    benchmark_concurrent_bids,
+    get_access_token,
+    get_scenarios,
+    seed_data,
+)
+from auction.bidding import BidWriter, place_bid
+from auction.models import Lot
+from common.benchmark import BenchmarkRunner, write_report
+from common.renderers import FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a benchmark database with auctions and bids in bulk, then "
+        "request every API endpoint in-process, reporting latency "
+        "percentiles, queries per request and throughput as JSON."
+    )
+    # Scenarios whose responses are rendered by both JSON renderers, to
+    # compare the time rendering each takes.
+    renderer_scenarios = ("lot_list", "bid_history", "user_list")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lots",
+            type=int,
+            default=10000,
+            help="Amount of lots to seed (e.g. 1000000).",
+        )
+        parser.add_argument(
+            "--bids-per-lot",
+            type=int,
+            default=50,
+            help="Amount of bids to seed for every lot.",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=100,
+            help="Amount of users owning lots and placing bids.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Amount of lots inserted per transaction when seeding.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=200,
+            help="Amount of measured requests per scenario.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=20,
+            help="Amount of unmeasured requests per scenario, sent first.",
+        )
+        parser.add_argument(
+            "--concurrent-bidders",
+            type=int,
+            default=0,
+            help=(
+                "Amount of threads bidding at once, to compare placing bids "
+                "straight away with group committing them."
+            ),
+        )
+        parser.add_argument(
+            "--bids-per-bidder",
+            type=int,
+            default=50,
+            help="Amount of bids placed by every concurrent bidder.",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            help="Only run the given scenario; can be repeated.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark.json",
+            help="Path of the JSON file results are written to.",
+        )
+        parser.add_argument(
+            "--database",
+            help=(
+                "Path of the SQLite database to benchmark with, instead of "
+                "the test database."
+            ),
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help=(
+                "Keep the benchmark database, and reuse the data it was "
+                "already seeded with."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 2:
+            raise CommandError("Bids need at least two users.")
+        if options["database"]:
+            connection.settings_dict["TEST"]["NAME"] = options["database"]
+        # Never seed the database the application is configured with
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            self.seed(options)
+            results, renderers = self.benchmark(options)
+            concurrent_bids = self.benchmark_concurrent_bids(options)
+            bid_throttles = self.benchmark_bid_throttles(options)
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+        write_report(
+            options["output"],
+            results,
+            dataset={
+                "lots": options["lots"],
+                "bids_per_lot": options["bids_per_lot"],
+                "users": options["users"],
+            },
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+            renderers=renderers,
+            concurrent_bids=concurrent_bids,
+            bid_throttles=bid_throttles,
+        )
+        self.stdout.write(f"Results written to {options['output']}.")
+
+    def seed(self, options):
+        seeded = Lot.objects.count()
+        if seeded >= options["lots"]:
+            self.stdout.write(f"Reusing the {seeded} lots already seeded.")
+            return
+        seed_data(
+            options["lots"] - seeded,
+            options["bids_per_lot"],
+            users=options["users"],
+            chunk_size=options["chunk_size"],
+            log=self.stdout.write,
+        )
+
+    def benchmark(self, options) -> tuple:
+        user = UserProfileFactory()
+        authorization = (
+            f"{settings.OAUTH2_AUTHORIZATION_SCHEME} {get_access_token(user)}"
+        )
+        scenarios = get_scenarios(authorization, user)
+        if options["scenarios"]:
+            scenarios = [
+                scenario for scenario in scenarios
+                if scenario.name in options["scenarios"]
+            ]
+        runner = BenchmarkRunner(
+            Client(SERVER_NAME="localhost"),
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+        )
+        # Bids are still checked by every throttle, but never throttled
+        unlimited = {
+            scope: (1e9, 1e9) for scope in settings.TOKEN_BUCKET_RATES
+        }
+        with override_settings(TOKEN_BUCKET_RATES=unlimited):
+            results = runner.run_all(scenarios, report=self.report)
+
+        renderers = {}
+        for scenario in scenarios:
+            if scenario.name not in self.renderer_scenarios:
+                continue
+            renderers[scenario.name] = runner.compare_renderers(
+                scenario, JSONRenderer(), FastJSONRenderer()
+            )
+            self.stdout.write(
+                f"{scenario.name} rendering: "
+                f"{renderers[scenario.name]['baseline_us']}us with "
+                f"JSONRenderer, {renderers[scenario.name]['candidate_us']}us "
+                f"with FastJSONRenderer"
+            )
+        return results, renderers
+
+    def benchmark_concurrent_bids(self, options) -> dict:
+        if not options["concurrent_bidders"]:
+            return {}
+        writer = BidWriter()
+        try:
+            placements = (
+                ("direct", place_bid),
+                ("group_commit", writer.submit),
+            )
+            results = {}
+            for name, place in placements:
+                results[name] = benchmark_concurrent_bids(
+                    place,
+                    bidders=options["concurrent_bidders"],
+                    bids_per_bidder=options["bids_per_bidder"],
+                )
+                self.stdout.write(
+                    f"concurrent_bids ({name}): "
+                    f"{results[name]['bids_per_second']} bids/s, "
+                    f"{results[name]['errors']} errors"
+                )
+        finally:
+            writer.stop()
+        return results
+
+    def benchmark_bid_throttles(self, options) -> dict:
+        results = benchmark_bid_throttles(
+            max(options["iterations"], 1) * 100
+        )
+        self.stdout.write(
+            f"bid_throttles: {results['us_per_request']}us/request, "
+            f"{results['requests_per_second']} requests/s"
+        )
+        return results
+
+    def report(self, name: str, results: dict):
+        rows = ""
+        if "rows_per_second" in results:
+            rows = f"{results['rows_per_second']} rows/s, "
+        self.stdout.write(
+            f"{name}: p50 {results['p50_ms']}ms, p95 {results['p95_ms']}ms, "
+            f"p99 {results['p99_ms']}ms, "
+            f"{results['queries_per_request']} queries/request, "
+            f"{results['throughput_rps']} requests/s, {rows}"
+            f"{results['errors']} errors"
+        )
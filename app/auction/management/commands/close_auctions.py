@@ -0,0 +1,46 @@
+# Django
+from django.core.management.base import BaseCommand
+
+# Local
+from auction.scheduler import AuctionScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Settle auctions as they expire, recording them as closed with "
+        "their winning bid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Settle the auctions expired by now and exit.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Maximum amount of auctions settled per transaction.",
+        )
+        parser.add_argument(
+            "--refresh-interval",
+            type=int,
+            default=60,
+            help="Seconds between reloading upcoming expiry times.",
+        )
+
+    def handle(self, *args, **options):
+        scheduler = AuctionScheduler(
+            batch_size=options["batch_size"],
+            refresh_interval=options["refresh_interval"],
+        )
+        if options["once"]:
+            settled = scheduler.run_pending()
+            self.stdout.write(f"Settled {settled} expired auctions.")
+            return
+        self.stdout.write("Settling auctions as they expire...")
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            scheduler.stop()
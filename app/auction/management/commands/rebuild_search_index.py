@@ -0,0 +1,18 @@
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Local
+from auction.search import get_search_engine
+
+
+class Command(BaseCommand):
+    help = (
+        "Index every lot stored for search, discarding the current index, "
+        "e.g. after lots were inserted in bulk without signals."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            get_search_engine().rebuild()
+        self.stdout.write("Search index rebuilt.")
@@ -0,0 +1,66 @@
+# Python standard
+from decimal import Decimal, InvalidOperation
+
+# Django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Third-party
+from djmoney.settings import CURRENCY_CHOICES
+
+# Local
+from auction.currency import update_exchange_rates
+
+
+class Command(BaseCommand):
+    help = (
+        "Store the exchange rates configured in `EXCHANGE_RATES`, or given, "
+        "and convert every price in their currencies at the new rates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rate",
+            action="append",
+            default=[],
+            metavar="CURRENCY=RATE",
+            help=(
+                "Rate a currency is converted into the default currency at, "
+                "instead of the configured rates; can be repeated."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        rates = {}
+        for option in options["rate"]:
+            currency, separator, rate = option.partition("=")
+            if not separator:
+                raise CommandError("Rates must be given as CURRENCY=RATE.")
+            rates[currency] = rate
+        rates = self.parse_rates(rates or settings.EXCHANGE_RATES)
+        update_exchange_rates(rates)
+        for currency, rate in sorted(rates.items()):
+            self.stdout.write(
+                f"1 {currency} = {rate} {settings.DEFAULT_CURRENCY}"
+            )
+        self.stdout.write(f"Updated {len(rates)} exchange rates.")
+
+    @staticmethod
+    def parse_rates(rates: dict) -> dict:
+        currencies = {code for code, _ in CURRENCY_CHOICES}
+        parsed = {}
+        for currency, rate in rates.items():
+            currency = currency.strip().upper()
+            if currency not in currencies:
+                raise CommandError(f"Unknown currency: {currency}.")
+            if currency == settings.DEFAULT_CURRENCY:
+                raise CommandError(
+                    f"{currency} is the default currency, so has no rate."
+                )
+            try:
+                parsed[currency] = Decimal(str(rate).strip())
+            except InvalidOperation:
+                raise CommandError(f"Invalid rate for {currency}: {rate}.")
+            if parsed[currency] <= 0:
+                raise CommandError(f"Invalid rate for {currency}: {rate}.")
+        return parsed
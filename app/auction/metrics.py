@@ -0,0 +1,29 @@
+# Django
+from django.utils import timezone
+
+# Local
+from auction.models import Auction
+from common.metrics import registry
+
+
+def count_active_auctions() -> int:
+    return Auction.objects.filter(
+        status=Auction.OPEN, expires_at__gt=timezone.now()
+    ).count()
+
+
+bids = registry.counter(
+    "auction_bids_total",
+    "Bids submitted, by whether they were accepted or rejected.",
+    ["outcome"],
+)
+lot_cache_lookups = registry.counter(
+    "auction_lot_cache_lookups_total",
+    "Lot details looked up in the lot cache, by whether they were a hit.",
+    ["result"],
+)
+active_auctions = registry.gauge(
+    "auction_active_auctions",
+    "Auctions open for bids, which have not expired yet.",
+    count_active_auctions,
+)
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.5 on 2026-10-17 18:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0002_auction_highest_bid'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lot',
+            index=models.Index(fields=['created_at', 'id'], name='auction_lot_created_6033f6_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.0.5 on 2026-10-17 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0003_lot_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auction',
+            name='settled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='status',
+            field=models.CharField(choices=[('OPEN', 'Open for bids'), ('CLOSED', 'Closed and settled')], default='OPEN', max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['status', 'expires_at'], name='auction_auc_status_c796c4_idx'),
+        ),
+    ]
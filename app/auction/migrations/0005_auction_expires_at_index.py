@@ -0,0 +1,17 @@
+# Generated by Django 3.0.5 on 2026-10-17 18:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0004_auction_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['expires_at', 'id'], name='auction_auc_expires_63a943_idx'),
+        ),
+    ]
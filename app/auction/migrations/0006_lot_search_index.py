@@ -0,0 +1,38 @@
+# Generated by Django 3.0.5 on 2026-10-17 21:02
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Create the FTS5 full-text index of lots searched by `SQLiteFTS5Engine`,
+    indexing the lots already stored. Other databases are searched without it.
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE auction_lot_search USING fts5("
+        "name, description, tokenize='porter unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO auction_lot_search (rowid, name, description) "
+        "SELECT id, name, COALESCE(description, '') "
+        "FROM auction_lot WHERE deleted_at IS NULL"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS auction_lot_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0005_auction_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
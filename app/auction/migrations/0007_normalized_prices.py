@@ -0,0 +1,110 @@
+# Generated by Django 3.0.5 on 2026-10-17 19:10
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+# Frozen as they were when prices were first converted, so the migration
+# converts them the same way whatever the settings later become.
+DEFAULT_CURRENCY = "GBP"
+EXCHANGE_RATES = {
+    "EUR": Decimal("0.87"),
+    "USD": Decimal("0.75"),
+}
+# Places of normalized prices, as rounded by `ExchangeRates.normalize`
+PLACES = Decimal("0.0001")
+BATCH_SIZE = 1000
+
+
+def backfill_normalized_prices(apps, schema_editor):
+    """
+    Convert every price into the default currency, in Python as
+    `ExchangeRates.normalize` does, and store the exchange rates of the
+    currencies prices are converted from.
+
+    Prices in any other currency are left unconverted, and bids on their
+    auctions rejected, until `update_exchange_rates` stores its rate.
+    """
+    Auction = apps.get_model("auction", "Auction")
+    Bid = apps.get_model("auction", "Bid")
+    ExchangeRate = apps.get_model("auction", "ExchangeRate")
+    fields = (
+        (Auction, "base_price"),
+        (Auction, "highest_bid_price"),
+        (Bid, "price"),
+    )
+    currencies = set()
+    for model, field in fields:
+        currencies.update(
+            model.objects.values_list(f"{field}_currency", flat=True)
+        )
+    rates = {DEFAULT_CURRENCY: Decimal(1)}
+    for currency, rate in EXCHANGE_RATES.items():
+        if currency in currencies:
+            rates[currency] = rate
+            ExchangeRate.objects.update_or_create(
+                currency=currency, defaults={"rate": rate}
+            )
+
+    for model, field in fields:
+        normalized_field = f"normalized_{field}"
+        for currency, rate in rates.items():
+            rows = model.objects.filter(**{
+                f"{field}_currency": currency,
+                f"{field}__isnull": False,
+            }).order_by("pk").values_list("pk", field)
+            batch = []
+            for pk, amount in rows.iterator(BATCH_SIZE):
+                normalized = (Decimal(amount) * rate).quantize(PLACES)
+                batch.append(model(pk=pk, **{normalized_field: normalized}))
+                if len(batch) == BATCH_SIZE:
+                    model.objects.bulk_update(batch, [normalized_field])
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, [normalized_field])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0006_lot_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3, unique=True)),
+                ('rate', models.DecimalField(decimal_places=8, help_text='Amount of the default currency one unit is worth.', max_digits=19)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='normalized_base_price',
+            field=models.DecimalField(blank=True, decimal_places=4, help_text='Starting price converted into the default currency.', max_digits=19, null=True),
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='normalized_highest_bid_price',
+            field=models.DecimalField(blank=True, decimal_places=4, help_text='Highest bid price converted into the default currency.', max_digits=19, null=True),
+        ),
+        migrations.AddField(
+            model_name='bid',
+            name='normalized_price',
+            field=models.DecimalField(blank=True, decimal_places=4, help_text='Bidding price converted into the default currency.', max_digits=19, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['normalized_base_price', 'id'], name='auction_auc_normali_f077f5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['auction', 'normalized_price'], name='auction_bid_auction_a0ce69_idx'),
+        ),
+        migrations.RunPython(
+            backfill_normalized_prices, migrations.RunPython.noop
+        ),
+    ]
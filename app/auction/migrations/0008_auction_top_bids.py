@@ -0,0 +1,61 @@
+# Generated by Django 3.0.5 on 2026-10-17 19:14
+
+import json
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_top_bids(apps, schema_editor):
+    """
+    Rank the highest bids of auctions created before they were recorded on
+    the `Auction` table, as `auction.leaderboard.Leaderboard` does.
+    """
+    Auction = apps.get_model("auction", "Auction")
+    Bid = apps.get_model("auction", "Bid")
+    auction_ids = Bid.objects.values_list("auction_id", flat=True).distinct()
+    for auction_id in auction_ids.iterator():
+        bids = Bid.objects.filter(
+            auction_id=auction_id, normalized_price__isnull=False
+        ).order_by("-normalized_price", "created_at", "id").values(
+            "public_id",
+            "created_at",
+            "user__public_id",
+            "user__auth_user__username",
+            "price",
+            "price_currency",
+            "normalized_price",
+        )[:settings.LEADERBOARD_SIZE]
+        entries = [
+            {
+                "public_id": str(bid["public_id"]),
+                "created_at": bid["created_at"].isoformat().replace(
+                    "+00:00", "Z"
+                ),
+                "user": str(bid["user__public_id"]),
+                "username": bid["user__auth_user__username"],
+                "price": str(bid["price"]),
+                "price_currency": bid["price_currency"],
+                "normalized_price": str(bid["normalized_price"]),
+            }
+            for bid in bids
+        ]
+        Auction.objects.filter(pk=auction_id).update(
+            top_bids=json.dumps(entries, separators=(",", ":"))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0007_normalized_prices'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auction',
+            name='top_bids',
+            field=models.TextField(default='[]', editable=False, help_text='Highest bids placed for this auction, as JSON.'),
+        ),
+        migrations.RunPython(backfill_top_bids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.0.5 on 2026-10-17 19:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('auction', '0008_auction_top_bids'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bid',
+            name='user',
+            field=models.ForeignKey(db_index=False, help_text='Bidding user.', on_delete=django.db.models.deletion.CASCADE, related_name='user', to='account.UserProfile'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['user', 'created_at'], name='auction_bid_user_id_ee3ae2_idx'),
+        ),
+    ]
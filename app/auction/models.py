@@ -1,6 +1,6 @@
 # Django
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 # Third-party
@@ -15,6 +15,12 @@ class Auction(GenericApplicationModel):
     """
     Store an auction started by an user.
     """
+    OPEN = "OPEN"
+    CLOSED = "CLOSED"
+    STATUS_CHOICES = (
+        (OPEN, "Open for bids"),
+        (CLOSED, "Closed and settled"),
+    )
     user = models.ForeignKey(
         UserProfile,
         null=True,
@@ -29,22 +35,86 @@ class Auction(GenericApplicationModel):
         default_currency=settings.DEFAULT_CURRENCY,
         help_text="Starting price for the auction.",
     )
+    # Prices are also stored converted into `DEFAULT_CURRENCY` (see
+    # `auction.currency`), so prices in different currencies can be ordered
+    # and compared in the database. Unknown while their currency has no
+    # exchange rate.
+    normalized_base_price = models.DecimalField(
+        null=True,
+        blank=True,
+        max_digits=19,
+        decimal_places=4,
+        help_text="Starting price converted into the default currency.",
+    )
     expires_at = models.DateTimeField()
+    # Denormalised view of the bidding state, kept up to date in the same
+    # transaction a bid is recorded, so reading it never scans `bids`.
+    highest_bid_price = MoneyField(
+        null=True,
+        blank=True,
+        max_digits=19,
+        decimal_places=2,
+        default_currency=settings.DEFAULT_CURRENCY,
+        help_text="Price offered by the current highest bid, if any.",
+    )
+    normalized_highest_bid_price = models.DecimalField(
+        null=True,
+        blank=True,
+        max_digits=19,
+        decimal_places=4,
+        help_text="Highest bid price converted into the default currency.",
+    )
+    winning_bid = models.ForeignKey(
+        "Bid",
+        null=True,
+        blank=True,
+        related_name="+",
+        on_delete=models.SET_NULL,
+        help_text="Current highest bid placed for this auction.",
+    )
+    bid_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of bids placed for this auction.",
+    )
+    # The highest bids, highest first, encoded as JSON and kept up to date
+    # in the same transaction a bid is recorded (see `auction.leaderboard`),
+    # so they are read without sorting `bids`.
+    top_bids = models.TextField(
+        default="[]",
+        editable=False,
+        help_text="Highest bids placed for this auction, as JSON.",
+    )
+    # Recorded by the auction scheduler once the auction has expired, after
+    # which `winning_bid` is the bid that won it.
+    status = models.CharField(
+        choices=STATUS_CHOICES,
+        default=OPEN,
+        max_length=16,
+    )
+    settled_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         # Index the database table first by user, then by
         # latest time of auction creation.
         indexes = [
-            models.Index(fields=['user', 'created_at'])
+            models.Index(fields=['user', 'created_at']),
+            # Find the open auctions due to expire next, for settlement.
+            models.Index(fields=['status', 'expires_at']),
+            # Filter lots by whether their auction is active, with a range
+            # scan on the expiry time regardless of settlement.
+            models.Index(fields=['expires_at', 'id']),
+            # Order lots by price, and filter them by a range of prices,
+            # whatever their currency.
+            models.Index(fields=['normalized_base_price', 'id']),
         ]
 
     @property
     def is_active(self):
-        return timezone.now() < self.expires_at
+        return self.status == self.OPEN and timezone.now() < self.expires_at
 
     @property
     def highest_bid(self):
-        return self.bids.order_by("price").last()
+        return self.winning_bid
 
 
 class Lot(GenericApplicationModel):
@@ -74,6 +144,21 @@ class Lot(GenericApplicationModel):
         db_index=True, on_delete=models.CASCADE
     )
 
+    class Meta:
+        # Index the database table by creation time, with the primary key to
+        # break ties, so lots can be paginated by their position.
+        indexes = [
+            models.Index(fields=['created_at', 'id'])
+        ]
+
+    @property
+    def is_active(self):
+        return self.auction.is_active
+
+    @property
+    def highest_bid(self):
+        return self.auction.highest_bid
+
 
 class Bid(GenericApplicationModel):
     """
@@ -83,6 +168,8 @@ class Bid(GenericApplicationModel):
         UserProfile,
         related_name="user",
         on_delete=models.CASCADE,
+        # Indexed first by the `(user, created_at)` index instead
+        db_index=False,
         help_text="Bidding user."
     )
     auction = models.ForeignKey(
@@ -99,10 +186,46 @@ class Bid(GenericApplicationModel):
             "Default currency is in Sterling Pounds."
         )
     )
+    normalized_price = models.DecimalField(
+        null=True,
+        blank=True,
+        max_digits=19,
+        decimal_places=4,
+        help_text="Bidding price converted into the default currency.",
+    )
 
     class Meta:
         # Index the database table first by user, then by most recent
         # submission time, which means the bid is higher.
         indexes = [
-            models.Index(fields=['auction', 'created_at'])
+            models.Index(fields=['auction', 'created_at']),
+            # Order the bids of an auction by price, whatever their
+            # currency, and find the highest.
+            models.Index(fields=['auction', 'normalized_price']),
+            # Find the bids of a user, most recent first, without reading
+            # every bid of the auctions they bid for.
+            models.Index(fields=['user', 'created_at']),
         ]
+
+    def save(self, *args, **kwargs):
+        # Record the bid and update its auction's highest bid atomically
+        # (see `auction.signals.record_highest_bid`).
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class ExchangeRate(models.Model):
+    """
+    Store the rate a currency is converted into `DEFAULT_CURRENCY` at, as
+    configured locally (see the `update_exchange_rates` command).
+    """
+    currency = models.CharField(max_length=3, unique=True)
+    rate = models.DecimalField(
+        max_digits=19,
+        decimal_places=8,
+        help_text="Amount of the default currency one unit is worth.",
+    )
+    modified_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.currency} {self.rate}"
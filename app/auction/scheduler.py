@@ -0,0 +1,186 @@
+# Python standard
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+# Django
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+# Local
+from auction.cache import get_lot_cache
+from auction.models import Auction
+from auction.streaming import get_broker, get_channel
+
+
+logger = logging.getLogger(__name__)
+
+
+def settle_auctions(auction_ids: List[int], now: datetime) -> List[int]:
+    """
+    Close the given auctions which have expired by `now`, recording when they
+    were settled. Their `winning_bid` is the bid that won them.
+
+    Return the identifiers of the auctions settled, which are also announced
+    to the clients streaming their bids.
+
+    Auctions are closed by a single conditional UPDATE, which only changes
+    those still open once it holds the write lock, so auctions settled by
+    another scheduler meanwhile are neither settled nor announced again.
+    Those this call changed are then read back by their settlement time.
+    """
+    with transaction.atomic():
+        Auction.objects.filter(
+            pk__in=auction_ids,
+            status=Auction.OPEN,
+            expires_at__lte=now,
+        ).update(
+            status=Auction.CLOSED,
+            settled_at=now,
+        )
+        settled_ids = list(
+            Auction.objects.filter(
+                pk__in=auction_ids,
+                status=Auction.CLOSED,
+                settled_at=now,
+            ).values_list("pk", flat=True)
+        )
+    for auction_id in settled_ids:
+        get_lot_cache().invalidate(auction_id)
+        get_broker().publish(
+            get_channel(auction_id),
+            {"event": "closed", "data": {"settled_at": now.isoformat()}}
+        )
+    return settled_ids
+
+
+class AuctionScheduler:
+    """
+    Settle auctions as soon as they expire.
+
+    Keeps a min-heap of the upcoming `expires_at` deadlines of open auctions,
+    and sleeps until the next one is due, rather than polling every auction.
+    Deadlines are loaded from the database every `refresh_interval` seconds,
+    for the auctions expiring before the following refresh; auctions created
+    in the meantime by this process are added with `schedule`.
+
+    Usage:
+
+        >>> scheduler = AuctionScheduler()
+        >>> scheduler.run_pending()  # Settle auctions due now
+        >>> scheduler.run()  # Keep settling auctions until stopped
+
+    """
+
+    def __init__(self, batch_size: int = 500, refresh_interval: int = 60):
+        self.batch_size = batch_size
+        self.refresh_interval = timedelta(seconds=refresh_interval)
+        self.heap = []
+        # Deadline each auction is currently scheduled for, to skip heap
+        # entries left behind when an auction's expiry time changes.
+        self.deadlines = {}
+        self.next_refresh = None
+        self.lock = threading.Lock()
+        self.wake_up = threading.Event()
+        self.stopped = threading.Event()
+
+    def schedule(self, auction_id: int, expires_at: datetime):
+        with self.lock:
+            if self.deadlines.get(auction_id) == expires_at:
+                return
+            self.deadlines[auction_id] = expires_at
+            heapq.heappush(self.heap, (expires_at, auction_id))
+        self.wake_up.set()
+
+    def refresh(self, now: datetime):
+        """
+        Schedule the open auctions expiring before the next refresh.
+        """
+        self.next_refresh = now + self.refresh_interval
+        auctions = Auction.objects.filter(
+            status=Auction.OPEN,
+            expires_at__lte=self.next_refresh,
+        ).values_list("pk", "expires_at")
+        for auction_id, expires_at in auctions.iterator():
+            self.schedule(auction_id, expires_at)
+
+    def pop_due(self, now: datetime) -> List[int]:
+        """
+        Get a batch of the auctions due to expire by `now`.
+        """
+        due = []
+        with self.lock:
+            while (
+                self.heap
+                and self.heap[0][0] <= now
+                and len(due) < self.batch_size
+            ):
+                expires_at, auction_id = heapq.heappop(self.heap)
+                if self.deadlines.get(auction_id) == expires_at:
+                    del self.deadlines[auction_id]
+                    due.append(auction_id)
+        return due
+
+    def run_pending(self) -> int:
+        """
+        Settle every auction due by now, in batches; return how many were.
+        """
+        now = timezone.now()
+        if self.next_refresh is None or now >= self.next_refresh:
+            self.refresh(now)
+        settled = 0
+        due = self.pop_due(now)
+        while due:
+            settled += len(settle_auctions(due, now))
+            due = self.pop_due(now)
+        return settled
+
+    def get_timeout(self) -> float:
+        """
+        Get the seconds until either the next deadline or refresh is due.
+        """
+        with self.lock:
+            wake_up_at = self.next_refresh or (
+                timezone.now() + self.refresh_interval
+            )
+            if self.heap:
+                wake_up_at = min(self.heap[0][0], wake_up_at)
+        timeout = (wake_up_at - timezone.now()).total_seconds()
+        return max(timeout, 0)
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                settled = self.run_pending()
+                if settled:
+                    logger.info(f"Settled {settled} expired auctions.")
+            except Exception:
+                logger.exception("Failed to settle expired auctions.")
+            finally:
+                close_old_connections()
+            self.wake_up.wait(self.get_timeout())
+            self.wake_up.clear()
+
+    def stop(self):
+        self.stopped.set()
+        self.wake_up.set()
+
+
+# Scheduler running in a background thread of this process, if started
+worker: Optional[AuctionScheduler] = None
+
+
+def start_worker(**kwargs) -> AuctionScheduler:
+    """
+    Run an `AuctionScheduler` in a daemon thread of this process.
+    """
+    global worker
+    if worker is None:
+        worker = AuctionScheduler(**kwargs)
+        thread = threading.Thread(
+            target=worker.run, name="auction-scheduler", daemon=True
+        )
+        thread.start()
+    return worker
@@ -0,0 +1,174 @@
+# Python standard
+import re
+from functools import lru_cache
+from typing import Iterable
+
+# Django
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.utils.module_loading import import_string
+
+# Third-party
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+# Local
+from auction.models import Lot
+
+
+# Words searched for in a query, ignoring any search engine syntax
+SEARCH_TERM = re.compile(r"\w+")
+
+
+def get_search_terms(query: str) -> list:
+    return SEARCH_TERM.findall(query)
+
+
+class BaseSearchEngine:
+    """
+    Search lots by the words in their name and description.
+
+    Engines keeping their own index of lots are notified every time a lot is
+    saved or deleted, and can be rebuilt from all the lots stored.
+    """
+
+    def index(self, lots: Iterable[Lot]):
+        """
+        Add lots to the index, or update them, unless they are deleted.
+        """
+
+    def remove(self, lot_ids: Iterable[int]):
+        """
+        Remove lots from the index.
+        """
+
+    def rebuild(self):
+        """
+        Index every lot stored, discarding the current index.
+        """
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """
+        Filter lots matching every word of a query, ordered by relevance.
+        """
+        raise NotImplementedError
+
+
+class SimpleSearchEngine(BaseSearchEngine):
+    """
+    Search lots containing every word of a query, without an index or
+    ranking results, which suits any database.
+    """
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        for term in get_search_terms(query):
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset
+
+
+class SQLiteFTS5Engine(BaseSearchEngine):
+    """
+    Search lots with the SQLite FTS5 full-text index `auction_lot_search`,
+    created by the migrations, ranking results with BM25.
+
+    The index keeps the name and description of every lot not deleted,
+    with the lot's primary key as its `rowid`. Words are stemmed, and the
+    last word of a query also matches words it is a prefix of, so results
+    can be suggested as users type.
+    """
+    table = "auction_lot_search"
+    # BM25 weights of the name and description; names are more relevant.
+    weights = (10.0, 1.0)
+
+    def index(self, lots: Iterable[Lot]):
+        lots = list(lots)
+        self.remove(lot.pk for lot in lots)
+        rows = [
+            (lot.pk, lot.name, lot.description or "")
+            for lot in lots if lot.deleted_at is None
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, name, description) "
+                f"VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, lot_ids: Iterable[int]):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(lot_id,) for lot_id in lot_ids],
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, name, description) "
+                f"SELECT id, name, COALESCE(description, '') "
+                f"FROM auction_lot WHERE deleted_at IS NULL"
+            )
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        match = self.get_match_expression(query)
+        if not match:
+            return queryset.none()
+        weights = ", ".join(str(weight) for weight in self.weights)
+        return queryset.extra(
+            select={"search_rank": f"bm25({self.table}, {weights})"},
+            tables=[self.table],
+            where=[
+                f"{self.table}.rowid = auction_lot.id",
+                f"{self.table} MATCH %s",
+            ],
+            params=[match],
+            order_by=["search_rank"],
+        )
+
+    @staticmethod
+    def get_match_expression(query: str) -> str:
+        """
+        Quote every word of a query, so it is never parsed as FTS5 syntax.
+        """
+        terms = [f'"{term}"' for term in get_search_terms(query)]
+        if terms:
+            terms[-1] += "*"
+        return " ".join(terms)
+
+
+@lru_cache(maxsize=None)
+def get_search_engine() -> BaseSearchEngine:
+    """
+    Get the search engine configured by the `LOT_SEARCH_ENGINE` setting.
+    """
+    return import_string(settings.LOT_SEARCH_ENGINE)()
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Filter lots matching a full-text search query (`?q=`), with the most
+    relevant first unless ordered otherwise.
+    """
+    search_param = "q"
+
+    def get_query(self, request) -> str:
+        return request.query_params.get(self.search_param, "").strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_query(request)
+        if not query:
+            return queryset
+        return get_search_engine().search(queryset, query)
+
+    def orders_results(self, request) -> bool:
+        """
+        Whether results are ordered by relevance, rather than by position.
+        """
+        ordering = request.query_params.get(
+            api_settings.ORDERING_PARAM, ""
+        ).strip()
+        return bool(self.get_query(request)) and not ordering
@@ -1,20 +1,151 @@
-# # Django
-# from django.contrib.auth import get_user_model
-# from django.db.models.signals import post_save
-# from django.dispatch import receiver
-#
-# # Local
-# from account.models import UserProfile
-# from auction.models import Bid
-#
-#
-# @receiver(post_save, sender=Bid)
-# def increase_highest_bid(
-#         sender, instance=None, created=False, **kwargs
-# ):
-#     """
-#     Recalculate the highest_bid recorded for a Lot every time a new Bid is
-#     created in the system.
-#     """
-#     if created:
-#         instance.lot.highest_bid
+# Django
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# Local
+from auction import scheduler
+from auction.cache import get_lot_cache
+from auction.currency import get_exchange_rates
+from auction.leaderboard import get_leaderboard
+from auction.models import Auction, Bid, ExchangeRate, Lot
+from auction.search import get_search_engine
+from auction.streaming import publish_bid
+
+
+@receiver(pre_save, sender=Auction)
+def normalize_auction_prices(
+        sender, instance=None, **kwargs
+):
+    """
+    Convert the prices of an auction into the default currency every time it
+    is saved, leaving them unknown if their currency has no exchange rate.
+    """
+    exchange_rates = get_exchange_rates()
+    for field in ("base_price", "highest_bid_price"):
+        price = getattr(instance, field)
+        normalized_price = None
+        if price is not None and exchange_rates.has_rate(price.currency.code):
+            normalized_price = exchange_rates.normalize(price)
+        setattr(instance, f"normalized_{field}", normalized_price)
+
+
+@receiver(pre_save, sender=Bid)
+def normalize_bid_price(
+        sender, instance=None, **kwargs
+):
+    """
+    Convert the price of a bid into the default currency every time it is
+    saved, leaving it unknown if its currency has no exchange rate.
+    """
+    exchange_rates = get_exchange_rates()
+    instance.normalized_price = None
+    if exchange_rates.has_rate(instance.price.currency.code):
+        instance.normalized_price = exchange_rates.normalize(instance.price)
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def invalidate_exchange_rates(
+        sender, instance=None, **kwargs
+):
+    """
+    Discard the exchange rates cached whenever one of them changes.
+    """
+    get_exchange_rates().invalidate()
+
+
+@receiver(post_save, sender=Bid)
+def record_highest_bid(
+        sender, instance=None, created=False, **kwargs
+):
+    """
+    Update the bidding state denormalised on the `Auction` every time a new
+    `Bid` is created in the system.
+
+    Runs inside the transaction opened by `Bid.save`, and only uses
+    conditional UPDATE statements, so concurrent bids never overwrite a higher
+    price with a lower one. The bid is ranked among the highest bids of the
+    auction once its row is locked by the first update, and streamed to the
+    clients following the auction once committed.
+    """
+    if not created:
+        return
+    auctions = Auction.objects.filter(pk=instance.auction_id)
+    auctions.update(bid_count=F("bid_count") + 1)
+    # The bid's user is the profile it was created with, whose auth user
+    # `place_bid` loads before the auction row is locked.
+    user = instance.user
+    get_leaderboard().record(
+        instance, user.public_id, user.auth_user.username
+    )
+    # Prices are compared converted into the default currency
+    price = instance.normalized_price
+    outbids = Q(normalized_highest_bid_price__isnull=True)
+    if price is not None:
+        outbids |= Q(normalized_highest_bid_price__lt=price)
+    is_highest = auctions.filter(outbids).update(
+        highest_bid_price=instance.price.amount,
+        highest_bid_price_currency=instance.price.currency.code,
+        normalized_highest_bid_price=instance.normalized_price,
+        winning_bid=instance,
+    )
+    publish_bid(instance, is_highest=bool(is_highest))
+    get_lot_cache().invalidate(instance.auction_id)
+
+
+@receiver(post_save, sender=Lot)
+@receiver(post_delete, sender=Lot)
+def invalidate_lot_representation(
+        sender, instance=None, **kwargs
+):
+    """
+    Discard the cached representation of a lot whenever it is updated or
+    deleted, along with its auction.
+    """
+    get_lot_cache().invalidate(instance.auction_id)
+
+
+@receiver(post_save, sender=Auction)
+@receiver(post_delete, sender=Auction)
+def invalidate_auction_lot_representation(
+        sender, instance=None, **kwargs
+):
+    """
+    Discard the cached representation of the lot of an auction whenever the
+    auction is saved or deleted.
+    """
+    get_lot_cache().invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Lot)
+def index_lot(
+        sender, instance=None, **kwargs
+):
+    """
+    Keep the search index of a lot up to date with its name and description,
+    removing it once the lot is deleted.
+    """
+    get_search_engine().index([instance])
+
+
+@receiver(post_delete, sender=Lot)
+def remove_lot_from_index(
+        sender, instance=None, **kwargs
+):
+    """
+    Remove a lot from the search index when it is deleted from the database.
+    """
+    get_search_engine().remove([instance.pk])
+
+
+@receiver(post_save, sender=Auction)
+def schedule_auction_expiry(
+        sender, instance=None, **kwargs
+):
+    """
+    Let the auction scheduler running in this process know when a new auction
+    expires, in case it does before the scheduler next reloads deadlines.
+    """
+    if scheduler.worker is not None and instance.status == Auction.OPEN:
+        scheduler.worker.schedule(instance.pk, instance.expires_at)
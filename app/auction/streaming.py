@@ -0,0 +1,277 @@
+# Python standard
+import asyncio
+import json
+import re
+import threading
+from functools import lru_cache, partial, wraps
+from typing import Callable, Optional
+
+# Django
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+# Third-party
+from asgiref.sync import sync_to_async
+from oauth2_provider.models import AccessToken
+
+# Local
+from auction.models import Bid, Lot
+
+
+# Path of the Server-Sent Events stream of bids placed for a lot
+BID_STREAM_PATH = re.compile(
+    f"^/api/auction/v1/lots/(?P<lot_public_id>{settings.UUID_REGEX_FORMAT})"
+    f"/stream$"
+)
+
+
+def close_old_connections():
+    """
+    Close the database connections of the current thread which are unusable
+    or past `CONN_MAX_AGE`, as Django does around every request. Connections
+    in a transaction (such as a test case's) are left to its owner.
+    """
+    for connection in connections.all():
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+def database_sync_to_async(function: Callable) -> Callable:
+    """
+    Run a function using the database in a thread, like `sync_to_async`,
+    closing the connections of that thread before and after it, so streams
+    kept open for hours never hold on to a connection between queries.
+    """
+    @wraps(function)
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(run)
+
+
+class Subscription:
+    """
+    Receive the messages published to a broker channel, in the event loop
+    which subscribed to it.
+
+    Usage:
+
+        >>> subscription = broker.subscribe("channel")
+        >>> message = await subscription.get()
+        >>> subscription.close()
+
+    """
+
+    def __init__(self, broker: "BaseBroker", channel: str):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    def put(self, message: dict):
+        """
+        Deliver a message to this subscription; safe to call from any thread.
+        """
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, message)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class BaseBroker:
+    """
+    Fan out messages published to a channel to every local subscription.
+
+    Each channel keeps a single set of subscriptions in this process, so a
+    message is delivered to all the clients following a lot without any of
+    them querying the database.
+
+    Brokers spanning multiple workers extend this class to implement
+    `publish` with a shared message bus (e.g. Redis pub/sub), listening on it
+    once per worker and calling `fan_out` for every message received.
+    """
+
+    def __init__(self):
+        self.channels = {}
+        self.lock = threading.Lock()
+
+    def publish(self, channel: str, message: dict):
+        raise NotImplementedError
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel)
+        with self.lock:
+            self.channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            subscriptions = self.channels.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.channels.pop(subscription.channel, None)
+
+    def fan_out(self, channel: str, message: dict):
+        with self.lock:
+            subscriptions = tuple(self.channels.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+
+class InMemoryBroker(BaseBroker):
+    """
+    Broker delivering messages to subscriptions within this process only,
+    suitable for a single worker and for tests.
+    """
+
+    def publish(self, channel: str, message: dict):
+        self.fan_out(channel, message)
+
+
+@lru_cache(maxsize=None)
+def get_broker() -> BaseBroker:
+    """
+    Get the broker configured by the `BID_STREAM_BROKER` setting.
+    """
+    return import_string(settings.BID_STREAM_BROKER)()
+
+
+def get_channel(auction_id: int) -> str:
+    return f"auction:{auction_id}"
+
+
+def publish_bid(bid: Bid, is_highest: bool):
+    """
+    Publish a bid to the clients following its auction once the transaction
+    recording it is committed, so rolled back bids are never streamed.
+    """
+    data = {
+        "public_id": str(bid.public_id),
+        "user": str(bid.user.public_id),
+        "price": str(bid.price.amount),
+        "price_currency": bid.price.currency.code,
+        "created_at": bid.created_at.isoformat(),
+    }
+    messages = [{"event": "bid", "data": data}]
+    if is_highest:
+        messages.append({
+            "event": "highest_bid",
+            "data": {
+                "public_id": data["public_id"],
+                "price": data["price"],
+                "price_currency": data["price_currency"],
+            },
+        })
+    channel = get_channel(bid.auction_id)
+    for message in messages:
+        transaction.on_commit(partial(get_broker().publish, channel, message))
+
+
+class BidStreamApplication:
+    """
+    ASGI application streaming the bids placed for a lot as Server-Sent
+    Events, as soon as they are committed.
+
+    Requests are authenticated with the same OAuth 2.0 bearer tokens as the
+    REST API. A comment is sent every `BID_STREAM_KEEPALIVE` seconds to keep
+    idle connections open.
+    """
+
+    async def __call__(self, scope, receive, send):
+        match = BID_STREAM_PATH.match(scope["path"])
+        if scope["method"] != "GET":
+            return await self.send_error(send, 405, "Method not allowed.")
+        if not await self.authenticate(scope):
+            return await self.send_error(
+                send, 401, "Authentication credentials were not provided."
+            )
+        auction_id = await self.get_auction_id(match["lot_public_id"])
+        if auction_id is None:
+            return await self.send_error(send, 404, "Not found.")
+
+        subscription = get_broker().subscribe(get_channel(auction_id))
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                ],
+            })
+            await self.stream(subscription, receive, send)
+        finally:
+            subscription.close()
+
+    async def stream(self, subscription: Subscription, receive, send):
+        disconnected = asyncio.ensure_future(self.wait_disconnect(receive))
+        try:
+            while True:
+                message = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait(
+                    {disconnected, message},
+                    timeout=settings.BID_STREAM_KEEPALIVE,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnected in done:
+                    message.cancel()
+                    return
+                if message in done:
+                    body = self.encode_event(message.result())
+                else:
+                    message.cancel()
+                    body = b": keep-alive\n\n"
+                await send({
+                    "type": "http.response.body",
+                    "body": body,
+                    "more_body": True,
+                })
+        finally:
+            disconnected.cancel()
+
+    @staticmethod
+    async def wait_disconnect(receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    @staticmethod
+    def encode_event(message: dict) -> bytes:
+        data = json.dumps(message["data"], separators=(",", ":"))
+        return f"event: {message['event']}\ndata: {data}\n\n".encode("utf-8")
+
+    @staticmethod
+    async def send_error(send, status: int, detail: str):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": json.dumps({"detail": detail}).encode("utf-8"),
+        })
+
+    @staticmethod
+    @database_sync_to_async
+    def authenticate(scope) -> bool:
+        headers = dict(scope.get("headers", []))
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        scheme, _, token = authorization.partition(" ")
+        if scheme != settings.OAUTH2_AUTHORIZATION_SCHEME or not token:
+            return False
+        access_token = AccessToken.objects.filter(token=token).first()
+        return access_token is not None and access_token.is_valid()
+
+    @staticmethod
+    @database_sync_to_async
+    def get_auction_id(lot_public_id: str) -> Optional[int]:
+        return Lot.objects.filter(
+            public_id=lot_public_id
+        ).values_list("auction_id", flat=True).first()
@@ -0,0 +1,92 @@
+# Django
+from django.conf import settings
+from django.test import Client, TestCase
+
+# Third-party
+from rest_framework.renderers import JSONRenderer
+
+# Local
+from account.tests.factories import UserProfileFactory
+from auction.benchmark import (
+    benchmark_bid_throttles,
+    get_access_token,
+    get_scenarios,
+    seed_data,
+)
+from auction.models import Auction, Bid, Lot
+from common.benchmark import BenchmarkRunner, get_percentile
+from common.renderers import FastJSONRenderer
+
+
+class TestSeedData(TestCase):
+
+    def test_seeded_auctions_record_their_bidding_state(self):
+        seed_data(lots=5, bids_per_lot=3, users=4, chunk_size=2)
+        self.assertEqual(Lot.objects.count(), 5)
+        self.assertEqual(Bid.objects.count(), 15)
+        for auction in Auction.objects.all():
+            bids = Bid.objects.filter(auction=auction).order_by("price")
+            self.assertEqual(auction.bid_count, 3)
+            self.assertEqual(auction.winning_bid, bids.last())
+            self.assertEqual(auction.highest_bid_price, bids.last().price)
+            self.assertFalse(bids.filter(user=auction.user).exists())
+
+
+class TestBenchmarkRunner(TestCase):
+
+    def test_percentiles_are_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(get_percentile(values, 50), 50)
+        self.assertEqual(get_percentile(values, 99), 99)
+        self.assertEqual(get_percentile([3.0], 95), 3.0)
+        self.assertEqual(get_percentile([], 95), 0.0)
+
+    def test_every_scenario_is_requested_without_errors(self):
+        seed_data(lots=5, bids_per_lot=2, users=3, active_ratio=1)
+        user = UserProfileFactory()
+        authorization = (
+            f"{settings.OAUTH2_AUTHORIZATION_SCHEME} {get_access_token(user)}"
+        )
+        runner = BenchmarkRunner(
+            Client(SERVER_NAME="localhost"), iterations=2, warmup=1
+        )
+        results = runner.run_all(get_scenarios(authorization, user))
+        self.assertIn("bid_create", results)
+        # Every active lot is exported, with a row per line
+        self.assertEqual(results["lot_export"]["rows_per_request"], 5)
+        self.assertNotIn("rows_per_request", results["lot_list"])
+        for name, result in results.items():
+            self.assertEqual(result["errors"], 0, name)
+            self.assertEqual(result["requests"], 2, name)
+            self.assertIn("queries_per_request", result, name)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"], name)
+
+    def test_renderers_are_compared_on_the_same_response(self):
+        seed_data(lots=5, bids_per_lot=2, users=3, active_ratio=1)
+        user = UserProfileFactory()
+        authorization = (
+            f"{settings.OAUTH2_AUTHORIZATION_SCHEME} {get_access_token(user)}"
+        )
+        runner = BenchmarkRunner(
+            Client(SERVER_NAME="localhost"), iterations=2, warmup=1
+        )
+        scenarios = {
+            scenario.name: scenario
+            for scenario in get_scenarios(authorization, user)
+        }
+        results = runner.compare_renderers(
+            scenarios["lot_list"], JSONRenderer(), FastJSONRenderer()
+        )
+        self.assertEqual(
+            set(results), {"baseline_us", "candidate_us", "speedup"}
+        )
+
+
+class TestBenchmarkBidThrottles(TestCase):
+
+    def test_overhead_per_request_is_reported(self):
+        results = benchmark_bid_throttles(iterations=100, slots=64)
+        self.assertEqual(
+            set(results), {"us_per_request", "requests_per_second"}
+        )
+        self.assertGreater(results["requests_per_second"], 0)
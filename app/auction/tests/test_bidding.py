@@ -0,0 +1,273 @@
+# Python standard
+import random
+import threading
+from concurrent.futures import Future
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+# Django
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+# Third-party
+from djmoney.money import Money
+
+# Local
+from account.tests.factories import UserProfileFactory
+from auction.api.v1.tests.factories import AuctionFactory
+from auction.bidding import (
+    BidOutcomeUnknown,
+    BidRejected,
+    BidWriter,
+    place_bid,
+    submit_bid,
+)
+from auction.currency import get_exchange_rates
+from auction.models import Bid, ExchangeRate
+
+
+class TestPlaceBid(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.auction = AuctionFactory(base_price="10.00")
+        self.user = UserProfileFactory()
+
+    def test_first_bid_at_base_price_is_accepted(self):
+        bid = place_bid(self.auction, self.user, Decimal("10.00"))
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.highest_bid, bid)
+        self.assertEqual(bid.price.currency.code, "GBP")
+
+    def test_first_bid_below_base_price_is_rejected(self):
+        with self.assertRaisesMessage(
+            BidRejected,
+            "Bid of 9.99 must be at least the base price of 10.00."
+        ):
+            place_bid(self.auction, self.user, Decimal("9.99"))
+        self.assertFalse(Bid.objects.exists())
+
+    def test_bid_not_higher_than_highest_bid_is_rejected(self):
+        place_bid(self.auction, self.user, Decimal("15.00"))
+        with self.assertRaisesMessage(
+            BidRejected,
+            "Bid of 15.00 must be higher than the current highest bid of "
+            "15.00."
+        ):
+            place_bid(self.auction, UserProfileFactory(), Decimal("15.00"))
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.bid_count, 1)
+
+    def test_bid_for_expired_auction_is_rejected(self):
+        self.auction.expires_at = timezone.now() - timedelta(seconds=1)
+        self.auction.save()
+        with self.assertRaisesMessage(
+            BidRejected,
+            "Cannot bid on an item whose auction has expired."
+        ):
+            place_bid(self.auction, self.user, Decimal("20.00"))
+
+    def test_auction_owner_cannot_bid(self):
+        with self.assertRaisesMessage(
+            BidRejected, "Cannot bid on your own lot."
+        ):
+            place_bid(self.auction, self.auction.user, Decimal("20.00"))
+
+    def test_bids_in_other_currencies_are_compared_converted(self):
+        get_exchange_rates().invalidate()
+        self.addCleanup(get_exchange_rates().invalidate)
+        ExchangeRate.objects.create(currency="EUR", rate=Decimal("0.87"))
+        euro_bid = place_bid(self.auction, self.user, Money("20.00", "EUR"))
+        # 20.00 EUR are worth 17.40 GBP
+        with self.assertRaises(BidRejected):
+            place_bid(self.auction, UserProfileFactory(), Decimal("17.40"))
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.highest_bid, euro_bid)
+        pound_bid = place_bid(
+            self.auction, UserProfileFactory(), Decimal("17.41")
+        )
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.highest_bid, pound_bid)
+
+    def test_bids_in_currencies_without_exchange_rate_are_rejected(self):
+        with self.assertRaisesMessage(
+            BidRejected, "No exchange rate is known for JPY."
+        ):
+            place_bid(self.auction, self.user, Money("2000", "JPY"))
+        self.assertFalse(Bid.objects.exists())
+
+    def test_bids_on_auctions_priced_without_exchange_rate_are_rejected(self):
+        auction = AuctionFactory(base_price=Money("1000", "CHF"))
+        self.assertIsNone(auction.normalized_base_price)
+        with self.assertRaisesMessage(
+            BidRejected,
+            "Cannot bid on this lot until an exchange rate is known for CHF.",
+        ):
+            place_bid(auction, self.user, Money("5000.00", "GBP"))
+        self.assertFalse(Bid.objects.exists())
+
+
+class TestPlaceBidConcurrently(TransactionTestCase):
+    """
+    Stress test bid placement with many threads bidding for the same auction
+    at the same time, each on its own database connection.
+    """
+    bidders = 200
+    bids_per_bidder = 5
+
+    def test_concurrent_bids_are_never_lost_nor_out_of_order(self):
+        auction = AuctionFactory(base_price="1.00")
+        users = [UserProfileFactory() for _ in range(self.bidders)]
+        accepted, rejected = [], []
+        results_lock = threading.Lock()
+        start = threading.Barrier(self.bidders)
+
+        def bid(user):
+            start.wait()
+            try:
+                for _ in range(self.bids_per_bidder):
+                    price = Decimal(random.randint(100, 100000)) / 100
+                    try:
+                        placed = place_bid(auction, user, price)
+                    except BidRejected:
+                        with results_lock:
+                            rejected.append(price)
+                    else:
+                        with results_lock:
+                            accepted.append(placed.pk)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=bid, args=(user,)) for user in users
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = self.bidders * self.bids_per_bidder
+        self.assertEqual(len(accepted) + len(rejected), total)
+        # Every accepted bid was recorded, and in the order they committed
+        # each one was strictly higher than the previous.
+        bids = list(Bid.objects.filter(auction=auction).order_by("pk"))
+        self.assertEqual(sorted(accepted), [bid.pk for bid in bids])
+        prices = [bid.price.amount for bid in bids]
+        self.assertEqual(prices, sorted(set(prices)))
+        auction.refresh_from_db()
+        self.assertEqual(auction.bid_count, len(bids))
+        self.assertEqual(auction.highest_bid, bids[-1])
+
+
+class TestBidWriterConcurrently(TransactionTestCase):
+    """
+    Stress test placing bids through the group committing bid writer, with
+    many threads bidding for the same auctions at the same time.
+    """
+    bidders = 200
+    bids_per_bidder = 5
+
+    def setUp(self):
+        super().setUp()
+        self.batch_sizes = []
+        self.writer = BidWriter(max_batch_size=50)
+        write = self.writer.write
+
+        def record_batch_size(batch):
+            self.batch_sizes.append(len(batch))
+            write(batch)
+        self.writer.write = record_batch_size
+
+    def tearDown(self):
+        self.writer.stop()
+        super().tearDown()
+
+    def test_concurrent_bids_are_group_committed_in_order(self):
+        auctions = [AuctionFactory(base_price="1.00") for _ in range(2)]
+        users = [UserProfileFactory() for _ in range(self.bidders)]
+        accepted, rejected, errors = [], [], []
+        results_lock = threading.Lock()
+        start = threading.Barrier(self.bidders)
+
+        def bid(user):
+            start.wait()
+            try:
+                for _ in range(self.bids_per_bidder):
+                    price = Decimal(random.randint(100, 100000)) / 100
+                    auction = random.choice(auctions)
+                    try:
+                        placed = self.writer.submit(auction, user, price)
+                    except BidRejected:
+                        with results_lock:
+                            rejected.append(price)
+                    except Exception as error:
+                        with results_lock:
+                            errors.append(error)
+                    else:
+                        with results_lock:
+                            accepted.append(placed.pk)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=bid, args=(user,)) for user in users
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        total = self.bidders * self.bids_per_bidder
+        self.assertEqual(len(accepted) + len(rejected), total)
+        self.assertEqual(sum(self.batch_sizes), total)
+        # Bids pending together were committed in the same transaction
+        self.assertLess(len(self.batch_sizes), total)
+        self.assertLessEqual(max(self.batch_sizes), 50)
+        bids = Bid.objects.order_by("pk")
+        self.assertEqual(sorted(accepted), [bid.pk for bid in bids])
+        for auction in auctions:
+            auction_bids = list(bids.filter(auction=auction))
+            prices = [bid.price.amount for bid in auction_bids]
+            self.assertEqual(prices, sorted(set(prices)))
+            auction.refresh_from_db()
+            self.assertEqual(auction.bid_count, len(auction_bids))
+            if auction_bids:
+                self.assertEqual(auction.highest_bid, auction_bids[-1])
+
+    def test_rejected_bids_do_not_affect_others_committed_with_them(self):
+        auction = AuctionFactory(base_price="10.00")
+        user = UserProfileFactory()
+        with self.assertRaisesMessage(
+            BidRejected,
+            "Bid of 5.00 must be at least the base price of 10.00."
+        ):
+            self.writer.submit(auction, user, Decimal("5.00"))
+        bid = self.writer.submit(auction, user, Decimal("12.00"))
+        self.assertEqual(Bid.objects.get().pk, bid.pk)
+
+
+class TestSubmitBid(TestCase):
+
+    def test_bids_are_placed_straight_away_without_group_commit(self):
+        auction = AuctionFactory(base_price="10.00")
+        with self.settings(BID_GROUP_COMMIT=False):
+            bid = submit_bid(auction, UserProfileFactory(), Decimal("10.00"))
+        self.assertEqual(Bid.objects.get(), bid)
+
+    def test_bids_not_committed_in_time_have_an_unknown_outcome(self):
+        auction = AuctionFactory(base_price="10.00")
+        pending = Future()
+        with self.settings(
+            BID_GROUP_COMMIT=True, BID_GROUP_COMMIT_TIMEOUT=0.01
+        ), mock.patch.object(BidWriter, "enqueue", return_value=pending):
+            with self.assertRaises(BidOutcomeUnknown) as raised, \
+                    self.assertLogs("auction.bidding", "WARNING") as logs:
+                submit_bid(auction, UserProfileFactory(), Decimal("10.00"))
+        self.assertIs(raised.exception.pending, pending)
+        self.assertEqual(
+            logs.records[0].getMessage(),
+            f"Bid for auction {auction.pk} not committed within 0.01 seconds",
+        )
@@ -0,0 +1,156 @@
+# Python standard
+import io
+from decimal import Decimal
+
+# Django
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+# Third-party
+from djmoney.money import Money
+
+# Local
+from account.tests.factories import UserProfileFactory
+from auction.api.v1.serializers import LotDetailSerializer
+from auction.api.v1.tests.factories import (
+    AuctionFactory,
+    BidFactory,
+    LotFactory,
+)
+from auction.bidding import place_bid
+from auction.currency import (
+    ExchangeRateMissing,
+    get_exchange_rates,
+    update_exchange_rates,
+)
+from auction.models import Auction, Bid, ExchangeRate
+
+
+class ExchangeRatesTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.exchange_rates = get_exchange_rates()
+        self.exchange_rates.invalidate()
+        self.addCleanup(self.exchange_rates.invalidate)
+        ExchangeRate.objects.create(currency="EUR", rate=Decimal("0.87"))
+
+
+class TestExchangeRates(ExchangeRatesTestCase):
+
+    def test_amounts_are_converted_into_the_default_currency(self):
+        self.assertEqual(
+            self.exchange_rates.normalize(Money("10.00", "EUR")),
+            Decimal("8.7000"),
+        )
+        self.assertEqual(
+            self.exchange_rates.normalize(Decimal("10.00"), "GBP"),
+            Decimal("10.0000"),
+        )
+
+    def test_rates_are_cached_until_they_change(self):
+        self.exchange_rates.normalize(Money("10.00", "EUR"))
+        with self.assertNumQueries(0):
+            self.exchange_rates.normalize(Money("20.00", "EUR"))
+        ExchangeRate.objects.filter(currency="EUR").get().delete()
+        with self.assertRaisesMessage(
+            ExchangeRateMissing, "No exchange rate is known for EUR."
+        ):
+            self.exchange_rates.normalize(Money("10.00", "EUR"))
+
+    def test_prices_are_converted_as_auctions_and_bids_are_saved(self):
+        auction = AuctionFactory(base_price=Money("10.00", "EUR"))
+        bid = BidFactory(auction=auction, price=Money("20.00", "EUR"))
+        self.assertEqual(auction.normalized_base_price, Decimal("8.7000"))
+        self.assertEqual(bid.normalized_price, Decimal("17.4000"))
+        # Prices in currencies without a rate cannot be converted
+        auction = AuctionFactory(base_price=Money("10.00", "USD"))
+        self.assertIsNone(auction.normalized_base_price)
+
+    def test_prices_are_converted_as_lots_are_updated(self):
+        lot = LotFactory(auction__base_price=Money("10.00", "GBP"))
+        serializer = LotDetailSerializer(
+            lot,
+            data={"base_price": "20.00", "base_price_currency": "EUR"},
+            partial=True,
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        lot.auction.refresh_from_db()
+        self.assertEqual(lot.auction.base_price, Money("20.00", "EUR"))
+        self.assertEqual(lot.auction.normalized_base_price, Decimal("17.4"))
+
+
+class TestUpdateExchangeRates(ExchangeRatesTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.auction = AuctionFactory(base_price=Money("10.00", "GBP"))
+        self.euro_bid = place_bid(
+            self.auction, UserProfileFactory(), Money("20.00", "EUR")
+        )
+        self.pound_bid = place_bid(
+            self.auction, UserProfileFactory(), Money("18.00", "GBP")
+        )
+
+    def test_prices_are_converted_again_at_new_rates(self):
+        update_exchange_rates({"EUR": Decimal("0.80")})
+        self.euro_bid.refresh_from_db()
+        self.assertEqual(self.euro_bid.normalized_price, Decimal("16.0000"))
+        self.assertEqual(
+            self.exchange_rates.normalize(Money("10.00", "EUR")),
+            Decimal("8.0000"),
+        )
+
+    def test_prices_are_converted_again_as_they_are_normalized(self):
+        # Exactly halfway between two places: rounded to the even one, as
+        # Decimal does, where SQLite's ROUND of floats rounds up
+        auction = AuctionFactory(base_price=Money("1.00", "EUR"))
+        update_exchange_rates({"EUR": Decimal("0.12345")})
+        auction.refresh_from_db()
+        self.assertEqual(auction.normalized_base_price, Decimal("0.1234"))
+        self.assertEqual(
+            self.exchange_rates.normalize(Money("1.00", "EUR")),
+            auction.normalized_base_price,
+        )
+
+    def test_highest_bids_of_open_auctions_are_found_again(self):
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.highest_bid, self.pound_bid)
+        update_exchange_rates({"EUR": Decimal("0.95")})
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.highest_bid, self.euro_bid)
+        self.assertEqual(self.auction.highest_bid_price, Money("20.00", "EUR"))
+        self.assertEqual(
+            self.auction.normalized_highest_bid_price, Decimal("19.0000")
+        )
+
+    def test_closed_auctions_keep_their_winning_bid(self):
+        Auction.objects.filter(pk=self.auction.pk).update(
+            status=Auction.CLOSED
+        )
+        update_exchange_rates({"EUR": Decimal("0.95")})
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.highest_bid, self.pound_bid)
+
+    @override_settings(EXCHANGE_RATES={"EUR": "0.90", "USD": "0.75"})
+    def test_command_stores_the_configured_rates(self):
+        stdout = io.StringIO()
+        call_command("update_exchange_rates", stdout=stdout)
+        self.assertEqual(
+            dict(ExchangeRate.objects.values_list("currency", "rate")),
+            {"EUR": Decimal("0.90"), "USD": Decimal("0.75")},
+        )
+        self.assertIn("Updated 2 exchange rates.", stdout.getvalue())
+        self.assertEqual(
+            Bid.objects.get(pk=self.euro_bid.pk).normalized_price,
+            Decimal("18.0000"),
+        )
+
+    def test_command_rejects_invalid_rates(self):
+        for rate in ("EUR", "XYZ=1.0", "EUR=abc", "EUR=0", "GBP=1.0"):
+            with self.assertRaises(CommandError):
+                call_command("update_exchange_rates", rate=[rate])
+        self.assertEqual(
+            ExchangeRate.objects.get(currency="EUR").rate, Decimal("0.87")
+        )
@@ -0,0 +1,116 @@
+# Python standard
+import json
+from decimal import Decimal
+
+# Django
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# Third-party
+from djmoney.money import Money
+
+# Local
+from account.models import UserProfile
+from account.tests.factories import UserProfileFactory
+from auction.api.v1.tests.factories import AuctionFactory, BidFactory
+from auction.bidding import place_bid
+from auction.currency import get_exchange_rates, update_exchange_rates
+from auction.leaderboard import Leaderboard
+from auction.models import Auction, ExchangeRate
+
+
+def entry(name: str, price: str) -> dict:
+    return {"public_id": name, "normalized_price": price}
+
+
+class TestLeaderboard(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.leaderboard = Leaderboard(3)
+
+    def get_ranking(self, auction: Auction) -> list:
+        auction.refresh_from_db()
+        return [bid["public_id"] for bid in json.loads(auction.top_bids)]
+
+    def test_entries_are_inserted_in_their_position(self):
+        entries = [entry("a", "30.00"), entry("b", "20.00")]
+        self.assertEqual(
+            self.leaderboard.insert(entries, entry("c", "25.00")),
+            [entry("a", "30.00"), entry("c", "25.00"), entry("b", "20.00")],
+        )
+
+    def test_ties_are_ranked_by_which_was_placed_first(self):
+        entries = [entry("a", "30.00"), entry("b", "20.00")]
+        self.assertEqual(
+            [e["public_id"] for e in self.leaderboard.insert(
+                entries, entry("c", "30.00")
+            )],
+            ["a", "c", "b"],
+        )
+
+    def test_only_the_highest_entries_are_kept(self):
+        entries = [entry("a", "30.00"), entry("b", "20.00"), entry("c", "10")]
+        self.assertIsNone(self.leaderboard.insert(entries, entry("d", "5")))
+        self.assertEqual(
+            [e["public_id"] for e in self.leaderboard.insert(
+                entries, entry("e", "40.00")
+            )],
+            ["e", "a", "b"],
+        )
+
+    def test_bids_are_ranked_as_they_are_placed(self):
+        auction = AuctionFactory(base_price="10.00")
+        bids = [
+            place_bid(auction, UserProfileFactory(), Decimal(price))
+            for price in ("10.00", "11.00", "12.00", "13.00")
+        ]
+        self.assertEqual(
+            self.get_ranking(auction),
+            [str(bid.public_id) for bid in reversed(bids)],
+        )
+
+    def test_prices_are_recorded_with_the_places_of_bid_prices(self):
+        auction = AuctionFactory(base_price="10.00")
+        place_bid(auction, UserProfileFactory(), Decimal("12"))
+        auction.refresh_from_db()
+        self.assertEqual(json.loads(auction.top_bids)[0]["price"], "12.00")
+
+    def test_bidders_are_not_loaded_with_the_auction_locked(self):
+        auction = AuctionFactory(base_price="10.00")
+        user = UserProfile.objects.get(pk=UserProfileFactory().pk)
+        with CaptureQueriesContext(connection) as queries:
+            place_bid(auction, user, Decimal("12.00"))
+        statements = [query["sql"] for query in queries]
+        locked = next(
+            index for index, sql in enumerate(statements)
+            if sql.startswith('UPDATE "auction_auction"')
+        )
+        self.assertFalse([
+            sql for sql in statements[locked:]
+            if 'FROM "auth_user"' in sql
+            or 'FROM "account_userprofile"' in sql
+        ])
+        auction.refresh_from_db()
+        self.assertEqual(
+            json.loads(auction.top_bids)[0]["username"],
+            user.auth_user.username,
+        )
+
+    def test_bids_are_ranked_again_at_new_exchange_rates(self):
+        get_exchange_rates().invalidate()
+        self.addCleanup(get_exchange_rates().invalidate)
+        ExchangeRate.objects.create(currency="EUR", rate=Decimal("0.87"))
+        auction = AuctionFactory(base_price="10.00")
+        euro_bid = BidFactory(auction=auction, price=Money("20.00", "EUR"))
+        pound_bid = BidFactory(auction=auction, price="18.00")
+        self.assertEqual(
+            self.get_ranking(auction),
+            [str(pound_bid.public_id), str(euro_bid.public_id)],
+        )
+        update_exchange_rates({"EUR": Decimal("0.95")})
+        self.assertEqual(
+            self.get_ranking(auction),
+            [str(euro_bid.public_id), str(pound_bid.public_id)],
+        )
@@ -0,0 +1,55 @@
+# Django
+from django.test import TestCase
+
+# Local
+from auction.api.v1.tests.factories import AuctionFactory, BidFactory
+from auction.models import Auction, Lot
+
+
+class TestAuctionHighestBid(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.auction = AuctionFactory(base_price="10.00")
+
+    def test_auction_without_bids_has_no_highest_bid(self):
+        self.assertIsNone(self.auction.highest_bid)
+        self.assertIsNone(self.auction.highest_bid_price)
+        self.assertEqual(self.auction.bid_count, 0)
+
+    def test_higher_bid_becomes_highest_bid(self):
+        BidFactory(auction=self.auction, price="12.00")
+        bid = BidFactory(auction=self.auction, price="15.50")
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.highest_bid, bid)
+        self.assertEqual(str(self.auction.highest_bid_price.amount), "15.50")
+        self.assertEqual(self.auction.bid_count, 2)
+
+    def test_lower_or_equal_bid_does_not_replace_highest_bid(self):
+        bid = BidFactory(auction=self.auction, price="15.50")
+        BidFactory(auction=self.auction, price="15.50")
+        BidFactory(auction=self.auction, price="11.00")
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.highest_bid, bid)
+        self.assertEqual(self.auction.bid_count, 3)
+
+    def test_reading_highest_bid_does_not_query_bids(self):
+        for price in ("11.00", "12.00", "13.00"):
+            bid = BidFactory(auction=self.auction, price=price)
+        auction = Auction.objects.select_related("winning_bid").get(
+            pk=self.auction.pk
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(auction.highest_bid, bid)
+            self.assertEqual(auction.bid_count, 3)
+
+
+class TestLotHighestBid(TestCase):
+
+    def test_lot_reads_highest_bid_from_its_auction(self):
+        auction = AuctionFactory()
+        Lot.objects.create(name="Music box", auction=auction)
+        bid = BidFactory(auction=auction, price="20.00")
+        lot = Lot.objects.select_related("auction__winning_bid").get()
+        with self.assertNumQueries(0):
+            self.assertEqual(lot.highest_bid, bid)
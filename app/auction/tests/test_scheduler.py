@@ -0,0 +1,124 @@
+# Python standard
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+# Django
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from freezegun import freeze_time
+
+# Local
+from account.tests.factories import UserProfileFactory
+from auction.api.v1.tests.factories import AuctionFactory, BidFactory
+from auction.bidding import BidRejected, place_bid
+from auction.models import Auction
+from auction.scheduler import AuctionScheduler, settle_auctions
+from auction.streaming import InMemoryBroker, get_channel
+
+
+@freeze_time("2020-04-18 04:35:01")
+class TestAuctionScheduler(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+
+    def create_auction(self, expires_in: int) -> Auction:
+        return AuctionFactory(
+            expires_at=self.now + timedelta(seconds=expires_in)
+        )
+
+    def test_expired_auctions_are_settled_with_their_winning_bid(self):
+        expired = self.create_auction(expires_in=-10)
+        bid = BidFactory(auction=expired, price="5000.00")
+        open_auction = self.create_auction(expires_in=10)
+
+        settled = AuctionScheduler().run_pending()
+
+        self.assertEqual(settled, 1)
+        expired.refresh_from_db()
+        self.assertEqual(expired.status, Auction.CLOSED)
+        self.assertEqual(expired.settled_at, self.now)
+        self.assertEqual(expired.winning_bid, bid)
+        self.assertFalse(expired.is_active)
+        open_auction.refresh_from_db()
+        self.assertEqual(open_auction.status, Auction.OPEN)
+        self.assertIsNone(open_auction.settled_at)
+
+    def test_expired_auctions_are_settled_in_batches(self):
+        for _ in range(5):
+            self.create_auction(expires_in=-10)
+        scheduler = AuctionScheduler(batch_size=2)
+        scheduler.refresh(self.now)
+        # Each batch is updated and read back within its own savepoint
+        with self.assertNumQueries(3 * 4):
+            self.assertEqual(scheduler.run_pending(), 5)
+        self.assertFalse(Auction.objects.filter(status=Auction.OPEN).exists())
+
+    @mock.patch.object(InMemoryBroker, "publish")
+    def test_auctions_settled_by_another_scheduler_are_left_alone(
+        self, publish
+    ):
+        expired = self.create_auction(expires_in=-10)
+        settled_elsewhere = self.create_auction(expires_in=-10)
+        settled_at = self.now - timedelta(seconds=5)
+        Auction.objects.filter(pk=settled_elsewhere.pk).update(
+            status=Auction.CLOSED, settled_at=settled_at
+        )
+
+        settled = settle_auctions([expired.pk, settled_elsewhere.pk], self.now)
+
+        self.assertEqual(settled, [expired.pk])
+        settled_elsewhere.refresh_from_db()
+        self.assertEqual(settled_elsewhere.settled_at, settled_at)
+        self.assertEqual(
+            publish.call_args_list,
+            [mock.call(get_channel(expired.pk), {
+                "event": "closed",
+                "data": {"settled_at": self.now.isoformat()},
+            })]
+        )
+
+    def test_auctions_are_settled_once_their_deadline_is_reached(self):
+        auction = self.create_auction(expires_in=30)
+        scheduler = AuctionScheduler(refresh_interval=60)
+        self.assertEqual(scheduler.run_pending(), 0)
+        # Sleep until the auction's deadline, rather than the next refresh
+        self.assertEqual(scheduler.get_timeout(), 30)
+        with freeze_time(self.now + timedelta(seconds=30)):
+            self.assertEqual(scheduler.run_pending(), 1)
+        auction.refresh_from_db()
+        self.assertEqual(auction.status, Auction.CLOSED)
+
+    def test_extended_auctions_are_not_settled_early(self):
+        auction = self.create_auction(expires_in=30)
+        scheduler = AuctionScheduler()
+        scheduler.refresh(self.now)
+        Auction.objects.filter(pk=auction.pk).update(
+            expires_at=self.now + timedelta(seconds=3600)
+        )
+        with freeze_time(self.now + timedelta(seconds=30)):
+            self.assertEqual(scheduler.run_pending(), 0)
+        auction.refresh_from_db()
+        self.assertEqual(auction.status, Auction.OPEN)
+
+    def test_closed_auctions_do_not_accept_bids(self):
+        auction = self.create_auction(expires_in=30)
+        Auction.objects.filter(pk=auction.pk).update(status=Auction.CLOSED)
+        with self.assertRaisesMessage(
+            BidRejected, "Cannot bid on an item whose auction has expired."
+        ):
+            place_bid(auction, UserProfileFactory(), Decimal("5000.00"))
+
+    def test_command_settles_expired_auctions_once(self):
+        self.create_auction(expires_in=-10)
+        self.create_auction(expires_in=10)
+        stdout = StringIO()
+        call_command("close_auctions", "--once", stdout=stdout)
+        self.assertEqual(stdout.getvalue(), "Settled 1 expired auctions.\n")
+        self.assertEqual(
+            Auction.objects.filter(status=Auction.CLOSED).count(), 1
+        )
@@ -0,0 +1,209 @@
+# Python standard
+import asyncio
+import json
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+# Django
+from django.db import connections, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+# Third-party
+from asgiref.sync import async_to_sync
+from oauth2_provider.models import AccessToken
+
+# Local
+from account.tests.factories import AuthUserFactory, UserProfileFactory
+from auction.api.v1.tests.factories import LotFactory
+from auction.bidding import place_bid
+from auction.models import Lot
+from auction.streaming import (
+    BidStreamApplication,
+    InMemoryBroker,
+    database_sync_to_async,
+    get_broker,
+    get_channel,
+)
+
+
+class TestInMemoryBroker(TestCase):
+
+    def test_message_is_fanned_out_to_every_channel_subscription(self):
+        broker = InMemoryBroker()
+
+        async def scenario():
+            subscriptions = [broker.subscribe("lot") for _ in range(3)]
+            other = broker.subscribe("other-lot")
+            # Publish from another thread, as Django views do
+            publisher = threading.Thread(
+                target=broker.publish, args=("lot", {"event": "bid"})
+            )
+            publisher.start()
+            publisher.join()
+            messages = [
+                await asyncio.wait_for(subscription.get(), timeout=1)
+                for subscription in subscriptions
+            ]
+            self.assertTrue(other.queue.empty())
+            return messages
+
+        messages = asyncio.run(scenario())
+        self.assertEqual(messages, [{"event": "bid"}] * 3)
+
+    def test_closed_subscriptions_are_removed(self):
+        broker = InMemoryBroker()
+
+        async def scenario():
+            subscription = broker.subscribe("lot")
+            subscription.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(broker.channels, {})
+
+
+class TestPublishBid(TransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory(auction__base_price="10.00")
+        self.user = UserProfileFactory()
+
+    @mock.patch.object(InMemoryBroker, "publish")
+    def test_committed_bid_is_published(self, publish):
+        bid = place_bid(self.lot.auction, self.user, Decimal("12.00"))
+        channel = get_channel(self.lot.auction_id)
+        self.assertEqual(
+            publish.call_args_list,
+            [
+                mock.call(channel, {
+                    "event": "bid",
+                    "data": {
+                        "public_id": str(bid.public_id),
+                        "user": str(self.user.public_id),
+                        "price": "12.00",
+                        "price_currency": "GBP",
+                        "created_at": bid.created_at.isoformat(),
+                    },
+                }),
+                mock.call(channel, {
+                    "event": "highest_bid",
+                    "data": {
+                        "public_id": str(bid.public_id),
+                        "price": "12.00",
+                        "price_currency": "GBP",
+                    },
+                }),
+            ]
+        )
+
+    @mock.patch.object(InMemoryBroker, "publish")
+    def test_rolled_back_bid_is_not_published(self, publish):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            place_bid(self.lot.auction, self.user, Decimal("12.00"))
+            raise RuntimeError
+        publish.assert_not_called()
+
+
+class TestDatabaseSyncToAsync(TransactionTestCase):
+
+    def test_connections_are_closed_after_every_call(self):
+        lot = LotFactory()
+        thread_connections = []
+
+        @database_sync_to_async
+        def get_auction_id():
+            thread_connections.append(connections["default"])
+            return Lot.objects.values_list(
+                "auction_id", flat=True
+            ).get()
+
+        async def scenario():
+            return [await get_auction_id() for _ in range(2)]
+
+        self.assertEqual(asyncio.run(scenario()), [lot.auction_id] * 2)
+        # Run in a thread other than the test's, whose connection is closed
+        self.assertIsNot(thread_connections[0], connections["default"])
+        for thread_connection in thread_connections:
+            self.assertIsNone(thread_connection.connection)
+
+
+class TestBidStreamApplication(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory()
+        self.access_token = AccessToken.objects.create(
+            user=AuthUserFactory(),
+            scope="read write",
+            expires=timezone.now() + timedelta(seconds=300),
+            token="secret-access-token-key",
+        )
+
+    def get_scope(self, lot_public_id, token="secret-access-token-key"):
+        return {
+            "type": "http",
+            "method": "GET",
+            "path": f"/api/auction/v1/lots/{lot_public_id}/stream",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+
+    def stream(self, scope, publish: list = ()) -> list:
+        """
+        Stream from the application, publishing the given messages once it
+        has responded, until it has sent them all.
+        """
+        sent = []
+
+        async def scenario():
+            disconnect = asyncio.Event()
+
+            async def receive():
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                sent.append(message)
+                if message["type"] == "http.response.start":
+                    channel = get_channel(self.lot.auction_id)
+                    for published in publish:
+                        get_broker().publish(channel, published)
+                if len(sent) > len(publish):
+                    disconnect.set()
+
+            await asyncio.wait_for(
+                BidStreamApplication()(scope, receive, send), timeout=5
+            )
+
+        async_to_sync(scenario)()
+        return sent
+
+    def test_published_bids_are_streamed_as_events(self):
+        sent = self.stream(
+            self.get_scope(self.lot.public_id),
+            publish=[{"event": "bid", "data": {"price": "12.00"}}]
+        )
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), sent[0]["headers"])
+        self.assertEqual(
+            sent[1]["body"], b'event: bid\ndata: {"price":"12.00"}\n\n'
+        )
+        # The subscription is closed once the client disconnects
+        self.assertEqual(get_broker().channels, {})
+
+    def test_unauthenticated_request_returns_401(self):
+        sent = self.stream(self.get_scope(self.lot.public_id, token="wrong"))
+        self.assertEqual(sent[0]["status"], 401)
+        self.assertEqual(
+            json.loads(sent[1]["body"]),
+            {"detail": "Authentication credentials were not provided."}
+        )
+
+    def test_request_for_invalid_lot_returns_404(self):
+        sent = self.stream(
+            self.get_scope("048bee0f-659e-496f-85c4-7683f67b4525")
+        )
+        self.assertEqual(sent[0]["status"], 404)
+        self.assertEqual(json.loads(sent[1]["body"]), {"detail": "Not found."})
@@ -0,0 +1,25 @@
+# Local
+from common.throttling import TokenBucketThrottle
+
+
+class UserBidThrottle(TokenBucketThrottle):
+    """
+    Throttle the bids each user places, on any lot.
+    """
+    scope = "bid_user"
+
+    def get_key(self, request, view):
+        return str(request.user.pk) if request.user.is_authenticated else None
+
+
+class UserLotBidThrottle(TokenBucketThrottle):
+    """
+    Throttle the bids each user places on the same lot, so a client bidding
+    on one lot in a loop is slowed down well before its overall rate.
+    """
+    scope = "bid_user_lot"
+
+    def get_key(self, request, view):
+        if not request.user.is_authenticated:
+            return None
+        return f"{request.user.pk}:{view.kwargs['lot_public_id']}"
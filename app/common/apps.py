@@ -5,3 +5,10 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     name = 'common'
     label = 'common'
+
+    def ready(self):
+        # Load Django signals connection.
+        from . import signals
+        # Refuse to start with caches workers cannot share
+        from .checks import check_shared_caches
+        check_shared_caches()
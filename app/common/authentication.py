@@ -0,0 +1,229 @@
+# Python standard
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
+
+# Django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils import timezone
+
+# Third-party
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
+from oauth2_provider.models import AccessToken, get_application_model
+
+# Local
+from account.models import UserProfile
+from common.metrics import token_lookups
+from common.timing import timed
+
+
+class AccessTokenCache:
+    """
+    Keep the most recently used valid access tokens in this process, with
+    the user they were issued for and the user's profile.
+
+    Entries expire with their token, or after `timeout` seconds at most, so
+    changes to users are eventually seen; the least recently used entry is
+    evicted once `max_entries` are stored.
+
+    Entries store the version of their token they were fetched at, which is
+    bumped in the cache `alias` whenever the token is revoked or modified,
+    by any process: an entry is only used while its version is current, so
+    a revoked token stops authenticating requests in every worker at once,
+    provided the cache is shared (e.g. Redis).
+
+    Entries hold the values of the token, user and profile rather than the
+    instances, which are built again for every request, so changes made to
+    them by one request are never seen by another.
+
+    Usage:
+
+        >>> token_cache = get_access_token_cache()
+        >>> access_token = token_cache.get(token)
+        >>> if access_token is None:
+        >>>     version = token_cache.get_version(token)
+        >>>     access_token = fetch_access_token(token)
+        >>>     token_cache.set(access_token, version)
+
+    """
+
+    def __init__(self, max_entries: int, timeout: int, alias: str):
+        self.max_entries = max_entries
+        self.timeout = timedelta(seconds=timeout)
+        self.cache = caches[alias]
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_version_key(token: str) -> str:
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        return f"access_token:{digest}:version"
+
+    def get_version(self, token: str) -> int:
+        """
+        Get the current version of a token, which must be read before
+        fetching the token to cache at that version.
+        """
+        key = self.get_version_key(token)
+        version = self.cache.get(key)
+        if version is None:
+            # Start from the current time rather than zero, so an evicted
+            # version never repeats the one of an entry still cached.
+            self.cache.add(
+                key, time.time_ns(), timeout=self.timeout.total_seconds()
+            )
+            version = self.cache.get(key)
+        return version
+
+    def bump_version(self, token: str):
+        key = self.get_version_key(token)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(
+                key, time.time_ns(), timeout=self.timeout.total_seconds()
+            )
+
+    def get(self, token: str) -> Optional[AccessToken]:
+        now = timezone.now()
+        with self.lock:
+            entry = self.entries.get(token)
+            if entry is None:
+                return None
+            values, version, expires_at = entry
+            if expires_at <= now:
+                del self.entries[token]
+                return None
+            self.entries.move_to_end(token)
+        if self.cache.get(self.get_version_key(token)) != version:
+            self.delete(token)
+            return None
+        return self.build(values)
+
+    def set(self, access_token: AccessToken, version: int):
+        expires_at = min(
+            access_token.expires, timezone.now() + self.timeout
+        )
+        entry = (self.get_values(access_token), version, expires_at)
+        with self.lock:
+            self.entries[access_token.token] = entry
+            self.entries.move_to_end(access_token.token)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, token: str):
+        with self.lock:
+            self.entries.pop(token, None)
+
+    def invalidate(self, token: str):
+        """
+        Stop authenticating requests with any cached copy of a token, in
+        this process straight away and in others as soon as they use it.
+        """
+        self.delete(token)
+        self.bump_version(token)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    @staticmethod
+    def get_row(instance) -> Optional[tuple]:
+        if instance is None:
+            return None
+        fields = instance._meta.concrete_fields
+        return (
+            instance._state.db,
+            tuple(getattr(instance, field.attname) for field in fields),
+        )
+
+    @staticmethod
+    def from_row(model, row: Optional[tuple]):
+        if row is None:
+            return None
+        db, values = row
+        field_names = [field.attname for field in model._meta.concrete_fields]
+        return model.from_db(db, field_names, values)
+
+    def get_values(self, access_token: AccessToken) -> tuple:
+        user = access_token.user
+        return (
+            self.get_row(access_token),
+            self.get_row(access_token.application),
+            self.get_row(user),
+            self.get_row(getattr(user, "user_profile", None)),
+        )
+
+    def build(self, values: tuple) -> AccessToken:
+        token_row, application_row, user_row, profile_row = values
+        access_token = self.from_row(AccessToken, token_row)
+        access_token.application = self.from_row(
+            get_application_model(), application_row
+        )
+        user = self.from_row(get_user_model(), user_row)
+        if profile_row is not None:
+            user.user_profile = self.from_row(UserProfile, profile_row)
+        access_token.user = user
+        return access_token
+
+
+@lru_cache(maxsize=None)
+def get_access_token_cache() -> AccessTokenCache:
+    """
+    Get the access token cache configured by the `ACCESS_TOKEN_CACHE_*`
+    settings.
+    """
+    return AccessTokenCache(
+        settings.ACCESS_TOKEN_CACHE_MAX_ENTRIES,
+        settings.ACCESS_TOKEN_CACHE_TIMEOUT,
+        settings.ACCESS_TOKEN_CACHE_ALIAS,
+    )
+
+
+class CachedOAuth2Authentication(OAuth2Authentication):
+    """
+    Authenticate requests with OAuth 2.0 bearer tokens, validated once and
+    then kept in the `AccessTokenCache` of this process.
+
+    A token is fetched with its user and the user's profile in one query, so
+    requests with a cached token make no queries to authenticate, nor to read
+    `request.user.user_profile`. Any token which cannot be validated this way
+    is handed over to `OAuth2Authentication`, which reports why it is
+    invalid.
+    """
+
+    @timed("auth")
+    def authenticate(self, request):
+        token = self.get_bearer_token(request)
+        if token is None:
+            return super().authenticate(request)
+
+        token_cache = get_access_token_cache()
+        access_token = token_cache.get(token)
+        if access_token is None:
+            version = token_cache.get_version(token)
+            access_token = AccessToken.objects.select_related(
+                "application", "user__user_profile"
+            ).filter(token=token).first()
+            if access_token is None or not access_token.is_valid():
+                token_lookups.inc(result="invalid")
+                return super().authenticate(request)
+            token_cache.set(access_token, version)
+            token_lookups.inc(result="fetched")
+        else:
+            token_lookups.inc(result="cached")
+        return access_token.user, access_token
+
+    @staticmethod
+    def get_bearer_token(request) -> Optional[str]:
+        authorization = request.META.get("HTTP_AUTHORIZATION", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme != settings.OAUTH2_AUTHORIZATION_SCHEME or not token:
+            return None
+        return token
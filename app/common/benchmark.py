@@ -0,0 +1,159 @@
+# Python standard
+import json
+import math
+import subprocess
+import time
+from collections import namedtuple
+from typing import Callable, List
+
+# Django
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+# A request driven by a benchmark: `make_request(iteration)` returns the HTTP
+# method, path and keyword arguments to send with the test client.
+Scenario = namedtuple("Scenario", ["name", "make_request"])
+
+
+def get_percentile(values: List[float], percentile: float) -> float:
+    """
+    Get the nearest-rank percentile of a list of values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(percentile / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+class BenchmarkRunner:
+    """
+    Drive API requests in-process with Django's test client, measuring their
+    latency and the database queries each one makes.
+
+    Every scenario is requested `warmup` times first, unmeasured, so caches
+    and connections are primed, then `iterations` times. Throughput is the
+    rate of requests served sequentially by a single process.
+
+    Streaming responses are read whole within the measurements, and their
+    throughput is also reported in rows (lines streamed) per second.
+
+    Usage:
+
+        >>> runner = BenchmarkRunner(APIClient(), iterations=1000)
+        >>> results = runner.run(Scenario("lot_list", make_lot_list_request))
+
+    """
+
+    def __init__(self, client, iterations: int = 100, warmup: int = 10):
+        self.client = client
+        self.iterations = iterations
+        self.warmup = warmup
+
+    def run(self, scenario: Scenario) -> dict:
+        for iteration in range(self.warmup):
+            method, path, kwargs = scenario.make_request(iteration)
+            response = getattr(self.client, method)(path, **kwargs)
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        latencies = []
+        queries = 0
+        errors = 0
+        rows = None
+        for iteration in range(self.warmup, self.warmup + self.iterations):
+            # Prepare the request outside of the measurements, as it may
+            # query the data to request.
+            method, path, kwargs = scenario.make_request(iteration)
+            send = getattr(self.client, method)
+            with CaptureQueriesContext(connection) as context:
+                started_at = time.perf_counter()
+                response = send(path, **kwargs)
+                if response.streaming:
+                    content = b"".join(response.streaming_content)
+                latencies.append(time.perf_counter() - started_at)
+            queries += len(context.captured_queries)
+            if response.streaming:
+                rows = (rows or 0) + content.count(b"\n")
+            if response.status_code >= 400:
+                errors += 1
+        elapsed = sum(latencies)
+
+        results = {
+            "requests": self.iterations,
+            "errors": errors,
+            "p50_ms": round(get_percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(get_percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(get_percentile(latencies, 99) * 1000, 3),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+            "queries_per_request": round(queries / self.iterations, 2),
+            "throughput_rps": round(self.iterations / elapsed, 1),
+        }
+        if rows is not None:
+            results["rows_per_request"] = round(rows / self.iterations, 1)
+            results["rows_per_second"] = round(rows / elapsed, 1)
+        return results
+
+    def compare_renderers(
+        self, scenario: Scenario, baseline, candidate
+    ) -> dict:
+        """
+        Time rendering the data of a scenario's response with two renderers,
+        `iterations` times each, reporting the mean time per response.
+        """
+        method, path, kwargs = scenario.make_request(0)
+        data = getattr(self.client, method)(path, **kwargs).data
+        results = {}
+        renderers = (("baseline", baseline), ("candidate", candidate))
+        for name, renderer in renderers:
+            started_at = time.perf_counter()
+            for _ in range(self.iterations):
+                renderer.render(data)
+            elapsed = time.perf_counter() - started_at
+            results[f"{name}_us"] = round(elapsed / self.iterations * 1e6, 1)
+        results["speedup"] = round(
+            results["baseline_us"] / results["candidate_us"], 2
+        )
+        return results
+
+    def run_all(
+        self,
+        scenarios: List[Scenario],
+        report: Callable[[str, dict], None] = None,
+    ) -> dict:
+        results = {}
+        for scenario in scenarios:
+            results[scenario.name] = self.run(scenario)
+            if report:
+                report(scenario.name, results[scenario.name])
+        return results
+
+
+def get_commit() -> str:
+    """
+    Get the commit benchmarked, to compare results between commits.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def write_report(path: str, results: dict, **metadata):
+    report = {
+        "commit": get_commit(),
+        "created_at": timezone.now().isoformat(),
+        **metadata,
+        "scenarios": results,
+    }
+    with open(path, "w") as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
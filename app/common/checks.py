@@ -0,0 +1,39 @@
+# Django
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+# Cache backends keeping their entries in the memory of each process
+PROCESS_CACHE_BACKENDS = {
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+}
+
+# Settings naming caches which must be shared by every worker process
+SHARED_CACHE_SETTINGS = (
+    # Versions of revoked access tokens
+    "ACCESS_TOKEN_CACHE_ALIAS",
+    # Clients pinned to the primary database after writing
+    "READ_YOUR_WRITES_CACHE_ALIAS",
+)
+
+
+def check_shared_caches():
+    """
+    Raise `ImproperlyConfigured` if any cache which must be shared by every
+    worker process is kept in the memory of each, while there is more than
+    one of them (`WEB_CONCURRENCY`).
+    """
+    if settings.WEB_CONCURRENCY <= 1:
+        return
+    for name in SHARED_CACHE_SETTINGS:
+        alias = getattr(settings, name)
+        backend = settings.CACHES[alias]["BACKEND"]
+        if backend in PROCESS_CACHE_BACKENDS:
+            raise ImproperlyConfigured(
+                f"{name} names the cache {alias!r}, kept in the memory of "
+                f"each process by {backend}, but "
+                f"{settings.WEB_CONCURRENCY} worker processes must share it "
+                f"(WEB_CONCURRENCY). Use a shared cache, such as Redis or "
+                f"Memcached."
+            )
@@ -0,0 +1,140 @@
+# Python standard
+import hashlib
+from typing import Optional
+
+# Django
+from django.db.models import Max
+from django.utils.http import (
+    http_date,
+    parse_etags,
+    parse_http_date_safe,
+    quote_etag,
+)
+
+# Third-party
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalRetrieveMixin:
+    """
+    Send strong ETags for an object, and answer `If-None-Match` requests with
+    304 (Not Modified) before querying and serialising it.
+
+    ETags are derived from `etag_fields`, the columns the representation of
+    the object depends on. Conditional requests only fetch their values, with
+    a single query; other requests read them from the object retrieved.
+
+    Usage:
+
+        >>> class MyRetrieveAPIView(ConditionalRetrieveMixin, RetrieveAPIView):
+        >>>     etag_fields = ("modified_at", "user__auth_user__username")
+
+    """
+    etag_fields = ()
+
+    def get(self, request, *args, **kwargs):
+        self.etag = None
+        if "HTTP_IF_NONE_MATCH" in request.META:
+            values = self.get_etag_values()
+            if values is not None:
+                etag = self.make_etag(values)
+                if_none_match = parse_etags(request.META["HTTP_IF_NONE_MATCH"])
+                if etag in if_none_match or "*" in if_none_match:
+                    return Response(
+                        status=status.HTTP_304_NOT_MODIFIED,
+                        headers={"ETag": etag},
+                    )
+        response = super().get(request, *args, **kwargs)
+        is_ok = response.status_code == status.HTTP_200_OK
+        if self.etag is not None and is_ok:
+            response["ETag"] = self.etag
+        return response
+
+    def get_object(self):
+        instance = super().get_object()
+        self.etag = self.make_etag([
+            self.get_instance_value(instance, field)
+            for field in self.etag_fields
+        ])
+        return instance
+
+    def make_etag(self, values) -> str:
+        # Representations also vary with the host absolute URLs link to,
+        # and with the renderer and media type they are rendered in.
+        components = [
+            self.request.build_absolute_uri("/"),
+            self.request.accepted_renderer.format,
+            self.request.accepted_media_type,
+        ] + [str(value) for value in values]
+        digest = hashlib.md5(repr(components).encode("utf-8")).hexdigest()
+        return quote_etag(digest)
+
+    def get_etag_values(self) -> Optional[tuple]:
+        """
+        Query the values of `etag_fields` for the requested object, or get
+        None if it cannot be retrieved.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return queryset.values_list(*self.etag_fields).first()
+
+    @staticmethod
+    def get_instance_value(instance, field: str):
+        """
+        Follow a field lookup such as `user__auth_user__username` through the
+        relations already fetched with an instance.
+        """
+        value = instance
+        for name in field.split("__"):
+            if value is None:
+                return None
+            value = getattr(value, name)
+        return value
+
+
+class LastModifiedListMixin:
+    """
+    Send the `Last-Modified` time of a collection, which is when the newest
+    of its (filtered) results was created.
+
+    Collections whose results are never modified once created can set
+    `is_append_only`, to also answer `If-Modified-Since` requests with 304
+    (Not Modified) before serialising any result.
+    """
+    last_modified_field = "created_at"
+    is_append_only = False
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        last_modified = queryset.aggregate(
+            last_modified=Max(self.last_modified_field)
+        )["last_modified"]
+        headers = {}
+        if last_modified is not None:
+            timestamp = int(last_modified.timestamp())
+            headers["Last-Modified"] = http_date(timestamp)
+            if_modified_since = parse_http_date_safe(
+                request.META.get("HTTP_IF_MODIFIED_SINCE", "")
+            )
+            if (
+                self.is_append_only
+                and if_modified_since is not None
+                and timestamp <= if_modified_since
+            ):
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response(serializer.data)
+        for header, value in headers.items():
+            response[header] = value
+        return response
@@ -0,0 +1,31 @@
+# Third-party
+from rest_framework.filters import OrderingFilter
+
+
+class AliasedOrderingFilter(OrderingFilter):
+    """
+    Order results as `OrderingFilter` does, by any of the view's
+    `ordering_fields`, but sort some of them by another field as mapped in
+    the view's `ordering_aliases`, e.g. a column denormalised to be sorted
+    by, while clients keep requesting the field they are represented with.
+
+    Usage:
+
+        >>> class MyListAPIView(ListAPIView):
+        >>>     filter_backends = [AliasedOrderingFilter]
+        >>>     ordering_fields = ["price"]
+        >>>     ordering_aliases = {"price": "normalized_price"}
+
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        aliases = getattr(view, "ordering_aliases", {})
+        if not ordering or not aliases:
+            return ordering
+        return [self.get_alias(term, aliases) for term in ordering]
+
+    @staticmethod
+    def get_alias(term: str, aliases: dict) -> str:
+        field = term.lstrip("-")
+        return term[:len(term) - len(field)] + aliases.get(field, field)
@@ -0,0 +1,241 @@
+# Python standard
+import hashlib
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Optional
+
+# Django
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+# Third-party
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+
+IN_FLIGHT = "in_flight"
+COMPLETED = "completed"
+
+# A response stored to be replayed, as compact as it can be: its status,
+# content type, location (of the object created) and rendered content.
+StoredResponse = namedtuple(
+    "StoredResponse", ["status", "content_type", "location", "content"]
+)
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = (
+        "This Idempotency-Key was already used for a different request."
+    )
+    default_code = "idempotency_key_reused"
+
+
+class IdempotencyKeyInFlight(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "A request with this Idempotency-Key is still being processed."
+    )
+    default_code = "idempotency_key_in_flight"
+
+
+class IdempotencyStore:
+    """
+    Store the responses to requests made with an idempotency key, in the
+    cache `alias` for `timeout` seconds, so retries of a request get the
+    same response again instead of being executed again.
+
+    A key is marked as in flight, with `cache.add`, before its request is
+    executed, so only one of many concurrent duplicates is: the others wait
+    for its response, for `wait_timeout` seconds at most. The mark expires
+    after `in_flight_timeout` seconds, which must outlast the longest
+    request, so keys of requests never completed nor released (e.g. by a
+    process killed) can be used again. Keys are only kept with the request
+    they were first used for (by `fingerprint`).
+    """
+
+    def __init__(
+        self,
+        alias: str,
+        timeout: int,
+        wait_timeout: float,
+        in_flight_timeout: float,
+    ):
+        self.cache = caches[alias]
+        self.timeout = timeout
+        self.wait_timeout = wait_timeout
+        self.in_flight_timeout = in_flight_timeout
+
+    def begin(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Mark the request of `key` as in flight and get None, for it to be
+        executed, or get the response to replay once it is stored.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        delay = 0.005
+        while True:
+            if self.cache.add(
+                key, (IN_FLIGHT, fingerprint), timeout=self.in_flight_timeout
+            ):
+                return None
+            entry = self.cache.get(key)
+            if entry is None:
+                # Released, or expired, since; mark it as in flight again
+                continue
+            state, entry_fingerprint, *response = entry
+            if entry_fingerprint != fingerprint:
+                raise IdempotencyKeyReused()
+            if state == COMPLETED:
+                return StoredResponse(*response)
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInFlight()
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    def complete(self, key: str, fingerprint: str, response: HttpResponse):
+        stored = StoredResponse(
+            response.status_code,
+            response.get("Content-Type"),
+            response.get("Location"),
+            response.content,
+        )
+        self.cache.set(
+            key, (COMPLETED, fingerprint, *stored), timeout=self.timeout
+        )
+
+    def release(self, key: str):
+        """
+        Forget the request of `key`, so it can be retried.
+        """
+        self.cache.delete(key)
+
+
+@lru_cache(maxsize=None)
+def get_idempotency_store() -> IdempotencyStore:
+    """
+    Get the idempotency store configured by the `IDEMPOTENCY_*` settings.
+    """
+    return IdempotencyStore(
+        settings.IDEMPOTENCY_CACHE_ALIAS,
+        settings.IDEMPOTENCY_KEY_TIMEOUT,
+        settings.IDEMPOTENCY_WAIT_TIMEOUT,
+        settings.IDEMPOTENCY_IN_FLIGHT_TIMEOUT,
+    )
+
+
+class IdempotentCreateMixin:
+    """
+    Execute POST requests sent with an `Idempotency-Key` header only once,
+    for each user: repeating the request with the same key (such as a
+    client retrying after a timeout) replays the response to the first one,
+    without parsing or saving anything, while the first is stored.
+
+    Only successful responses are stored; requests failing can be retried
+    with the same key. Keys used for a different request are rejected with
+    422 (Unprocessable Entity).
+
+    Requests failing with an exception which has a `pending` future, of the
+    object still being created (see `auction.bidding.BidOutcomeUnknown`),
+    keep their key in flight until it resolves, so retries are not executed
+    meanwhile. Retries then replay the response the request would have had,
+    or are executed again if the object could not be created.
+
+    Usage:
+
+        >>> class MyCreateAPIView(IdempotentCreateMixin, CreateAPIView):
+        >>>     serializer_class = MySerializer
+
+    """
+    idempotency_header = "Idempotency-Key"
+    idempotency_key_max_length = 255
+
+    def post(self, request, *args, **kwargs):
+        idempotency_key = request.headers.get(self.idempotency_header)
+        if idempotency_key is None:
+            return super().post(request, *args, **kwargs)
+        if not 0 < len(idempotency_key) <= self.idempotency_key_max_length:
+            raise ValidationError({self.idempotency_header: [
+                f"Ensure this header has between 1 and "
+                f"{self.idempotency_key_max_length} characters."
+            ]})
+
+        store = get_idempotency_store()
+        key = self.get_idempotency_cache_key(request, idempotency_key)
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+        stored = store.begin(key, fingerprint)
+        if stored is not None:
+            return self.replay(stored)
+        try:
+            response = super().post(request, *args, **kwargs)
+        except BaseException as error:
+            pending = getattr(error, "pending", None)
+            if pending is None:
+                store.release(key)
+            else:
+                # Still being executed: keep the key in flight until done
+                pending.add_done_callback(
+                    lambda result: self.complete_pending(
+                        request, key, fingerprint, result
+                    )
+                )
+            raise
+        if status.is_success(response.status_code):
+            response.add_post_render_callback(
+                lambda rendered: store.complete(key, fingerprint, rendered)
+            )
+        else:
+            store.release(key)
+        return response
+
+    def complete_pending(
+        self, request, key: str, fingerprint: str, pending: Future
+    ):
+        """
+        Store the response to a request which ended before the object it
+        created was `pending`, once it is created, or forget its key if it
+        could not be.
+        """
+        store = get_idempotency_store()
+        if pending.exception() is not None:
+            store.release(key)
+            return
+        try:
+            response = self.finalize_response(
+                request, self.get_pending_response(pending.result())
+            )
+            response.render()
+        except Exception:
+            store.release(key)
+            raise
+        store.complete(key, fingerprint, response)
+
+    def get_pending_response(self, instance) -> Response:
+        """
+        Get the response the request would have had if `instance` had been
+        created before it ended.
+        """
+        serializer = self.get_serializer(instance)
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
+
+    def get_idempotency_cache_key(self, request, idempotency_key: str) -> str:
+        scope = f"{request.user.pk}:{request.path}:{idempotency_key}"
+        digest = hashlib.sha256(scope.encode("utf-8")).hexdigest()
+        return f"idempotency:{digest}"
+
+    def replay(self, stored: StoredResponse) -> HttpResponse:
+        response = HttpResponse(
+            stored.content,
+            status=stored.status,
+            content_type=stored.content_type,
+        )
+        if stored.location:
+            response["Location"] = stored.location
+        response["Idempotent-Replayed"] = "true"
+        return response
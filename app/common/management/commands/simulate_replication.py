@@ -0,0 +1,56 @@
+# Django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+# Local
+from common.replication import SQLiteReplicator
+
+
+class Command(BaseCommand):
+    help = (
+        "Replicate the primary SQLite database to the replica databases "
+        "configured, with a given lag, to try reading from replicas locally."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lag",
+            type=float,
+            default=1.0,
+            help="Seconds between copying the primary over the replicas.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Copy the primary over the replicas once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No database replicas are configured.")
+        aliases = [DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS]
+        for alias in aliases:
+            if settings.DATABASES[alias]["ENGINE"] != (
+                "django.db.backends.sqlite3"
+            ):
+                raise CommandError(f"Database {alias} is not SQLite.")
+        replicator = SQLiteReplicator(
+            settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"],
+            [
+                settings.DATABASES[alias]["NAME"]
+                for alias in settings.DATABASE_REPLICAS
+            ],
+            lag=options["lag"],
+        )
+        if options["once"]:
+            replicator.replicate()
+            self.stdout.write("Replicas updated.")
+            return
+        self.stdout.write(
+            f"Replicating every {options['lag']} seconds; stop with CTRL-C."
+        )
+        try:
+            replicator.run()
+        except KeyboardInterrupt:
+            replicator.stop()
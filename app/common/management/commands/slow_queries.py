@@ -0,0 +1,78 @@
+# Python standard
+import json
+
+# Django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Local
+from common.slow_queries import aggregate, read_entries
+
+
+class Command(BaseCommand):
+    help = (
+        "Aggregate the slow queries logged by fingerprint, slowest in total "
+        "first, flagging those which read whole tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=settings.SLOW_QUERY_LOG_FILE,
+            help="Slow query log to read (defaults to SLOW_QUERY_LOG_FILE).",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of queries to report.",
+        )
+        parser.add_argument(
+            "--full-scans",
+            action="store_true",
+            help="Only report queries reading whole tables.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Write the queries reported as JSON.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["file"]:
+            raise CommandError(
+                "No slow query log; set SLOW_QUERY_LOG_FILE or --file."
+            )
+        try:
+            queries = aggregate(read_entries(options["file"]))
+        except FileNotFoundError:
+            raise CommandError(f"{options['file']} does not exist.")
+        if options["full_scans"]:
+            queries = [query for query in queries if query["full_scans"]]
+        queries = queries[:options["limit"]]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(queries, indent=2))
+            return
+        if not queries:
+            self.stdout.write("No slow queries logged.")
+            return
+        for query in queries:
+            self.stdout.write(
+                f"{query['fingerprint']}  {query['count']} queries, "
+                f"{query['total_ms']:.1f} ms in total, "
+                f"{query['max_ms']:.1f} ms at most"
+            )
+            self.stdout.write(f"  Views: {', '.join(query['views']) or '-'}")
+            if query["full_scans"]:
+                self.stdout.write(self.style.WARNING(
+                    f"  Full scans: {', '.join(query['full_scans'])}"
+                ))
+            if query["temp_sort"]:
+                self.stdout.write(self.style.WARNING(
+                    "  Sorted in a temporary B-tree, without an index"
+                ))
+            self.stdout.write(f"  {query['sql']}")
+            for step in query["plan"] or ():
+                self.stdout.write(f"    {step}")
+            self.stdout.write("")
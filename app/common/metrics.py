@@ -0,0 +1,443 @@
+# Python standard
+import atexit
+import bisect
+import glob
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# Django
+from django.conf import settings
+
+
+# Values of a metric, keyed by the values of its labels
+Samples = Dict[Tuple[str, ...], object]
+
+
+class Stripe:
+    """
+    Hold the values recorded by some of the threads of this process, with
+    a lock only ever contended by those threads.
+    """
+    __slots__ = ("lock", "values")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+
+
+class Metric:
+    """
+    Record values of a metric, for any values of its `labelnames`, to be
+    exposed in the Prometheus text format.
+
+    Values are recorded in one of `stripes` stripes, which every thread is
+    assigned one of in turn, so recording only ever waits for the few other
+    threads recording in the same stripe. Stripes are only added up when
+    the metric is collected.
+    """
+    type = ""
+    stripes = 8
+    # Set when registered, to start over in forked processes
+    registry = None
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.reset()
+
+    def reset(self):
+        """
+        Forget every value recorded, without waiting for any lock, which a
+        thread of the parent of a forked process might have held.
+        """
+        self._stripes = [Stripe() for _ in range(self.stripes)]
+        self._next_stripe = itertools.count()
+        self._local = threading.local()
+
+    def get_stripe(self) -> Stripe:
+        if self.registry is not None:
+            self.registry.check_process()
+        try:
+            return self._local.stripe
+        except AttributeError:
+            index = next(self._next_stripe) % self.stripes
+            self._local.stripe = self._stripes[index]
+            return self._local.stripe
+
+    def get_key(self, labels: dict) -> Tuple[str, ...]:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} is labelled by {', '.join(self.labelnames)}."
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def collect(self) -> Samples:
+        """
+        Get the values recorded by every thread of this process.
+        """
+        samples = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                values = list(stripe.values.items())
+            for key, value in values:
+                samples[key] = self.add(samples.get(key), value)
+        return samples
+
+    @staticmethod
+    def add(value, other):
+        raise NotImplementedError
+
+    def expose(self, samples: Samples) -> list:
+        raise NotImplementedError
+
+    def format_labels(self, key: Tuple[str, ...], **extra: str) -> str:
+        labels = [*zip(self.labelnames, key), *extra.items()]
+        if not labels:
+            return ""
+        return "{" + ",".join(
+            f'{name}="{escape_label_value(value)}"' for name, value in labels
+        ) + "}"
+
+
+class Counter(Metric):
+    """
+    Count events, such as bids placed, by how many times they happened
+    since the process started.
+    """
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self.get_key(labels)
+        stripe = self.get_stripe()
+        with stripe.lock:
+            stripe.values[key] = stripe.values.get(key, 0) + amount
+
+    @staticmethod
+    def add(value, other):
+        return other if value is None else value + other
+
+    def expose(self, samples):
+        return [
+            f"{self.name}{self.format_labels(key)} {format_value(value)}"
+            for key, value in sorted(samples.items())
+        ]
+
+
+class Histogram(Metric):
+    """
+    Count observations, such as request durations in seconds, by the
+    smallest of `buckets` they are less than or equal to, and add them up.
+
+    The values recorded for each key are the count of every bucket, then of
+    observations greater than every bucket, then their sum.
+    """
+    type = "histogram"
+    default_buckets = (
+        0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0,
+        7.5, 10.0,
+    )
+
+    def __init__(self, name, documentation, labelnames=(), buckets=None):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets or self.default_buckets))
+
+    def observe(self, value: float, **labels: str):
+        key = self.get_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        stripe = self.get_stripe()
+        with stripe.lock:
+            values = stripe.values.get(key)
+            if values is None:
+                values = stripe.values[key] = [0] * (len(self.buckets) + 2)
+            values[index] += 1
+            values[-1] += value
+
+    @staticmethod
+    def add(value, other):
+        if value is None:
+            return list(other)
+        return [a + b for a, b in zip(value, other)]
+
+    def expose(self, samples):
+        lines = []
+        for key, values in sorted(samples.items()):
+            count = 0
+            bounds = [format_value(bound) for bound in self.buckets]
+            for bound, bucket_count in zip([*bounds, "+Inf"], values):
+                count += bucket_count
+                labels = self.format_labels(key, le=bound)
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = self.format_labels(key)
+            total = format_value(values[-1])
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge(Metric):
+    """
+    Measure a value, such as the number of active auctions, by calling
+    `function` whenever metrics are collected.
+
+    Gauges are measured by the process exposing metrics, and never shared
+    between processes, so they should only measure shared state.
+    """
+    type = "gauge"
+
+    def __init__(self, name, documentation, function: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.function = function
+
+    def collect(self):
+        return {(): self.function()}
+
+    def expose(self, samples):
+        return [
+            f"{self.name} {format_value(value)}"
+            for value in samples.values()
+        ]
+
+
+def escape_label_value(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return f"{float(value):.1f}"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Hold the metrics of this process, and expose them, with those of every
+    other process, in the Prometheus text format.
+
+    Processes serving the same application (such as the workers of a web
+    server) share their counters and histograms through the files of a
+    `directory`, which each of them writes its own values to every so often
+    (see `start_flushing`); values of processes which have exited are kept,
+    so counters never go backwards. Files are named by the process id and
+    the time the process first recorded a value, so a process reusing the
+    id of one which has exited never overwrites its values.
+
+    Processes forked from one which imported the application (such as
+    workers preloaded by gunicorn) start over, with none of the values of
+    their parent, and their own flusher.
+
+    Usage:
+
+        >>> bids = registry.counter("bids_total", "Bids.", ["outcome"])
+        >>> bids.inc(outcome="accepted")
+        >>> registry.expose()
+
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.metrics = OrderedDict()
+        self.lock = threading.Lock()
+        self.flusher = None
+        self.flush_interval = None
+        self._pid = None
+        self._process = None
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Register a metric, or get the one already registered by its name.
+        """
+        with self.lock:
+            registered = self.metrics.setdefault(metric.name, metric)
+        if type(registered) is not type(metric):
+            raise ValueError(f"{metric.name} is already a {registered.type}.")
+        registered.registry = self
+        return registered
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name, documentation, labelnames=(), buckets=None
+    ) -> Histogram:
+        return self.register(
+            Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def gauge(self, name, documentation, function) -> Gauge:
+        return self.register(Gauge(name, documentation, function))
+
+    def get_path(self, process: str) -> str:
+        return os.path.join(self.directory, f"metrics-{process}.json")
+
+    def check_process(self):
+        """
+        Name the file of this process the first time it records or collects
+        values, forgetting those recorded by its parent if it was forked,
+        and start writing to the file if flushing.
+        """
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self.lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                for metric in self.metrics.values():
+                    metric.reset()
+                # Threads are not forked, so the parent's flusher is gone
+                self.flusher = None
+            self._process = f"{pid}-{time.time_ns()}"
+            self._pid = pid
+        if self.flush_interval is not None:
+            self.start_flusher()
+
+    def get_process(self) -> str:
+        """
+        Get the name of this process's file.
+        """
+        self.check_process()
+        return self._process
+
+    def snapshot(self) -> dict:
+        """
+        Get the values of every metric shared between processes.
+        """
+        return {
+            name: [
+                [list(key), value] for key, value in metric.collect().items()
+            ]
+            for name, metric in self.metrics.items()
+            if not isinstance(metric, Gauge)
+        }
+
+    def flush(self):
+        """
+        Write the values of this process to its file, atomically.
+        """
+        descriptor, path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(path, self.get_path(self.get_process()))
+
+    def collect(self) -> Dict[str, Samples]:
+        """
+        Get the values of every metric, added up across processes.
+        """
+        self.check_process()
+        collected = {
+            name: metric.collect() for name, metric in self.metrics.items()
+        }
+        if self.directory is None:
+            return collected
+        own_path = self.get_path(self.get_process())
+        for path in glob.glob(self.get_path("*")):
+            if path == own_path:
+                continue
+            try:
+                with open(path) as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError):
+                # Removed or replaced while being read
+                continue
+            for name, values in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None or isinstance(metric, Gauge):
+                    continue
+                samples = collected[name]
+                for key, value in values:
+                    key = tuple(key)
+                    samples[key] = metric.add(samples.get(key), value)
+        return collected
+
+    def expose(self) -> str:
+        """
+        Render every metric in the Prometheus text format (version 0.0.4).
+        """
+        lines = []
+        for name, samples in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.expose(samples))
+        return "\n".join(lines) + "\n"
+
+    def start_flushing(self, interval: float):
+        """
+        Write the values of this process, and of every process forked from
+        it, to their files every `interval` seconds, from a daemon thread
+        started when they first record values, and once more on exit.
+        """
+        if self.directory is None or self.flush_interval is not None:
+            return
+        self.flush_interval = interval
+        atexit.register(self.flush_on_exit)
+        if self._pid is not None:
+            self.start_flusher()
+
+    def start_flusher(self):
+        with self.lock:
+            if self.flusher is not None:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            self.flusher = threading.Thread(
+                target=self.run_flusher, args=(self.flush_interval,),
+                name="metrics-flusher", daemon=True,
+            )
+            self.flusher.start()
+
+    def run_flusher(self, interval: float):
+        while True:
+            time.sleep(interval)
+            self.flush()
+
+    def flush_on_exit(self):
+        # Processes which never recorded a value have no file to write
+        if self._pid == os.getpid():
+            self.flush()
+
+
+# Metrics of this process, shared by the workers of the web server through
+# `METRICS_MULTIPROCESS_DIRECTORY`, if configured.
+registry = MetricsRegistry(
+    getattr(settings, "METRICS_MULTIPROCESS_DIRECTORY", None)
+)
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time spent serving requests to API views, until the response is sent.",
+    ["view", "method"],
+)
+token_lookups = registry.counter(
+    "auth_token_lookups_total",
+    "Access tokens authenticating requests, by whether they were cached.",
+    ["result"],
+)
+
+
+class RequestDurationMixin:
+    """
+    Observe how long every request to a DRF view takes to be served, in the
+    `http_request_duration_seconds` histogram, labelled by view.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            request_duration.observe(
+                time.perf_counter() - start,
+                view=type(self).__name__,
+                method=request.method,
+            )
@@ -0,0 +1,152 @@
+# Python standard
+import hashlib
+import json
+import logging
+from contextlib import ExitStack
+
+# Django
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Third-party
+from rest_framework.permissions import SAFE_METHODS
+
+# Local
+from common.routers import read_from_replicas
+from common.slow_queries import current_view, get_slow_query_log
+from common.timing import RequestTimings, current_timings
+
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaReadMiddleware:
+    """
+    Read from the database replicas while serving requests with safe
+    methods (GET, HEAD, OPTIONS), and from the primary for any other.
+
+    Replicas may lag behind the primary, so clients which have just written
+    are pinned to the primary for `READ_YOUR_WRITES_WINDOW` seconds, and
+    always read back what they wrote, such as a bid in the lot's history.
+    Clients are told apart by their credentials, or else by their address,
+    and pinned in the `READ_YOUR_WRITES_CACHE_ALIAS` cache, shared by every
+    worker process so pins hold whichever serves their next request.
+    """
+    cache_key_prefix = "primary-pin"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        client = self.get_client_key(request)
+        is_safe = request.method in SAFE_METHODS
+        allowed = is_safe and not self.is_pinned(client)
+        with read_from_replicas(allowed):
+            response = self.get_response(request)
+        if not is_safe:
+            self.pin(client)
+        return response
+
+    @property
+    def cache(self):
+        return caches[settings.READ_YOUR_WRITES_CACHE_ALIAS]
+
+    def get_client_key(self, request) -> str:
+        credentials = (
+            request.META.get("HTTP_AUTHORIZATION")
+            or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+            or request.META.get("REMOTE_ADDR", "")
+        )
+        digest = hashlib.sha256(credentials.encode("utf-8")).hexdigest()
+        return f"{self.cache_key_prefix}:{digest}"
+
+    def is_pinned(self, client: str) -> bool:
+        return self.cache.get(client) is not None
+
+    def pin(self, client: str):
+        self.cache.set(client, 1, timeout=settings.READ_YOUR_WRITES_WINDOW)
+
+
+class ServerTimingMiddleware:
+    """
+    Measure the time spent serving every request, in the database (and how
+    many queries were made), authenticating, serialising and rendering, and
+    send it to clients in a `Server-Timing` header, shown by browsers'
+    developer tools. Every request is also logged, as a line of JSON, with
+    `SERVER_TIMING_LOG`.
+
+    This middleware is only used with `SERVER_TIMING` enabled, as timings
+    tell clients about the internals of the server; otherwise, measuring a
+    phase costs no more than looking up that no request is instrumented.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(self.time_query)
+                    )
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        timings.stop()
+        response["Server-Timing"] = timings.as_header()
+        if settings.SERVER_TIMING_LOG:
+            logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "timings": timings.as_dict(),
+            }))
+        return response
+
+    @staticmethod
+    def time_query(execute, sql, params, many, context):
+        timings = current_timings.get()
+        if timings is None:
+            return execute(sql, params, many, context)
+        with timings.measure("db"):
+            return execute(sql, params, many, context)
+
+
+class SlowQueryLogMiddleware:
+    """
+    Log the queries made while serving requests which take longer than
+    `SLOW_QUERY_THRESHOLD` milliseconds, with the view they were made by and
+    their query plan (see `SlowQueryLog`).
+
+    This middleware is only used with `SLOW_QUERY_THRESHOLD` set.
+    """
+
+    def __init__(self, get_response):
+        self.slow_query_log = get_slow_query_log()
+        if self.slow_query_log is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_view.set(None)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(self.slow_query_log)
+                    )
+                return self.get_response(request)
+        finally:
+            current_view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Views of classes are named by their class, e.g. `LotListAPIView`
+        view = getattr(view_func, "view_class", view_func)
+        current_view.set(view.__name__)
@@ -0,0 +1,217 @@
+# Python standard
+from base64 import b64decode, b64encode
+from collections import OrderedDict, namedtuple
+from urllib import parse
+
+# Django
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+# Third-party
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+Cursor = namedtuple("Cursor", ["created_at", "id", "reverse"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate results by their `(created_at, id)` position, so every page is
+    fetched with an indexed range query instead of scanning the rows of all
+    previous pages with `OFFSET`.
+
+    Pages are linked with opaque cursors (`?cursor=`) holding the position of
+    the last (or first, moving backwards) result of the current page. Ties on
+    `created_at` are broken by `id`, keeping ordering stable across pages.
+    Results can be listed newest first with `?ordering=-created_at`.
+
+    Counting all results is only done when requested with `?count=true`.
+    Requests ordering by any other field, by the relevance of search results,
+    or paginating with `offset`, fall back to `LimitOffsetPagination`.
+
+    Usage:
+
+        >>> class MyListAPIView(ListAPIView):
+        >>>     pagination_class = KeysetPagination
+
+    """
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = 1000
+    count_query_param = "count"
+    offset_query_param = LimitOffsetPagination.offset_query_param
+    invalid_cursor_message = "Invalid cursor"
+    # Fields the results are ordered by, which must be unique together
+    ordering = ("created_at", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = self.get_fallback(request, view)
+        if self.fallback:
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        self.descending = self.is_descending(request, view)
+        self.count = None
+        if self.is_count_requested(request):
+            self.count = queryset.count()
+
+        # Moving to a previous page walks the results in reverse
+        reverse = bool(self.cursor and self.cursor.reverse)
+        descending = self.descending != reverse
+        created_at, id = self.ordering
+        if descending:
+            queryset = queryset.order_by(f"-{created_at}", f"-{id}")
+        else:
+            queryset = queryset.order_by(created_at, id)
+        if self.cursor:
+            lookup = "lt" if descending else "gt"
+            # Bound `created_at` on its own first, so the index range scan
+            # still applies, then skip results already listed at that time.
+            queryset = queryset.filter(
+                Q(**{f"{created_at}__{lookup}e": self.cursor.created_at}),
+                Q(**{f"{created_at}__{lookup}": self.cursor.created_at})
+                | Q(**{f"{id}__{lookup}": self.cursor.id})
+            )
+
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(self.cursor)
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        if self.fallback:
+            return self.fallback.get_paginated_response(data)
+        return Response(OrderedDict([
+            ("count", self.count),
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_fallback(self, request, view=None):
+        """
+        Get a `LimitOffsetPagination` instance to paginate requests that
+        cannot be paginated by position, if this is one of them.
+        """
+        ordering = request.query_params.get(
+            api_settings.ORDERING_PARAM, ""
+        ).strip()
+        created_at = self.ordering[0]
+        if (
+            self.offset_query_param in request.query_params
+            or ordering not in ("", created_at, f"-{created_at}")
+            or self.is_ordered_by_filters(request, view)
+        ):
+            return LimitOffsetPagination()
+        return None
+
+    @staticmethod
+    def is_ordered_by_filters(request, view=None) -> bool:
+        """
+        Whether any filter backend of the view orders its results itself, as
+        reported by their `orders_results(request)` method.
+        """
+        return any(
+            backend().orders_results(request)
+            for backend in getattr(view, "filter_backends", [])
+            if hasattr(backend, "orders_results")
+        )
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def is_descending(self, request, view=None) -> bool:
+        ordering = request.query_params.get(api_settings.ORDERING_PARAM, "")
+        return (
+            any(
+                issubclass(backend, OrderingFilter)
+                for backend in getattr(view, "filter_backends", [])
+            )
+            and ordering.strip().startswith("-")
+        )
+
+    def is_count_requested(self, request) -> bool:
+        count = request.query_params.get(self.count_query_param, "")
+        return count.lower() in ("1", "true")
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            return self.encode_cursor(self.page[-1], reverse=False)
+        # Moving forward from an empty page, start again from the cursor.
+        return self.encode_position(self.cursor.created_at, self.cursor.id)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            return self.encode_cursor(self.page[0], reverse=True)
+        return self.encode_position(
+            self.cursor.created_at, self.cursor.id, reverse=True
+        )
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        """
+        Get the URL for the page after (or before) a result, which can be
+        an object or the dictionary of its values.
+        """
+        created_at, id = self.ordering
+        if isinstance(instance, dict):
+            return self.encode_position(
+                instance[created_at], instance[id], reverse
+            )
+        return self.encode_position(
+            getattr(instance, created_at), getattr(instance, id), reverse
+        )
+
+    def encode_position(self, created_at, id, reverse: bool = False) -> str:
+        """
+        Get the URL for the page of results after (or before, if `reverse`)
+        a given position.
+        """
+        tokens = {"p": created_at.isoformat(), "i": str(id)}
+        if reverse:
+            tokens["r"] = "1"
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring)
+            created_at = parse_datetime(tokens["p"][0])
+            id = int(tokens["i"][0])
+            reverse = tokens.get("r", ["0"])[0] == "1"
+        except (KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(created_at=created_at, id=id, reverse=reverse)
@@ -0,0 +1,119 @@
+# Python standard
+import datetime
+import decimal
+import json
+import re
+import uuid
+from typing import Union
+
+# Third-party
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+# Local
+from common.timing import timed
+
+
+class JSONFragment:
+    """
+    Hold JSON already encoded, such as a cached representation, to be
+    rendered as it is within any response data.
+    """
+    __slots__ = ("content",)
+
+    def __init__(self, content: Union[str, bytes]):
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        self.content = content
+
+    def __repr__(self):
+        return f"JSONFragment({self.content!r})"
+
+
+def encode_datetime(value: datetime.datetime) -> str:
+    representation = value.isoformat()
+    if representation.endswith("+00:00"):
+        representation = representation[:-6] + "Z"
+    return representation
+
+
+# Encoders for the types most represented, looked up by their exact type
+# before falling back to the checks of DRF's `JSONEncoder`, in the same
+# order, for any other object.
+FAST_ENCODERS = {
+    uuid.UUID: str,
+    decimal.Decimal: float,
+    datetime.datetime: encode_datetime,
+    datetime.date: datetime.date.isoformat,
+}
+
+
+class FragmentJSONEncoder(encoders.JSONEncoder):
+    """
+    Encode data as DRF's `JSONEncoder` does, decoding any `JSONFragment`.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, JSONFragment):
+            return json.loads(obj.content)
+        return super().default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Render JSON exactly as DRF's `JSONRenderer` does, faster.
+
+    Compact responses are encoded with a single `default` function looking
+    values up by type, rather than the chain of `isinstance` checks of DRF's
+    `JSONEncoder` for every UUID, decimal and datetime. Any `JSONFragment` in
+    the data is spliced into the output as it is, without being decoded and
+    encoded again. Indented responses, such as those of the browsable API,
+    are rendered by `JSONRenderer`.
+    """
+    encoder_class = FragmentJSONEncoder
+
+    @timed("render")
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if isinstance(data, JSONFragment):
+            return self.escape(data.content).encode()
+
+        fragments = []
+        # Fragments are encoded as strings holding this unique marker first
+        marker = uuid.uuid4().hex
+        fallback = self.encoder_class()
+
+        def default(obj):
+            encode = FAST_ENCODERS.get(type(obj))
+            if encode is not None:
+                return encode(obj)
+            if isinstance(obj, JSONFragment):
+                fragments.append(obj.content)
+                return f"{marker}:{len(fragments) - 1}"
+            return fallback.default(obj)
+
+        ret = json.dumps(
+            data, default=default, ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict,
+            separators=SHORT_SEPARATORS if self.compact else LONG_SEPARATORS,
+        )
+        if fragments:
+            ret = re.sub(
+                f'"{marker}:([0-9]+)"',
+                lambda match: fragments[int(match.group(1))],
+                ret,
+            )
+        return self.escape(ret).encode()
+
+    @staticmethod
+    def escape(ret: str) -> str:
+        """
+        Escape the characters that JSON allows but JavaScript does not, as
+        `JSONRenderer` always does.
+        """
+        return ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
@@ -0,0 +1,50 @@
+# Python standard
+import sqlite3
+import threading
+from typing import List
+
+
+class SQLiteReplicator:
+    """
+    Simulate asynchronous replication between SQLite files, copying the
+    primary database over every replica once every `lag` seconds.
+
+    Replicas are then up to `lag` seconds behind the primary, as read
+    replicas of a database server would be, so routing reads to them can be
+    tried locally with two (or more) SQLite files.
+
+    Usage:
+
+        >>> replicator = SQLiteReplicator("app.sqlite3", ["replica.sqlite3"])
+        >>> replicator.replicate()
+
+    """
+
+    def __init__(self, primary: str, replicas: List[str], lag: float = 1.0):
+        self.primary = primary
+        self.replicas = replicas
+        self.lag = lag
+        self.stopped = threading.Event()
+
+    def replicate(self):
+        """
+        Copy a consistent snapshot of the primary over every replica.
+        """
+        source = sqlite3.connect(self.primary)
+        try:
+            for replica in self.replicas:
+                target = sqlite3.connect(replica)
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+        finally:
+            source.close()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.replicate()
+            self.stopped.wait(self.lag)
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,59 @@
+# Python standard
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Django
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# Whether reads in the current context must be made from the primary; they
+# are unless explicitly allowed, e.g. by `ReplicaReadMiddleware`.
+use_primary = ContextVar("use_primary", default=True)
+
+
+@contextmanager
+def read_from_replicas(allowed: bool = True):
+    """
+    Allow (or disallow) reads from the replicas within a context.
+    """
+    token = use_primary.set(not allowed)
+    try:
+        yield
+    finally:
+        use_primary.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route writes to the primary database (`default`), and reads to one of
+    the `DATABASE_REPLICAS` at random, where allowed.
+
+    Reads are only made from replicas within `read_from_replicas`, and never
+    while a transaction is open on the primary, so whatever it writes is read
+    back consistently. Models of `DATABASE_PRIMARY_APPS`, such as access
+    tokens used as soon as they are issued, are always read from the primary.
+    """
+    primary = DEFAULT_DB_ALIAS
+
+    def __init__(self):
+        self.replicas = list(settings.DATABASE_REPLICAS)
+        self.primary_apps = set(settings.DATABASE_PRIMARY_APPS)
+
+    def db_for_read(self, model, **hints):
+        if (
+            not self.replicas
+            or use_primary.get()
+            or model._meta.app_label in self.primary_apps
+            or connections[self.primary].in_atomic_block
+        ):
+            return self.primary
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every database holds the same data, at most some time behind.
+        return True
@@ -0,0 +1,260 @@
+# Python standard
+import decimal
+from typing import Callable, Iterable, Tuple
+
+# Django
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+
+# Third-party
+from rest_framework.settings import api_settings
+
+# Local
+from common.timing import timed
+
+
+class CompiledField:
+    """
+    Represent a value read with `.values()`, as the DRF field it replaces.
+
+    `compile(context)` is called once per response, and returns a function
+    representing the value of this field for every row.
+    """
+
+    def __init__(self, lookup: str):
+        self.lookup = lookup
+
+    @property
+    def lookups(self) -> Tuple[str, ...]:
+        return (self.lookup,)
+
+    def compile(self, context: dict) -> Callable[[dict], object]:
+        lookup = self.lookup
+        return lambda row: row[lookup]
+
+
+class CompiledCharField(CompiledField):
+    """
+    Represent values as `CharField` does, as strings.
+    """
+
+    def compile(self, context):
+        lookup = self.lookup
+
+        def represent(row):
+            value = row[lookup]
+            return None if value is None else str(value)
+        return represent
+
+
+class CompiledDateTimeField(CompiledField):
+    """
+    Represent datetimes as `DateTimeField` does, in ISO 8601 in the current
+    timezone, with UTC as `Z`.
+    """
+
+    def compile(self, context):
+        lookup = self.lookup
+        field_timezone = (
+            timezone.get_current_timezone() if settings.USE_TZ else None
+        )
+
+        def represent(row):
+            value = row[lookup]
+            if not value:
+                return None
+            if field_timezone is not None:
+                value = value.astimezone(field_timezone)
+            elif timezone.is_aware(value):
+                value = timezone.make_naive(value, timezone.utc)
+            value = value.isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+        return represent
+
+
+class CompiledDecimalField(CompiledField):
+    """
+    Represent decimals, such as money amounts, as `DecimalField` does:
+    quantized to `decimal_places` and coerced to strings.
+    """
+
+    def __init__(self, lookup: str, max_digits: int, decimal_places: int):
+        super().__init__(lookup)
+        self.max_digits = max_digits
+        self.decimal_places = decimal_places
+
+    def compile(self, context):
+        lookup = self.lookup
+        exponent = decimal.Decimal(".1") ** self.decimal_places
+        decimal_context = decimal.getcontext().copy()
+        decimal_context.prec = self.max_digits
+        coerce_to_string = api_settings.COERCE_DECIMAL_TO_STRING
+
+        def represent(row):
+            value = row[lookup]
+            if value is None:
+                return None
+            if not isinstance(value, decimal.Decimal):
+                value = decimal.Decimal(str(value).strip())
+            value = value.quantize(
+                exponent,
+                rounding=decimal.ROUND_HALF_UP,
+                context=decimal_context,
+            )
+            return "{:f}".format(value) if coerce_to_string else value
+        return represent
+
+
+class CompiledHyperlinkField(CompiledField):
+    """
+    Represent hyperlinks to objects as `HyperlinkedRelatedField` and
+    `HyperlinkedIdentityField` do, for URLs identifying them by a UUID.
+
+    The URL is only reversed once per response, with a placeholder UUID
+    which is then replaced by the UUID of every row.
+    """
+    placeholder = "00000000-0000-4000-8000-000000000000"
+
+    def __init__(self, lookup: str, view_name: str, lookup_url_kwarg: str):
+        super().__init__(lookup)
+        self.view_name = view_name
+        self.lookup_url_kwarg = lookup_url_kwarg
+
+    def compile(self, context):
+        lookup = self.lookup
+        path = reverse(
+            self.view_name, kwargs={self.lookup_url_kwarg: self.placeholder}
+        )
+        url = context["request"].build_absolute_uri(path)
+        prefix, suffix = url.split(self.placeholder)
+
+        def represent(row):
+            value = row[lookup]
+            if value is None:
+                return None
+            return f"{prefix}{value}{suffix}"
+        return represent
+
+
+class CompiledMethodField(CompiledField):
+    """
+    Represent a value computed from several columns, like a
+    `SerializerMethodField`, with `get_function(context)` returning the
+    function computing it from their values.
+    """
+
+    def __init__(self, get_function: Callable, *lookups: str):
+        self.get_function = get_function
+        self._lookups = lookups
+
+    @property
+    def lookups(self):
+        return self._lookups
+
+    def compile(self, context):
+        lookups = self._lookups
+        function = self.get_function(context)
+        return lambda row: function(*[row[lookup] for lookup in lookups])
+
+
+class CompiledListSerializer:
+    """
+    Represent rows read with `.values()`, read-only, exactly as the DRF
+    serializer `serializer_class` represents the objects they were read from.
+
+    The DRF serializer builds field objects, reads attributes through every
+    relation and reverses hyperlinks for each object. Instead, the fields of
+    this serializer are compiled once per response into plain functions of a
+    row, keeping the output of `serializer_class`, which any change to it
+    must be reflected in.
+
+    Usage:
+
+        >>> class MyCompiledListSerializer(CompiledListSerializer):
+        >>>     serializer_class = MyListSerializer
+        >>>     fields = (
+        >>>         ("name", CompiledCharField("name")),
+        >>>         ("created_at", CompiledDateTimeField("created_at")),
+        >>>     )
+
+    """
+    serializer_class = None
+    # Pairs of the name of every field represented and its compiled field
+    fields: Tuple[Tuple[str, CompiledField], ...] = ()
+
+    def __init__(self, instance: Iterable[dict], context: dict = None):
+        self.instance = instance
+        self.context = context or {}
+
+    @classmethod
+    def get_lookups(cls) -> Tuple[str, ...]:
+        """
+        Get the field lookups to read with `.values()` for every row.
+        """
+        lookups = []
+        for _, field in cls.fields:
+            lookups += [
+                lookup for lookup in field.lookups if lookup not in lookups
+            ]
+        return tuple(lookups)
+
+    def compile(self) -> list:
+        return [
+            (name, field.compile(self.context)) for name, field in self.fields
+        ]
+
+    @property
+    @timed("serialize")
+    def data(self) -> list:
+        compiled = self.compile()
+        return [
+            {name: represent(row) for name, represent in compiled}
+            for row in self.instance
+        ]
+
+
+class CompiledListMixin:
+    """
+    Represent the results listed by GET requests with the view's
+    `compiled_serializer_class`, reading them with `.values()`, while any
+    other request is still served by `serializer_class`.
+
+    Usage:
+
+        >>> class MyListAPIView(CompiledListMixin, ListAPIView):
+        >>>     serializer_class = MyListSerializer
+        >>>     compiled_serializer_class = MyCompiledListSerializer
+
+    """
+    compiled_serializer_class = None
+
+    def is_compiled(self) -> bool:
+        return (
+            self.compiled_serializer_class is not None
+            and self.request.method in ("GET", "HEAD")
+        )
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.is_compiled():
+            return queryset
+        lookups = list(self.compiled_serializer_class.get_lookups())
+        # Paginators ordering by position also read it from the rows, and
+        # ordering by any column selected with `.extra()` must keep it.
+        for lookup in (
+            *getattr(self.paginator, "ordering", ()),
+            *queryset.query.extra_select,
+        ):
+            if lookup not in lookups:
+                lookups.append(lookup)
+        return queryset.values(*lookups)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.is_compiled() and kwargs.get("many"):
+            return self.compiled_serializer_class(
+                *args, context=self.get_serializer_context()
+            )
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,34 @@
+# Django
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Third-party
+from oauth2_provider.models import AccessToken
+
+# Local
+from common.authentication import get_access_token_cache
+
+
+@receiver(post_save, sender=AccessToken)
+@receiver(post_delete, sender=AccessToken)
+def invalidate_access_token(sender, instance=None, **kwargs):
+    """
+    Stop authenticating requests with the cached copies of an access token,
+    in every process, once it is modified or revoked, which deletes it.
+    """
+    get_access_token_cache().invalidate(instance.token)
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection=None, **kwargs):
+    """
+    Apply the `SQLITE_PRAGMAS` settings to every new SQLite connection, such
+    as write-ahead logging, so reads never wait for the writer.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
@@ -0,0 +1,188 @@
+# Python standard
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Iterable, List, Optional
+
+# Django
+from django.conf import settings
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+# Name of the view serving the request in the current context, if any
+current_view: ContextVar[Optional[str]] = ContextVar(
+    "current_view", default=None
+)
+
+NORMALIZE_PATTERNS = (
+    # Quoted literals, numbers and placeholders are all parameters
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    # Lists of any length are the same query
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+)
+# Steps of SQLite query plans reading every row of a table, unless they
+# scan one of its indexes, rather than searching it
+FULL_SCAN_PATTERN = re.compile(
+    r"^SCAN (?:TABLE )?(?P<table>\S+)(?P<index>.*)"
+)
+TEMP_SORT_PATTERN = re.compile(r"USE TEMP B-TREE")
+
+
+def normalize(sql: str) -> str:
+    """
+    Normalise SQL by replacing its parameters, so queries which only differ
+    by their values (e.g. the lot filtered by) are the same.
+    """
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint(sql: str) -> str:
+    return hashlib.sha1(normalize(sql).encode("utf-8")).hexdigest()[:16]
+
+
+def get_full_scans(plan: Iterable[str]) -> List[str]:
+    """
+    Get the tables a query plan reads in full.
+    """
+    tables = []
+    for step in plan:
+        match = FULL_SCAN_PATTERN.match(step.strip())
+        if match and "USING" not in match.group("index"):
+            tables.append(match.group("table"))
+    return tables
+
+
+class SlowQueryLog:
+    """
+    Log queries taking longer than `threshold` milliseconds, with the plan
+    the database executes them with, the view they were made by and their
+    fingerprint, as a warning and as a line of JSON appended to `path`.
+
+    Plans are explained with a new cursor on the same connection, in its
+    current transaction, so they use the same tables the query saw.
+    """
+
+    def __init__(self, threshold: float, path: Optional[str] = None):
+        self.threshold = threshold
+        self.path = path
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = (time.perf_counter() - start) * 1000
+        if duration >= self.threshold:
+            plan = None if many else self.explain(
+                context["connection"], sql, params
+            )
+            self.record(sql, duration, plan)
+        return result
+
+    @staticmethod
+    def explain(connection, sql: str, params) -> Optional[List[str]]:
+        if not sql.lstrip().upper().startswith("SELECT"):
+            return None
+        if not connection.features.supports_explaining_query_execution:
+            return None
+        prefix = connection.ops.explain_query_prefix()
+        cursor = connection.create_cursor()
+        try:
+            cursor.execute(f"{prefix} {sql}", params)
+            # The description of every step is the last column of its row
+            return [str(row[-1]) for row in cursor.fetchall()]
+        except Exception:
+            logger.exception("Could not explain the slow query.")
+            return None
+        finally:
+            cursor.close()
+
+    def record(self, sql: str, duration: float, plan: Optional[List[str]]):
+        entry = OrderedDict([
+            ("at", timezone.now().isoformat()),
+            ("fingerprint", fingerprint(sql)),
+            ("duration_ms", round(duration, 3)),
+            ("view", current_view.get()),
+            ("sql", normalize(sql)),
+            ("plan", plan),
+        ])
+        logger.warning(
+            "Slow query %s (%.1f ms) made by %s: %s\n%s",
+            entry["fingerprint"], duration, entry["view"], entry["sql"],
+            "\n".join(plan or ()),
+        )
+        if self.path is None:
+            return
+        with self.lock, open(self.path, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+
+
+def read_entries(path: str) -> Iterable[dict]:
+    """
+    Read the slow queries logged to `path`, skipping any line unfinished.
+    """
+    with open(path) as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def aggregate(entries: Iterable[dict]) -> List[dict]:
+    """
+    Aggregate slow queries logged by fingerprint, slowest in total first.
+    """
+    queries = {}
+    for entry in entries:
+        query = queries.get(entry["fingerprint"])
+        if query is None:
+            query = queries[entry["fingerprint"]] = {
+                "fingerprint": entry["fingerprint"],
+                "sql": entry["sql"],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "views": set(),
+                "plan": None,
+            }
+        query["count"] += 1
+        query["total_ms"] += entry["duration_ms"]
+        query["max_ms"] = max(query["max_ms"], entry["duration_ms"])
+        if entry["view"]:
+            query["views"].add(entry["view"])
+        # Keep the latest plan, as indexes may have been added since
+        if entry["plan"] is not None:
+            query["plan"] = entry["plan"]
+    for query in queries.values():
+        query["views"] = sorted(query["views"])
+        query["full_scans"] = get_full_scans(query["plan"] or ())
+        query["temp_sort"] = any(
+            TEMP_SORT_PATTERN.search(step) for step in query["plan"] or ()
+        )
+    return sorted(
+        queries.values(), key=lambda query: query["total_ms"], reverse=True
+    )
+
+
+def get_slow_query_log() -> Optional[SlowQueryLog]:
+    """
+    Get the slow query log configured by the `SLOW_QUERY_*` settings, if
+    enabled.
+    """
+    if settings.SLOW_QUERY_THRESHOLD is None:
+        return None
+    return SlowQueryLog(
+        settings.SLOW_QUERY_THRESHOLD, settings.SLOW_QUERY_LOG_FILE
+    )
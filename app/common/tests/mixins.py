@@ -1,12 +1,14 @@
 # Python standard
 import urllib
 from datetime import timedelta
-from typing import Callable
+from typing import Any, Callable
 
 # Django
 from django.conf import settings
 from django.conf.global_settings import AUTH_USER_MODEL
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -57,6 +59,7 @@ class APITestMethodsGenerator:
         """
         cls.generate_methods_for_unauthenticated_user_request(klass)
         cls.generate_methods_for_http_methods_not_allowed(klass)
+        cls.generate_methods_for_query_count(klass)
 
     @classmethod
     def generate_methods_for_unauthenticated_user_request(cls, klass):
@@ -82,6 +85,20 @@ class APITestMethodsGenerator:
             test_scenario = cls.not_allowed_method_test_factory(http_method)
             cls.add_test_scenario(klass, test_scenario)
 
+    @classmethod
+    def generate_methods_for_query_count(cls, klass):
+        """
+        Create and attach a test method checking that the number of queries
+        made by a GET request does not grow with the amount of objects
+        returned, for endpoints whose test case defines how to create them
+        with `create_listed_objects`.
+        """
+        if (
+            "get" in klass.get_supported_http_methods()
+            and hasattr(klass, "create_listed_objects")
+        ):
+            cls.add_test_scenario(klass, cls.query_count_test_factory())
+
     @staticmethod
     def unauthenticated_method_test_factory(http_method: str) -> Callable:
         """
@@ -130,6 +147,26 @@ class APITestMethodsGenerator:
         )
         return test_method
 
+    @staticmethod
+    def query_count_test_factory() -> Callable:
+        """
+        Generates a function to test that the queries made by an
+        authenticated GET request do not grow with the objects returned.
+        """
+        def _query_count_test(self):
+            http_auth = self.get_http_authorization()
+            self.assert_query_count_is_constant(
+                "get",
+                self.create_listed_objects,
+                HTTP_AUTHORIZATION=http_auth
+            )
+
+        test_method = _query_count_test
+        test_method.__name__ = (
+            'test_get_request_query_count_does_not_grow_with_results'
+        )
+        return test_method
+
 
 class BaseAPIEndpointTestCase(APITestMethodsGenerator, TestCase):
     """
@@ -145,6 +182,11 @@ class BaseAPIEndpointTestCase(APITestMethodsGenerator, TestCase):
     . `get_http_authorization`: provide request header authorization credentials
     . `setUp`: set up method to be ran once for each individual test method
     . `make_request`: utility method to simplify requests to specified endpoint
+    . `assert_query_count_is_constant`: fail if a request makes more queries
+      the more objects it returns
+
+    Collection endpoints can also define `create_listed_objects(amount)`, so
+    a test is generated checking their queries do not grow with page size.
 
     Usage:
 
@@ -203,6 +245,38 @@ class BaseAPIEndpointTestCase(APITestMethodsGenerator, TestCase):
         client_method = getattr(self.client, method)
         return client_method(url, *args, **kwargs)
 
+    def assert_query_count_is_constant(
+        self,
+        method: str,
+        create_objects: Callable[[int], Any],
+        *args,
+        amounts: tuple = (1, 10),
+        **kwargs
+    ):
+        """
+        Make the same request after creating increasing amounts of the
+        objects it returns, and fail if the number of queries made changes.
+
+        `create_objects` is called with the number of objects to add before
+        each request. Any other arguments are passed to `make_request`. A
+        first request is made unmeasured, so the access token is cached.
+        """
+        self.make_request(method, *args, **kwargs)
+        query_counts = {}
+        created = 0
+        for amount in amounts:
+            create_objects(amount - created)
+            created = amount
+            with CaptureQueriesContext(connection) as queries:
+                response = self.make_request(method, *args, **kwargs)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            query_counts[amount] = len(queries)
+        self.assertEqual(
+            len(set(query_counts.values())),
+            1,
+            msg=f"Queries made per amount of objects: {query_counts}"
+        )
+
     def setUp(self):
         super().setUp()
         self.auth_user = AuthUserFactory()
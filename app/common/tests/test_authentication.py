@@ -0,0 +1,126 @@
+# Python standard
+from datetime import timedelta
+
+# Django
+from django.utils import timezone
+from freezegun import freeze_time
+from oauth2_provider.models import AccessToken
+from rest_framework import status
+
+# Local
+from common.authentication import AccessTokenCache
+from common.tests.mixins import BaseAPIEndpointTestCase
+
+
+class TestCachedOAuth2Authentication(BaseAPIEndpointTestCase):
+    url = "api:account:v1:user_list"
+    supported_methods = {"get"}
+
+    def setUp(self):
+        super().setUp()
+        self.http_auth = self.get_http_authorization(self.auth_user)
+
+    def get_my_profile(self):
+        return self.client.get(
+            "/api/account/v1/users/me/", HTTP_AUTHORIZATION=self.http_auth
+        )
+
+    def test_token_is_fetched_with_user_and_profile_once(self):
+        with self.assertNumQueries(1):
+            response = self.get_my_profile()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["public_id"],
+            str(self.auth_user.user_profile.public_id)
+        )
+        with self.assertNumQueries(0):
+            response = self.get_my_profile()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_revoked_token_is_no_longer_authenticated(self):
+        self.get_my_profile()
+        AccessToken.objects.get(token="secret-access-token-key").revoke()
+        response = self.get_my_profile()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expired_token_is_no_longer_authenticated(self):
+        self.get_my_profile()
+        with freeze_time(timezone.now() + timedelta(seconds=301)):
+            response = self.get_my_profile()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_token_is_not_authenticated(self):
+        response = self.client.get(
+            "/api/account/v1/users/me/", HTTP_AUTHORIZATION="Bearer invalid"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TestAccessTokenCache(BaseAPIEndpointTestCase):
+    url = "api:account:v1:user_list"
+    supported_methods = {"get"}
+
+    def setUp(self):
+        super().setUp()
+        self.token_cache = AccessTokenCache(
+            max_entries=2, timeout=60, alias="default"
+        )
+
+    def create_access_token(self, token: str, expires_in: int = 300):
+        return AccessToken(
+            token=token,
+            expires=timezone.now() + timedelta(seconds=expires_in),
+        )
+
+    def cache_access_token(self, access_token: AccessToken):
+        version = self.token_cache.get_version(access_token.token)
+        self.token_cache.set(access_token, version)
+
+    def test_least_recently_used_token_is_evicted(self):
+        for token in ("first", "second"):
+            self.cache_access_token(self.create_access_token(token))
+        self.token_cache.get("first")
+        self.cache_access_token(self.create_access_token("third"))
+        self.assertIsNotNone(self.token_cache.get("first"))
+        self.assertIsNone(self.token_cache.get("second"))
+        self.assertIsNotNone(self.token_cache.get("third"))
+
+    def test_tokens_are_cached_until_timeout_at_most(self):
+        self.cache_access_token(
+            self.create_access_token("token", expires_in=3600)
+        )
+        with freeze_time(timezone.now() + timedelta(seconds=61)):
+            self.assertIsNone(self.token_cache.get("token"))
+
+    def test_tokens_revoked_by_another_process_are_not_used(self):
+        access_token = AccessToken.objects.create(
+            user=self.auth_user,
+            token="other-access-token-key",
+            expires=timezone.now() + timedelta(seconds=300),
+        )
+        # Cached by another worker, sharing only the versions of tokens
+        self.cache_access_token(access_token)
+        self.assertIsNotNone(self.token_cache.get(access_token.token))
+        access_token.revoke()
+        self.assertIsNone(self.token_cache.get(access_token.token))
+
+    def test_every_lookup_gets_its_own_instances(self):
+        access_token = AccessToken.objects.select_related(
+            "user__user_profile"
+        ).get(pk=AccessToken.objects.create(
+            user=self.auth_user,
+            token="other-access-token-key",
+            expires=timezone.now() + timedelta(seconds=300),
+        ).pk)
+        self.cache_access_token(access_token)
+        first = self.token_cache.get(access_token.token)
+        first.user.first_name = "Changed"
+        second = self.token_cache.get(access_token.token)
+        self.assertIsNot(first.user, second.user)
+        self.assertEqual(second.user.first_name, self.auth_user.first_name)
+        self.assertEqual(second.user, self.auth_user)
+        # The profile is built with the user, so it is never queried
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                second.user.user_profile, self.auth_user.user_profile
+            )
@@ -0,0 +1,49 @@
+# Django
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+# Local
+from common.checks import check_shared_caches
+
+
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.memcached.MemcachedCache",
+        "LOCATION": "127.0.0.1:11211",
+    },
+}
+
+
+class TestCheckSharedCaches(SimpleTestCase):
+
+    @override_settings(WEB_CONCURRENCY=1)
+    def test_process_caches_are_allowed_for_a_single_worker(self):
+        check_shared_caches()
+
+    @override_settings(WEB_CONCURRENCY=4)
+    def test_process_caches_are_refused_for_several_workers(self):
+        with self.assertRaisesMessage(
+            ImproperlyConfigured, "ACCESS_TOKEN_CACHE_ALIAS names the cache"
+        ):
+            check_shared_caches()
+
+    @override_settings(
+        WEB_CONCURRENCY=4,
+        CACHES={
+            **SHARED_CACHES,
+            "process": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+        READ_YOUR_WRITES_CACHE_ALIAS="process",
+    )
+    def test_read_your_writes_cache_is_refused_for_several_workers(self):
+        with self.assertRaisesMessage(
+            ImproperlyConfigured,
+            "READ_YOUR_WRITES_CACHE_ALIAS names the cache 'process'",
+        ):
+            check_shared_caches()
+
+    @override_settings(WEB_CONCURRENCY=4, CACHES=SHARED_CACHES)
+    def test_shared_caches_are_allowed_for_several_workers(self):
+        check_shared_caches()
@@ -0,0 +1,95 @@
+# Python standard
+import threading
+import time
+
+# Django
+from django.http import HttpResponse
+from django.test import SimpleTestCase
+
+# Local
+from common.idempotency import (
+    IdempotencyKeyInFlight,
+    IdempotencyKeyReused,
+    IdempotencyStore,
+    StoredResponse,
+)
+
+
+class TestIdempotencyStore(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.store = IdempotencyStore(
+            "idempotency", 60, wait_timeout=2, in_flight_timeout=30
+        )
+        self.addCleanup(self.store.cache.clear)
+        self.response = HttpResponse(
+            b'{"price":"12.00"}', status=201, content_type="application/json"
+        )
+        self.response["Location"] = "/api/auction/v1/bids/1"
+
+    def test_completed_requests_are_replayed(self):
+        self.assertIsNone(self.store.begin("key", "fingerprint"))
+        self.store.complete("key", "fingerprint", self.response)
+        self.assertEqual(
+            self.store.begin("key", "fingerprint"),
+            StoredResponse(
+                201,
+                "application/json",
+                "/api/auction/v1/bids/1",
+                b'{"price":"12.00"}',
+            ),
+        )
+
+    def test_released_requests_are_executed_again(self):
+        self.store.begin("key", "fingerprint")
+        self.store.release("key")
+        self.assertIsNone(self.store.begin("key", "fingerprint"))
+
+    def test_keys_cannot_be_reused_for_other_requests(self):
+        self.store.begin("key", "fingerprint")
+        with self.assertRaises(IdempotencyKeyReused):
+            self.store.begin("key", "other fingerprint")
+
+    def test_requests_in_flight_for_too_long_conflict(self):
+        self.store.begin("key", "fingerprint")
+        self.store.wait_timeout = 0.05
+        with self.assertRaises(IdempotencyKeyInFlight):
+            self.store.begin("key", "fingerprint")
+
+    def test_requests_in_flight_for_longer_than_the_wait_are_not_repeated(
+        self
+    ):
+        self.store.wait_timeout = 0.05
+        self.store.begin("key", "fingerprint")
+        # The first request outlives how long duplicates wait for it
+        time.sleep(0.1)
+        with self.assertRaises(IdempotencyKeyInFlight):
+            self.store.begin("key", "fingerprint")
+        self.store.complete("key", "fingerprint", self.response)
+        self.assertEqual(
+            self.store.begin("key", "fingerprint").content,
+            b'{"price":"12.00"}',
+        )
+
+    def test_concurrent_duplicates_wait_for_the_first_request(self):
+        executed = []
+        replayed = []
+        started = threading.Barrier(8)
+
+        def request():
+            started.wait()
+            stored = self.store.begin("key", "fingerprint")
+            if stored is None:
+                executed.append(True)
+                self.store.complete("key", "fingerprint", self.response)
+            else:
+                replayed.append(stored.content)
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(executed), 1)
+        self.assertEqual(replayed, [b'{"price":"12.00"}'] * 7)
@@ -0,0 +1,169 @@
+# Python standard
+import atexit
+import multiprocessing
+import tempfile
+import threading
+from datetime import timedelta
+
+# Django
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+# Third-party
+from rest_framework import status
+
+# Local
+from auction.api.v1.tests.factories import LotFactory
+from auction.models import Auction
+from common.metrics import MetricsRegistry
+
+
+def record_in_another_process(directory: str):
+    registry = MetricsRegistry(directory)
+    registry.counter("bids_total", "Bids.", ["outcome"]).inc(
+        3, outcome="accepted"
+    )
+    registry.flush()
+
+
+class TestMetricsRegistry(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.registry = MetricsRegistry()
+        self.bids = self.registry.counter("bids_total", "Bids.", ["outcome"])
+
+    def test_metrics_are_exposed_in_prometheus_text_format(self):
+        durations = self.registry.histogram(
+            "duration_seconds", "Durations.", ["view"], buckets=[0.1, 1]
+        )
+        self.bids.inc(outcome="accepted")
+        self.bids.inc(2, outcome='re"jected')
+        durations.observe(0.1, view="LotList")
+        durations.observe(0.5, view="LotList")
+        durations.observe(2, view="LotList")
+        self.registry.gauge("active", "Active auctions.", lambda: 7)
+        self.assertEqual(self.registry.expose(), "\n".join([
+            "# HELP bids_total Bids.",
+            "# TYPE bids_total counter",
+            'bids_total{outcome="accepted"} 1.0',
+            'bids_total{outcome="re\\"jected"} 2.0',
+            "# HELP duration_seconds Durations.",
+            "# TYPE duration_seconds histogram",
+            'duration_seconds_bucket{view="LotList",le="0.1"} 1',
+            'duration_seconds_bucket{view="LotList",le="1.0"} 2',
+            'duration_seconds_bucket{view="LotList",le="+Inf"} 3',
+            'duration_seconds_sum{view="LotList"} 2.6',
+            'duration_seconds_count{view="LotList"} 3',
+            "# HELP active Active auctions.",
+            "# TYPE active gauge",
+            "active 7.0",
+        ]) + "\n")
+
+    def test_metrics_are_registered_once_by_name(self):
+        self.assertIs(
+            self.registry.counter("bids_total", "Bids.", ["outcome"]),
+            self.bids,
+        )
+        with self.assertRaises(ValueError):
+            self.registry.histogram("bids_total", "Bids.")
+        with self.assertRaises(ValueError):
+            self.bids.inc(user="1")
+
+    def test_values_recorded_by_concurrent_threads_add_up(self):
+        def bid():
+            for _ in range(1000):
+                self.bids.inc(outcome="accepted")
+
+        threads = [threading.Thread(target=bid) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.bids.collect(), {("accepted",): 16000})
+
+    def test_values_of_every_process_add_up(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        registry = MetricsRegistry(directory.name)
+        bids = registry.counter("bids_total", "Bids.", ["outcome"])
+        bids.inc(outcome="accepted")
+        bids.inc(outcome="rejected")
+        registry.flush()
+        process = multiprocessing.get_context("fork").Process(
+            target=record_in_another_process, args=(directory.name,)
+        )
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+        # Values of this process are read from memory, not its own file
+        bids.inc(outcome="accepted")
+        self.assertEqual(registry.collect()["bids_total"], {
+            ("accepted",): 5,
+            ("rejected",): 1,
+        })
+
+    def test_values_of_exited_processes_are_kept_when_pids_are_reused(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        exited = MetricsRegistry(directory.name)
+        exited.counter("bids_total", "Bids.", ["outcome"]).inc(
+            3, outcome="accepted"
+        )
+        exited.flush()
+        # A process started later, with the same pid as the one which exited
+        registry = MetricsRegistry(directory.name)
+        bids = registry.counter("bids_total", "Bids.", ["outcome"])
+        bids.inc(outcome="accepted")
+        registry.flush()
+        self.assertEqual(
+            registry.collect()["bids_total"], {("accepted",): 4}
+        )
+
+    def test_processes_forked_after_recording_start_over(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        registry = MetricsRegistry(directory.name)
+        bids = registry.counter("bids_total", "Bids.", ["outcome"])
+        registry.start_flushing(3600)
+        self.addCleanup(atexit.unregister, registry.flush_on_exit)
+        bids.inc(outcome="accepted")
+        parent_flusher = registry.flusher
+
+        def bid():
+            bids.inc(3, outcome="accepted")
+            # Flushed by a flusher of its own
+            if registry.flusher in (None, parent_flusher):
+                raise SystemExit(1)
+            registry.flush()
+
+        process = multiprocessing.get_context("fork").Process(target=bid)
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(
+            registry.collect()["bids_total"], {("accepted",): 4}
+        )
+
+
+class TestMetricsEndpoint(TestCase):
+
+    def test_metrics_are_scraped_from_allowed_addresses(self):
+        LotFactory(auction__expires_at=timezone.now() + timedelta(days=1))
+        LotFactory(auction__expires_at=timezone.now() - timedelta(days=1))
+        LotFactory(auction__status=Auction.CLOSED)
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Type"],
+            "text/plain; version=0.0.4; charset=utf-8",
+        )
+        content = response.content.decode()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", content)
+        self.assertIn("# TYPE auction_bids_total counter", content)
+        self.assertIn("\nauction_active_auctions 1.0\n", content)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"])
+    def test_metrics_cannot_be_scraped_from_other_addresses(self):
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,78 @@
+# Python standard
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+# Django
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+
+# Third-party
+from rest_framework.renderers import JSONRenderer
+
+# Local
+from common.renderers import FastJSONRenderer, JSONFragment
+
+
+class TestFastJSONRenderer(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.data = OrderedDict([
+            ("public_id", uuid.UUID("835d0415-4a38-4f53-bb15-1339b4d825ba")),
+            ("price", Decimal("12.50")),
+            ("created_at", datetime(2020, 4, 18, 4, 35, 1, 123456,
+                                    tzinfo=timezone.utc)),
+            ("expires_at", datetime(2020, 4, 18, 4, 35, 1,
+                                    tzinfo=timezone(timedelta(hours=1)))),
+            ("day", date(2020, 4, 18)),
+            ("time", time(4, 35)),
+            ("duration", timedelta(minutes=5)),
+            ("label", gettext_lazy("Used")),
+            ("name", "Gramophone \u2028 café"),
+            ("bids", [{"price": Decimal("1"), "user": None}]),
+            ("count", 3),
+            ("is_active", True),
+        ])
+
+    def test_output_matches_json_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data),
+            JSONRenderer().render(self.data),
+        )
+
+    def test_indented_output_matches_json_renderer(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, media_type),
+            JSONRenderer().render(self.data, media_type),
+        )
+
+    def test_fragments_are_spliced_without_encoding(self):
+        fragment = JSONFragment(JSONRenderer().render(self.data))
+        self.assertEqual(
+            FastJSONRenderer().render({"results": [fragment, fragment]}),
+            JSONRenderer().render({"results": [self.data, self.data]}),
+        )
+        self.assertEqual(
+            FastJSONRenderer().render(fragment),
+            JSONRenderer().render(self.data),
+        )
+
+    def test_fragments_are_decoded_for_indented_output(self):
+        media_type = "application/json; indent=2"
+        fragment = JSONFragment('{"name":"Gramophone"}')
+        self.assertEqual(
+            FastJSONRenderer().render([fragment], media_type),
+            JSONRenderer().render([{"name": "Gramophone"}], media_type),
+        )
+
+    def test_strings_resembling_fragments_are_kept(self):
+        data = {"name": "0:0", "fragment": JSONFragment("[1]")}
+        self.assertEqual(
+            FastJSONRenderer().render(data), b'{"name":"0:0","fragment":[1]}'
+        )
+
+    def test_none_renders_nothing(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
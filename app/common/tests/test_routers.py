@@ -0,0 +1,122 @@
+# Python standard
+import os
+import sqlite3
+import tempfile
+
+# Django
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, override_settings,
+)
+
+# Third-party
+from oauth2_provider.models import AccessToken
+
+# Local
+from auction.models import Lot
+from common.middleware import ReplicaReadMiddleware
+from common.replication import SQLiteReplicator
+from common.routers import (
+    PrimaryReplicaRouter, read_from_replicas, use_primary,
+)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class TestPrimaryReplicaRouter(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_are_from_the_primary_unless_allowed(self):
+        self.assertEqual(self.router.db_for_read(Lot), "default")
+        with read_from_replicas():
+            self.assertEqual(self.router.db_for_read(Lot), "replica")
+            with read_from_replicas(False):
+                self.assertEqual(self.router.db_for_read(Lot), "default")
+
+    def test_primary_apps_are_read_from_the_primary(self):
+        with read_from_replicas():
+            self.assertEqual(self.router.db_for_read(AccessToken), "default")
+
+    def test_writes_are_to_the_primary(self):
+        with read_from_replicas():
+            self.assertEqual(self.router.db_for_write(Lot), "default")
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class TestPrimaryReplicaRouterInTransaction(TestCase):
+
+    def test_reads_within_transactions_are_from_the_primary(self):
+        # Test cases are run within a transaction on the primary
+        with read_from_replicas():
+            self.assertEqual(
+                PrimaryReplicaRouter().db_for_read(Lot), "default"
+            )
+
+
+@override_settings(
+    READ_YOUR_WRITES_WINDOW=5, READ_YOUR_WRITES_CACHE_ALIAS="default"
+)
+class TestReplicaReadMiddleware(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.allowed = []
+
+        def get_response(request):
+            self.allowed.append(not use_primary.get())
+            return HttpResponse()
+        self.middleware = ReplicaReadMiddleware(get_response)
+        self.addCleanup(self.middleware.cache.clear)
+
+    def test_safe_requests_read_from_replicas(self):
+        self.middleware(self.factory.get("/", HTTP_AUTHORIZATION="Bearer a"))
+        self.middleware(self.factory.post("/", HTTP_AUTHORIZATION="Bearer a"))
+        self.assertEqual(self.allowed, [True, False])
+        self.assertTrue(use_primary.get())
+
+    def test_clients_writing_are_pinned_to_the_primary(self):
+        self.middleware(self.factory.post("/", HTTP_AUTHORIZATION="Bearer a"))
+        self.middleware(self.factory.get("/", HTTP_AUTHORIZATION="Bearer a"))
+        self.middleware(self.factory.get("/", HTTP_AUTHORIZATION="Bearer b"))
+        self.assertEqual(self.allowed, [False, False, True])
+
+    def test_pins_expire_after_the_window(self):
+        with self.settings(READ_YOUR_WRITES_WINDOW=0):
+            self.middleware(self.factory.post("/"))
+        self.middleware(self.factory.get("/"))
+        self.assertEqual(self.allowed, [False, True])
+
+
+class TestSQLiteReplicator(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.primary = os.path.join(directory.name, "primary.sqlite3")
+        self.replica = os.path.join(directory.name, "replica.sqlite3")
+        self.replicator = SQLiteReplicator(self.primary, [self.replica])
+
+    def execute(self, database: str, sql: str) -> list:
+        connection = sqlite3.connect(database)
+        try:
+            with connection:
+                return connection.execute(sql).fetchall()
+        finally:
+            connection.close()
+
+    def test_replicas_lag_until_replicated(self):
+        self.execute(self.primary, "CREATE TABLE bid (price INTEGER)")
+        self.execute(self.primary, "INSERT INTO bid VALUES (1)")
+        self.replicator.replicate()
+        self.execute(self.primary, "INSERT INTO bid VALUES (2)")
+        self.assertEqual(
+            self.execute(self.replica, "SELECT * FROM bid"), [(1,)]
+        )
+        self.replicator.replicate()
+        self.assertEqual(
+            self.execute(self.replica, "SELECT * FROM bid"), [(1,), (2,)]
+        )
@@ -0,0 +1,13 @@
+# Django
+from django.db import connection
+from django.test import TestCase
+
+
+class TestConfigureSQLiteConnection(TestCase):
+
+    def test_connections_use_write_ahead_logging(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 20000)
@@ -0,0 +1,122 @@
+# Python standard
+import io
+import json
+import os
+import tempfile
+
+# Django
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+# Third-party
+from rest_framework import status
+
+# Local
+from auction.api.v1.tests.factories import LotFactory
+from common.slow_queries import (
+    aggregate,
+    fingerprint,
+    get_full_scans,
+    normalize,
+    read_entries,
+)
+from common.tests.mixins import BaseAPIEndpointTestCase
+
+
+class TestNormalize(SimpleTestCase):
+
+    def test_queries_only_differing_by_values_are_the_same(self):
+        sql = (
+            'SELECT "auction_lot"."id" FROM "auction_lot" WHERE '
+            '("auction_lot"."name" = \'Gramophone\' AND "auction_lot"."id" '
+            'IN (%s, %s, %s))  LIMIT 21'
+        )
+        self.assertEqual(
+            normalize(sql),
+            'SELECT "auction_lot"."id" FROM "auction_lot" WHERE '
+            '("auction_lot"."name" = ? AND "auction_lot"."id" IN (...)) '
+            'LIMIT ?',
+        )
+        self.assertEqual(
+            fingerprint(sql),
+            fingerprint(sql.replace("'Gramophone'", "'Radio'")
+                        .replace("(%s, %s, %s)", "(%s)")
+                        .replace("21", "101")),
+        )
+
+    def test_full_scans_are_found_in_sqlite_query_plans(self):
+        self.assertEqual(get_full_scans([
+            "SCAN auction_lot",
+            "SEARCH auction_auction USING INTEGER PRIMARY KEY (rowid=?)",
+            "SCAN auction_bid USING INDEX auction_bid_auction_id",
+            "SCAN TABLE account_userprofile",
+            "SCAN auction_auction USING COVERING INDEX auction_expires",
+            "USE TEMP B-TREE FOR ORDER BY",
+        ]), ["auction_lot", "account_userprofile"])
+
+
+@override_settings(SLOW_QUERY_THRESHOLD=0)
+class TestSlowQueryLogMiddleware(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:list_create"
+    supported_methods = {"get", "post"}
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "slow_queries.jsonl")
+        LotFactory.create_batch(3)
+        self.http_auth = self.get_http_authorization(self.auth_user)
+
+    def list_lots(self, ordering: str):
+        with self.settings(SLOW_QUERY_LOG_FILE=self.path), \
+                self.assertLogs("common.slow_queries", "WARNING"):
+            response = self.make_request(
+                "get",
+                query_params={"ordering": ordering},
+                HTTP_AUTHORIZATION=self.http_auth,
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_queries_are_logged_with_their_view_and_plan(self):
+        self.list_lots("name")
+        entries = list(read_entries(self.path))
+        self.assertTrue(entries)
+        lots = [
+            entry for entry in entries if entry["view"] == "LotListAPIView"
+        ]
+        self.assertTrue(lots)
+        for entry in lots:
+            self.assertEqual(entry["fingerprint"], fingerprint(entry["sql"]))
+            self.assertIsInstance(entry["duration_ms"], float)
+        # Ordering lots by name reads every lot, and sorts them
+        [query] = [
+            query for query in aggregate(lots)
+            if 'ORDER BY "auction_lot"."name"' in query["sql"]
+        ]
+        self.assertIn("auction_lot", query["full_scans"])
+        self.assertTrue(query["temp_sort"])
+
+    def test_queries_are_aggregated_by_fingerprint(self):
+        self.list_lots("name")
+        self.list_lots("-name")
+        self.list_lots("name")
+        queries = aggregate(read_entries(self.path))
+        counts = {query["sql"]: query["count"] for query in queries}
+        self.assertEqual(len(queries), len(counts))
+        self.assertIn(2, counts.values())
+        self.assertEqual(
+            [query["total_ms"] for query in queries],
+            sorted((query["total_ms"] for query in queries), reverse=True),
+        )
+
+        stdout = io.StringIO()
+        call_command(
+            "slow_queries", file=self.path, full_scans=True, json=True,
+            stdout=stdout,
+        )
+        reported = json.loads(stdout.getvalue())
+        self.assertTrue(reported)
+        for query in reported:
+            self.assertTrue(query["full_scans"])
+            self.assertEqual(query["views"], ["LotListAPIView"])
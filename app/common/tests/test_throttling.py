@@ -0,0 +1,126 @@
+# Python standard
+import multiprocessing
+import os
+import tempfile
+from unittest import mock
+
+# Django
+from django.test import SimpleTestCase
+
+# Local
+from common.throttling import SharedTokenBuckets
+
+
+def take_tokens(path: str, amount: int):
+    buckets = SharedTokenBuckets(64, path)
+    for _ in range(amount):
+        buckets.acquire("bid_user:1", 1, 100)
+
+
+class TestSharedTokenBuckets(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch("common.throttling.time.time")
+        self.time = patcher.start()
+        self.time.return_value = 1_700_000_000.0
+        self.addCleanup(patcher.stop)
+        self.buckets = SharedTokenBuckets(64)
+
+    def test_bursts_are_allowed_up_to_the_capacity(self):
+        for _ in range(3):
+            self.assertEqual(self.buckets.acquire("bid_user:1", 2, 3), 0)
+        self.assertEqual(self.buckets.acquire("bid_user:1", 2, 3), 0.5)
+        # Other keys have their own bucket
+        self.assertEqual(self.buckets.acquire("bid_user:2", 2, 3), 0)
+
+    def test_buckets_are_refilled_at_their_rate(self):
+        for _ in range(3):
+            self.buckets.acquire("bid_user:1", 2, 3)
+        self.time.return_value += 0.25
+        self.assertEqual(self.buckets.acquire("bid_user:1", 2, 3), 0.25)
+        self.time.return_value += 0.25
+        self.assertEqual(self.buckets.acquire("bid_user:1", 2, 3), 0)
+        # Never beyond their capacity
+        self.time.return_value += 60
+        for _ in range(3):
+            self.assertEqual(self.buckets.acquire("bid_user:1", 2, 3), 0)
+        self.assertGreater(self.buckets.acquire("bid_user:1", 2, 3), 0)
+
+    def test_tokens_are_only_taken_if_every_bucket_has_one(self):
+        buckets = [("bid_user:1", 1, 3), ("bid_user_lot:1:1", 0.5, 1)]
+        self.assertEqual(self.buckets.acquire_all(buckets), 0)
+        self.assertEqual(self.buckets.acquire_all(buckets), 2)
+        self.assertEqual(self.buckets.acquire_all(buckets), 2)
+        # The user's bucket was not used by the bids rejected
+        self.assertEqual(self.buckets.acquire("bid_user:1", 1, 3), 0)
+        self.assertEqual(self.buckets.acquire("bid_user:1", 1, 3), 0)
+        self.assertEqual(self.buckets.acquire("bid_user:1", 1, 3), 1)
+
+    def test_least_recently_used_buckets_are_forgotten_when_full(self):
+        buckets = SharedTokenBuckets(1)
+        self.assertEqual(buckets.ways, 4)
+        buckets.acquire("bid_user:0", 1, 1)
+        for number in range(1, 5):
+            self.time.return_value += 1
+            buckets.acquire(f"bid_user:{number}", 1, 1)
+        # The first bucket was replaced by the last, so starts full again
+        self.time.return_value += 0.5
+        self.assertEqual(buckets.acquire("bid_user:0", 1, 1), 0)
+        self.assertEqual(buckets.acquire("bid_user:4", 1, 1), 0.5)
+
+    def test_buckets_are_shared_by_processes_mapping_the_same_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "token-buckets")
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=take_tokens, args=(path, 25))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        # Every process took from the same bucket, of 100 tokens
+        buckets = SharedTokenBuckets(64, path)
+        self.assertEqual(buckets.acquire("bid_user:1", 1, 100), 1)
+
+    def test_files_other_users_can_access_are_refused(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "token-buckets")
+        SharedTokenBuckets(64, path)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+        os.chmod(path, 0o666)
+        with self.assertRaises(PermissionError):
+            SharedTokenBuckets(64, path)
+
+    def test_files_of_other_users_are_refused(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "token-buckets")
+        SharedTokenBuckets(64, path)
+        with mock.patch(
+            "common.throttling.os.getuid", return_value=os.getuid() + 1
+        ), self.assertRaises(PermissionError):
+            SharedTokenBuckets(64, path)
+
+    def test_buckets_counted_in_the_future_are_full(self):
+        # Left by a clock since set back, or by the monotonic clock of a
+        # process from before the host restarted
+        key_hash = self.buckets.hash("bid_user:1")
+        start = key_hash % self.buckets.groups * self.buckets.group_size
+        self.buckets.slot.pack_into(
+            self.buckets.memory, start, key_hash, 0.0,
+            self.time.return_value + 3600,
+        )
+        self.assertEqual(self.buckets.acquire("bid_user:1", 1, 2), 0)
+        self.assertEqual(self.buckets.acquire("bid_user:1", 1, 2), 0)
+        self.assertEqual(self.buckets.acquire("bid_user:1", 1, 2), 1)
+
+    def test_buckets_can_be_cleared(self):
+        self.buckets.acquire("bid_user:1", 1, 1)
+        self.buckets.clear()
+        self.assertEqual(self.buckets.acquire("bid_user:1", 1, 1), 0)
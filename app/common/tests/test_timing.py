@@ -0,0 +1,99 @@
+# Python standard
+import json
+
+# Django
+from django.test import SimpleTestCase, override_settings
+
+# Third-party
+from rest_framework import status
+
+# Local
+from auction.api.v1.tests.factories import BidFactory, LotFactory
+from common.tests.mixins import BaseAPIEndpointTestCase
+from common.timing import RequestTimings, current_timings, timed
+
+
+class TestRequestTimings(SimpleTestCase):
+
+    def test_phases_measured_within_themselves_are_counted_once(self):
+        timings = RequestTimings()
+        with timings.measure("serialize"):
+            with timings.measure("db"), timings.measure("serialize"):
+                pass
+        with timings.measure("db"):
+            pass
+        self.assertEqual(timings.counts, {"db": 2, "serialize": 1})
+        self.assertRegex(
+            timings.as_header(),
+            r'^db;dur=[0-9.]+;desc="2", serialize;dur=[0-9.]+;desc="1"$',
+        )
+
+    def test_functions_are_only_measured_while_instrumented(self):
+        @timed("render")
+        def render():
+            return "rendered"
+
+        self.assertEqual(render(), "rendered")
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            self.assertEqual(render(), "rendered")
+        finally:
+            current_timings.reset(token)
+        self.assertEqual(timings.counts, {"render": 1})
+
+
+@override_settings(SERVER_TIMING=True, SERVER_TIMING_LOG=True)
+class TestServerTimingMiddleware(BaseAPIEndpointTestCase):
+    url = "api:auction:v1:lots:retrieve_update_destroy"
+    supported_methods = {"get", "put", "patch", "delete"}
+
+    def setUp(self):
+        super().setUp()
+        self.lot = LotFactory()
+        BidFactory(auction=self.lot.auction)
+        self.url_args = [self.lot.public_id]
+        self.http_auth = self.get_http_authorization(self.auth_user)
+
+    def get_phases(self, response) -> dict:
+        phases = {}
+        for metric in response["Server-Timing"].split(", "):
+            name, duration, description = metric.split(";")
+            phases[name] = int(description[len('desc="'):-1])
+        return phases
+
+    def test_every_phase_of_the_request_is_timed(self):
+        with self.assertLogs("common.middleware", "INFO") as logs:
+            response = self.make_request(
+                "get", HTTP_AUTHORIZATION=self.http_auth
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        phases = self.get_phases(response)
+        self.assertEqual(
+            set(phases), {"auth", "db", "serialize", "render", "total"}
+        )
+        self.assertEqual(phases["auth"], 1)
+        # Once to be cached, and once spliced into the response
+        self.assertEqual(phases["render"], 2)
+        log = json.loads(logs.records[0].getMessage())
+        self.assertEqual(log["status"], status.HTTP_200_OK)
+        self.assertEqual(log["timings"]["db"]["count"], phases["db"])
+
+    def test_queries_are_counted(self):
+        # The access token is cached by the first request
+        self.make_request("get", HTTP_AUTHORIZATION=self.http_auth)
+        self.lot.name = "Renamed"
+        self.lot.save()
+        with self.assertNumQueries(1) as queries:
+            response = self.make_request(
+                "get", HTTP_AUTHORIZATION=self.http_auth
+            )
+        self.assertEqual(
+            self.get_phases(response)["db"], len(queries.captured_queries)
+        )
+
+    @override_settings(SERVER_TIMING=False)
+    def test_requests_are_not_timed_when_disabled(self):
+        response = self.make_request("get", HTTP_AUTHORIZATION=self.http_auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,277 @@
+# Python standard
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+# Django
+from django.conf import settings
+
+# Third-party
+from rest_framework.throttling import BaseThrottle
+
+
+class SharedTokenBuckets:
+    """
+    Hold token buckets in a table of `slots` fixed-size slots, mapped in
+    memory from the file at `path`, so every process mapping the same file
+    (such as the workers of a web server) shares them. Without a `path`, the
+    table is only shared by this process and any forked from it.
+
+    Every slot stores the hash of its key, the tokens left in its bucket and
+    when they were last counted, as wall-clock time: the file outlives the
+    processes, and even the boot, whose monotonic clocks it could be left
+    by. Buckets counted in the future, by a clock since set back, are
+    forgotten like full ones. Keys are hashed to a group of `ways` slots,
+    so looking one up reads a few slots at most; a key missing from its
+    group takes over the slot of the group used least recently, whose bucket
+    is then forgotten, like a full one.
+
+    Groups are locked while their buckets are updated, by a lock shared by
+    the threads of this process, then by a lock on their range of the file
+    for other processes. Files not owned by this process' user, or which
+    other users can read or write, are refused with `PermissionError`, as
+    are symbolic links.
+    """
+    slot = struct.Struct("=Qdd")
+    ways = 4
+    thread_locks = 64
+
+    def __init__(self, slots: int, path: Optional[str] = None):
+        self.groups = max(slots // self.ways, 1)
+        self.group_size = self.slot.size * self.ways
+        size = self.groups * self.group_size
+        self.fd = None
+        if path is None:
+            self.memory = mmap.mmap(-1, size)
+        else:
+            self.fd = os.open(
+                path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600
+            )
+            stat = os.fstat(self.fd)
+            if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+                os.close(self.fd)
+                raise PermissionError(
+                    f"Token buckets cannot be mapped from {path}, which "
+                    f"must be owned by this user and only readable and "
+                    f"writable by it (0600)."
+                )
+            if stat.st_size < size:
+                os.ftruncate(self.fd, size)
+            self.memory = mmap.mmap(self.fd, size)
+        self.locks = [threading.Lock() for _ in range(self.thread_locks)]
+
+    @staticmethod
+    def hash(key: str) -> int:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        # Empty slots are hashed as 0
+        return int.from_bytes(digest, "little") | 1
+
+    def acquire(self, key: str, rate: float, capacity: float) -> float:
+        """
+        Take a token from the bucket of `key`, refilled with `rate` tokens
+        per second up to `capacity`, if it has one.
+
+        Returns 0 if a token was taken, or else how many seconds until the
+        bucket has one.
+        """
+        return self.acquire_all([(key, rate, capacity)])
+
+    def acquire_all(
+        self, buckets: Sequence[Tuple[str, float, float]]
+    ) -> float:
+        """
+        Take a token from each of the `buckets`, given as the key, rate and
+        capacity of each (see `acquire`), only if every one has a token, so
+        buckets are not used up by requests another bucket rejects.
+
+        Returns 0 if tokens were taken, or else how many seconds until every
+        bucket has one.
+        """
+        key_hashes = [self.hash(key) for key, _, _ in buckets]
+        groups = sorted({key_hash % self.groups for key_hash in key_hashes})
+        waits = []
+        with self.lock(groups):
+            offsets = []
+            for key_hash, (_, rate, capacity) in zip(key_hashes, buckets):
+                offset, tokens = self.count(key_hash, rate, capacity)
+                offsets.append(offset)
+                if tokens < 1:
+                    waits.append((1 - tokens) / rate)
+            if not waits:
+                for offset in offsets:
+                    self.debit(offset)
+        return max(waits, default=0.0)
+
+    @contextmanager
+    def lock(self, groups: Sequence[int]):
+        """
+        Lock the (sorted) `groups`, for the threads of this process, then
+        for other processes.
+        """
+        thread_locks = sorted({group % self.thread_locks for group in groups})
+        with ExitStack() as stack:
+            for index in thread_locks:
+                stack.enter_context(self.locks[index])
+            if self.fd is not None:
+                for group in groups:
+                    start = group * self.group_size
+                    fcntl.lockf(self.fd, fcntl.LOCK_EX, self.group_size, start)
+                    stack.callback(
+                        fcntl.lockf,
+                        self.fd, fcntl.LOCK_UN, self.group_size, start,
+                    )
+            yield
+
+    def count(self, key_hash: int, rate, capacity) -> Tuple[int, float]:
+        """
+        Refill the bucket of `key_hash`, getting the offset of its slot and
+        how many tokens it has.
+        """
+        now = time.time()
+        start = key_hash % self.groups * self.group_size
+        offset = None
+        victim, victim_counted_at = start, None
+        for way in range(self.ways):
+            position = start + way * self.slot.size
+            slot_hash, tokens, counted_at = self.slot.unpack_from(
+                self.memory, position
+            )
+            if slot_hash == key_hash:
+                offset = position
+                break
+            if victim_counted_at is None or counted_at < victim_counted_at:
+                victim, victim_counted_at = position, counted_at
+        if offset is None:
+            offset, tokens = victim, capacity
+        elif counted_at > now:
+            tokens = capacity
+        else:
+            tokens = min(capacity, tokens + (now - counted_at) * rate)
+        self.slot.pack_into(self.memory, offset, key_hash, tokens, now)
+        return offset, tokens
+
+    def debit(self, offset: int):
+        key_hash, tokens, counted_at = self.slot.unpack_from(
+            self.memory, offset
+        )
+        self.slot.pack_into(
+            self.memory, offset, key_hash, tokens - 1, counted_at
+        )
+
+    def clear(self):
+        with self.locks[0]:
+            self.memory[:] = bytes(len(self.memory))
+
+
+@lru_cache(maxsize=None)
+def get_token_buckets() -> SharedTokenBuckets:
+    """
+    Get the token buckets configured by the `TOKEN_BUCKETS_*` settings.
+    """
+    return SharedTokenBuckets(
+        settings.TOKEN_BUCKETS_SLOTS, settings.TOKEN_BUCKETS_PATH
+    )
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle requests with a token bucket per key (e.g. per user), refilled
+    at the rate configured for the throttle's `scope` in
+    `TOKEN_BUCKET_RATES`, as a pair of tokens per second and capacity.
+    Requests are allowed while their bucket has tokens, so clients can send
+    bursts of up to its capacity.
+
+    Buckets are shared by every worker process (see `SharedTokenBuckets`),
+    and checked without reading or writing the cache or database. Throttled
+    requests are answered with 429 (Too Many Requests), with a `Retry-After`
+    header telling when their bucket will have a token again.
+
+    Usage:
+
+        >>> class MyThrottle(TokenBucketThrottle):
+        >>>     scope = "my_scope"
+        >>>
+        >>>     def get_key(self, request, view):
+        >>>         return str(request.user.pk)
+
+    """
+    scope = None
+
+    def get_rate(self) -> Optional[Tuple[float, float]]:
+        return settings.TOKEN_BUCKET_RATES.get(self.scope)
+
+    def get_key(self, request, view) -> Optional[str]:
+        """
+        Get the key of the bucket the request takes a token from, or None
+        to never throttle it.
+        """
+        raise NotImplementedError
+
+    def get_bucket(
+        self, request, view
+    ) -> Optional[Tuple[str, float, float]]:
+        """
+        Get the key, rate and capacity of the bucket the request takes a
+        token from, or None if it is not throttled.
+        """
+        rate = self.get_rate()
+        if rate is None:
+            return None
+        key = self.get_key(request, view)
+        if key is None:
+            return None
+        return (f"{self.scope}:{key}", *rate)
+
+    def allow_request(self, request, view) -> bool:
+        self.retry_after = None
+        bucket = self.get_bucket(request, view)
+        if bucket is None:
+            return True
+        self.retry_after = get_token_buckets().acquire(*bucket)
+        return not self.retry_after
+
+    def wait(self) -> Optional[float]:
+        return self.retry_after
+
+
+class TokenBucketThrottlingMixin:
+    """
+    Check every `TokenBucketThrottle` of a view at once, taking a token from
+    each of their buckets only if every one has a token: checked one after
+    another, a request rejected by one bucket would still use up the tokens
+    of those checked before it. Any other throttles are checked first, as
+    usual.
+
+    Usage:
+
+        >>> class MyCreateAPIView(TokenBucketThrottlingMixin, CreateAPIView):
+        >>>     throttle_classes = [MyThrottle, MyOtherThrottle]
+
+    """
+
+    def check_throttles(self, request):
+        buckets = []
+        durations = []
+        for throttle in self.get_throttles():
+            if isinstance(throttle, TokenBucketThrottle):
+                bucket = throttle.get_bucket(request, self)
+                if bucket is not None:
+                    buckets.append(bucket)
+            elif not throttle.allow_request(request, self):
+                durations.append(throttle.wait())
+        if durations:
+            self.throttled(request, max(
+                (duration for duration in durations if duration is not None),
+                default=None,
+            ))
+        if buckets:
+            wait = get_token_buckets().acquire_all(buckets)
+            if wait:
+                self.throttled(request, wait)
@@ -0,0 +1,105 @@
+# Python standard
+import functools
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestTimings:
+    """
+    Record the time spent in each phase of serving a request, such as
+    authenticating it, querying the database, serialising and rendering.
+
+    Phases may be measured several times, and their durations add up;
+    measuring a phase within itself (e.g. a nested serializer) is ignored,
+    so time is only counted once. Phases may overlap, as queries made while
+    serialising do.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.durations = OrderedDict()
+        self.counts = OrderedDict()
+        self.active = set()
+
+    def add(self, name: str, duration: float):
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    @contextmanager
+    def measure(self, name: str):
+        if name in self.active:
+            yield
+            return
+        self.active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+            self.active.discard(name)
+
+    def stop(self):
+        self.add("total", time.perf_counter() - self.started_at)
+
+    def as_header(self) -> str:
+        """
+        Get the value of a `Server-Timing` header: the duration of every
+        phase in milliseconds, described by how many times it was measured.
+        """
+        return ", ".join(
+            f'{name};dur={duration * 1000:.3f};desc="{self.counts[name]}"'
+            for name, duration in self.durations.items()
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            name: {
+                "ms": round(duration * 1000, 3),
+                "count": self.counts[name],
+            }
+            for name, duration in self.durations.items()
+        }
+
+
+# Timings of the request served in the current context, if instrumented
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "current_timings", default=None
+)
+
+
+def timed(name: str):
+    """
+    Measure every call of the function decorated as the phase `name` of the
+    request being served, if any is instrumented.
+
+    Usage:
+
+        >>> @timed("render")
+        >>> def render(self, data, accepted_media_type=None, ...):
+        >>>     ...
+
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            timings = current_timings.get()
+            if timings is None:
+                return function(*args, **kwargs)
+            with timings.measure(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TimedSerializerMixin:
+    """
+    Measure the time DRF serializers spend representing objects, as the
+    `serialize` phase of the request being served.
+    """
+
+    @timed("serialize")
+    def to_representation(self, instance):
+        return super().to_representation(instance)
@@ -0,0 +1,25 @@
+# Django
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views import View
+
+# Local
+from common.metrics import registry
+
+
+class MetricsView(View):
+    """
+    GET requests to this endpoint will return the metrics of every process
+    serving the application, in the Prometheus text format, to be scraped
+    from one of `METRICS_ALLOWED_IPS` (or from anywhere, if `None`).
+    """
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def get(self, request):
+        allowed_ips = settings.METRICS_ALLOWED_IPS
+        if (
+            allowed_ips is not None
+            and request.META.get("REMOTE_ADDR") not in allowed_ips
+        ):
+            return HttpResponseForbidden()
+        return HttpResponse(registry.expose(), content_type=self.content_type)
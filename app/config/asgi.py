@@ -3,6 +3,10 @@ ASGI config for auction project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Bid streams are served by their own ASGI application, since they are kept
+open for as long as clients follow a lot; every other request is handled by
+Django.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 """
@@ -11,8 +15,29 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 import os
 
 # Django
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Local
+# Imported once Django is set up, as it depends on the application models.
+from auction.streaming import BID_STREAM_PATH, BidStreamApplication  # noqa
+
+bid_stream_application = BidStreamApplication()
+
+if settings.AUCTION_SCHEDULER_IN_PROCESS:
+    from auction.scheduler import start_worker
+    start_worker()
+
+if settings.METRICS_MULTIPROCESS_DIRECTORY:
+    from common.metrics import registry
+    registry.start_flushing(settings.METRICS_FLUSH_INTERVAL)
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and BID_STREAM_PATH.match(scope["path"]):
+        return await bid_stream_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -10,10 +10,45 @@ from .common import *
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, "config", "databases", "test_db.sqlite3")
-    }
+        'NAME': os.path.join(BASE_DIR, "config", "databases", "test_db.sqlite3"),
+        # Keep the test database in a file rather than SQLite's in-memory
+        # shared cache, so tests using several connections at once (such as
+        # concurrent bidding) get SQLite's real locking and busy timeout.
+        'TEST': {
+            'NAME': os.path.join(
+                BASE_DIR, "config", "databases", "test_runner_db.sqlite3"
+            ),
+        },
+    },
+    # Only read from by test cases which make it lag behind on purpose
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(
+            BASE_DIR, "config", "databases", "test_replica_db.sqlite3"
+        ),
+        'TEST': {
+            'NAME': os.path.join(
+                BASE_DIR, "config", "databases",
+                "test_runner_replica_db.sqlite3"
+            ),
+        },
+    },
 }
 
+# Test cases read and write the same database
+DATABASE_REPLICAS = []
+
+# Test cases run in a transaction the bid writer's own connection cannot see,
+# so bids are placed by requests; group commit is tested on its own.
+BID_GROUP_COMMIT = False
+
+# Bids are throttled in memory, and only when tested on purpose
+TOKEN_BUCKETS_PATH = None
+TOKEN_BUCKET_RATES = {}
+
+# Timings are tested with the middleware enabled on purpose
+SERVER_TIMING = False
+
 # Set a default randomly generated secret key
 SECRET_KEY = os.getenv(
     "SECRET_KEY",
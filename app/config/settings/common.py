@@ -48,11 +48,15 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     # CorsMiddleware should be placed as high as possible
     'corsheaders.middleware.CorsMiddleware',
+    # Measures the time spent by every other middleware too
+    'common.middleware.ServerTimingMiddleware',
+    'common.middleware.SlowQueryLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'common.middleware.ReplicaReadMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -92,6 +96,36 @@ DATABASES = {
         'NAME': os.path.join(BASE_DIR, "config", "databases", "app_db.sqlite3")
     }
 }
+# Read replicas of the primary (`default`) database, such as a second SQLite
+# file kept up to date by the `simulate_replication` command.
+if os.getenv("DATABASE_REPLICA_NAME"):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv("DATABASE_REPLICA_NAME"),
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['common.routers.PrimaryReplicaRouter']
+# Apps whose models are always read from the primary, as they are used as
+# soon as they are written, by other clients (e.g. newly issued tokens).
+DATABASE_PRIMARY_APPS = ['oauth2_provider', 'sessions']
+# Seconds clients read from the primary after writing, so they read back
+# what they wrote while replicas catch up, and the cache recording them,
+# which must be shared by every worker process.
+READ_YOUR_WRITES_WINDOW = 5
+READ_YOUR_WRITES_CACHE_ALIAS = 'default'
+
+# Applied to every SQLite connection: write-ahead logging lets readers run
+# alongside the single writer, which only syncs at checkpoints, and writers
+# wait for the lock instead of failing with "database is locked".
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 20000,
+    "temp_store": "MEMORY",
+    # Negative sizes are in KiB, so 64 MiB of page cache per connection
+    "cache_size": -64000,
+    "mmap_size": 256 * 1024 * 1024,
+}
 
 #
 #   Password validation
@@ -129,11 +163,15 @@ STATIC_URL = '/static/'
 #   REST API settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
+        'common.authentication.CachedOAuth2Authentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 100,
     'DATETIME_INPUT_FORMATS': [
@@ -149,6 +187,18 @@ REST_FRAMEWORK = {
 # of the django-money supported currencies.
 DEFAULT_CURRENCY = "GBP"
 
+# Rates other currencies are converted into `DEFAULT_CURRENCY` at, so prices
+# in any currency can be ordered and compared. They are stored in the
+# database by the `update_exchange_rates` command, and cached in the
+# `EXCHANGE_RATES_CACHE_ALIAS` cache for `EXCHANGE_RATES_CACHE_TIMEOUT`
+# seconds.
+EXCHANGE_RATES = {
+    "EUR": "0.87",
+    "USD": "0.75",
+}
+EXCHANGE_RATES_CACHE_ALIAS = "default"
+EXCHANGE_RATES_CACHE_TIMEOUT = 60
+
 # UUID regex to match expected URLs identifiers
 UUID_REGEX_FORMAT = (
     "[a-f0-9]{8}-[a-f0-9]{4}-4[a-f0-9]{3}-[89aAbB][a-f0-9]{3}-[a-f0-9]{12}"
@@ -156,3 +206,120 @@ UUID_REGEX_FORMAT = (
 
 # OAuth token scheme
 OAUTH2_AUTHORIZATION_SCHEME = "Bearer"
+# Validated access tokens kept in memory by each process, for at most
+# `ACCESS_TOKEN_CACHE_TIMEOUT` seconds before users are fetched again. Their
+# versions, bumped as they are revoked, are kept in the cache
+# `ACCESS_TOKEN_CACHE_ALIAS`, which must be shared by every worker process.
+ACCESS_TOKEN_CACHE_MAX_ENTRIES = 10000
+ACCESS_TOKEN_CACHE_TIMEOUT = 60
+ACCESS_TOKEN_CACHE_ALIAS = "default"
+
+# Worker processes serving the application, as told to the web server (e.g.
+# gunicorn or uvicorn) by `WEB_CONCURRENCY`. With more than one, processes
+# refuse to start if caches which must be shared by every worker are kept in
+# the memory of each one (see `common.checks.SHARED_CACHE_SETTINGS`).
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Broker fanning out bids to the clients streaming them; must be replaced
+# by a broker shared by all workers when running more than one.
+BID_STREAM_BROKER = "auction.streaming.InMemoryBroker"
+# Seconds between keep-alive comments sent on idle bid streams
+BID_STREAM_KEEPALIVE = 15
+
+# Cache of lot detail representations, invalidated by bids; replace the
+# backend with one shared by all workers when running more than one.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'lots': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'lots',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    'idempotency': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'idempotency',
+        'OPTIONS': {
+            'MAX_ENTRIES': 50000,
+        },
+    },
+}
+LOT_CACHE_ALIAS = "lots"
+# Seconds representations are cached for at most
+LOT_CACHE_TIMEOUT = 5 * 60
+
+# Responses to bids and lots created with an `Idempotency-Key`, replayed to
+# retries for `IDEMPOTENCY_KEY_TIMEOUT` seconds; concurrent retries wait for
+# the first request for `IDEMPOTENCY_WAIT_TIMEOUT` seconds at most.
+IDEMPOTENCY_CACHE_ALIAS = "idempotency"
+IDEMPOTENCY_KEY_TIMEOUT = 24 * 60 * 60
+IDEMPOTENCY_WAIT_TIMEOUT = 10
+# Seconds keys stay in flight if their request never ends, e.g. because its
+# process was killed; longer than any request, such as a bid waiting
+# `BID_GROUP_COMMIT_TIMEOUT` seconds to be committed.
+IDEMPOTENCY_IN_FLIGHT_TIMEOUT = 2 * 60
+
+# Engine searching lots with `?q=`; `auction.search.SimpleSearchEngine`
+# suits databases other than SQLite, which have no FTS5 index.
+LOT_SEARCH_ENGINE = "auction.search.SQLiteFTS5Engine"
+
+# Number of the highest bids of every auction kept ranked, to be served
+# without sorting its bids
+LEADERBOARD_SIZE = 10
+
+# Seconds before expiring within which lots are listed as ending soon
+LOT_ENDING_SOON_WINDOW = 60 * 60
+
+# Place bids through a single writer thread per process, which commits all
+# the bids pending at once in one transaction (group commit).
+BID_GROUP_COMMIT = os.getenv("BID_GROUP_COMMIT", "true").lower() == "true"
+# Maximum amount of bids committed per transaction by the writer
+BID_GROUP_COMMIT_MAX_BATCH_SIZE = 200
+# Seconds a request waits for its bid to be committed
+BID_GROUP_COMMIT_TIMEOUT = 30
+
+# Send how long requests spent in the database, authenticating, serialising
+# and rendering in `Server-Timing` headers, and log them as JSON lines.
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+SERVER_TIMING_LOG = os.getenv("SERVER_TIMING_LOG", "false").lower() == "true"
+
+# Log queries made by views taking longer than this many milliseconds, with
+# their query plan, to find those missing an index; None disables it. Slow
+# queries are also appended to `SLOW_QUERY_LOG_FILE`, if set, aggregated by
+# the `slow_queries` command.
+SLOW_QUERY_THRESHOLD = (
+    float(os.getenv("SLOW_QUERY_THRESHOLD"))
+    if os.getenv("SLOW_QUERY_THRESHOLD") else None
+)
+SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE")
+
+# Token buckets throttling requests (see `TokenBucketThrottle`), by scope:
+# tokens refilled per second, and the most a bucket holds (its burst).
+TOKEN_BUCKET_RATES = {
+    'bid_user': (10, 30),
+    'bid_user_lot': (2, 10),
+}
+# File the buckets are mapped in memory from, shared by every process of the
+# web server, and how many buckets it holds. The file must be owned by the
+# user running them, and only readable and writable by it (0600).
+TOKEN_BUCKETS_PATH = os.getenv(
+    "TOKEN_BUCKETS_PATH",
+    os.path.join(BASE_DIR, "config", "databases", "token-buckets"),
+)
+TOKEN_BUCKETS_SLOTS = 65536
+
+# Addresses allowed to scrape metrics from `/metrics`, or None for any.
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+# Directory the processes of a multiprocess web server (e.g. the workers of
+# a WSGI server) share their metrics through, every few seconds.
+METRICS_MULTIPROCESS_DIRECTORY = os.getenv("METRICS_MULTIPROCESS_DIRECTORY")
+METRICS_FLUSH_INTERVAL = 5
+
+# Settle expired auctions from a background thread of each web server
+# process, instead of running the `close_auctions` management command.
+AUCTION_SCHEDULER_IN_PROCESS = os.getenv(
+    "AUCTION_SCHEDULER_IN_PROCESS", "false"
+).lower() == "true"
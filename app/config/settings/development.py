@@ -4,6 +4,13 @@ from .common import *
 
 DEBUG = True
 
+SERVER_TIMING = True
+
+SLOW_QUERY_THRESHOLD = 100
+SLOW_QUERY_LOG_FILE = os.getenv(
+    "SLOW_QUERY_LOG_FILE", os.path.join(BASE_DIR, "slow_queries.jsonl")
+)
+
 # Set a default randomly generated secret key
 SECRET_KEY = os.getenv(
     "SECRET_KEY",
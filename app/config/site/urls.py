@@ -5,6 +5,7 @@ from django.urls import path, include, re_path
 # Local
 from django.views.generic import RedirectView
 
+from common.views import MetricsView
 from config.api import urls as api_urls
 
 app_name = 'site'
@@ -13,6 +14,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include(api_urls, namespace='api')),
     path('o/', include('oauth2_provider.urls', namespace='oauth2_provider')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
     # Redirect all URLs to the admin site.
     re_path('^$', RedirectView.as_view(url='admin'), name='home'),
 ]
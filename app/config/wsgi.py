@@ -11,8 +11,17 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/wsgi/
 import os
 
 # Django
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+if settings.AUCTION_SCHEDULER_IN_PROCESS:
+    from auction.scheduler import start_worker
+    start_worker()
+
+if settings.METRICS_MULTIPROCESS_DIRECTORY:
+    from common.metrics import registry
+    registry.start_flushing(settings.METRICS_FLUSH_INTERVAL)
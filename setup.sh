@@ -41,6 +41,7 @@ load_initial_data() {
   echo "Loading initial application data."
   ./app/manage.py loaddata account_seed_data.json
   ./app/manage.py loaddata auction_seed_data.json
+  ./app/manage.py update_exchange_rates
   echo "Finished loading seed data."
 }
 